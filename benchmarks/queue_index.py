@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for the queue lookup indexes.
+
+Compares the indexed ``Queue.in_queue`` / ``Queue.can_fit_in_group`` against the full scans they replaced,
+and times hydrating the queue document, on a queue of 2,000 players. Run from the repository root::
+
+    python benchmarks/queue_index.py
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from common.constants import GROUP_SIZE  # noqa: E402
+from queueing.models import Player, Queue  # noqa: E402
+
+PLAYERS = 2_000
+LOOKUPS = 1_000
+
+
+def scan_in_queue(queue: Queue, member_id: int) -> tuple[int, int] | None:
+    for group_index, group in enumerate(queue.groups):
+        for player_index, player in enumerate(group.players):
+            if player.member_id == member_id:
+                return (group_index, player_index)
+    return None
+
+
+def scan_can_fit(queue: Queue, player: Player, group_size: int = GROUP_SIZE) -> int | None:
+    for index, group in enumerate(queue.groups):
+        if group.tier != player.tier:
+            continue
+        if len(group.players) >= group_size or group.locked:
+            continue
+        return index
+    return None
+
+
+def make_player(member_id: int, level: int) -> Player:
+    classes = [{"class": "Fighter", "subclass": "None", "level": level}]
+    return Player.new(member_id, {"total_level": level, "classes": classes})  # pyright: ignore[reportArgumentType]
+
+
+def build_queue() -> Queue:
+    rng = random.Random(42)
+    queue = Queue(groups=[], server_id=1, channel_id=2)
+    for member_id in range(PLAYERS):
+        queue.add_player(make_player(member_id, rng.randint(1, 20)))
+    return queue
+
+
+def report(name: str, scan: float, indexed: float) -> None:
+    per_scan = scan / LOOKUPS * 1e6
+    per_indexed = indexed / LOOKUPS * 1e6
+    print(f"{name:<20} scan {per_scan:8.2f} us   indexed {per_indexed:6.2f} us   x{scan / indexed:6.1f}")
+
+
+def main() -> None:
+    queue = build_queue()
+    rng = random.Random(7)
+    # misses are the common case for the signup duplicate check
+    member_ids = [rng.randint(PLAYERS // 2, PLAYERS * 2) for _ in range(LOOKUPS)]
+    newcomers = [make_player(PLAYERS + index, rng.randint(1, 20)) for index in range(LOOKUPS)]
+    queue.in_queue(0)
+
+    print(f"{len(queue.groups)} groups, {queue.player_count} players")
+    report(
+        "in_queue",
+        timeit.timeit(lambda: [scan_in_queue(queue, member_id) for member_id in member_ids], number=1),
+        timeit.timeit(lambda: [queue.in_queue(member_id) for member_id in member_ids], number=1),
+    )
+    report(
+        "can_fit_in_group",
+        timeit.timeit(lambda: [scan_can_fit(queue, player) for player in newcomers], number=1),
+        timeit.timeit(lambda: [queue.can_fit_in_group(player) for player in newcomers], number=1),
+    )
+
+    document = queue.to_dict()
+    loads = 50
+    per_load = timeit.timeit(lambda: Queue.from_dict(document), number=loads) / loads * 1e3
+    print(f"{'Queue.from_dict':<20} {per_load:.2f} ms per load")
+
+
+if __name__ == "__main__":
+    main()
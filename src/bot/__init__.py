@@ -1,3 +1,21 @@
-from .bootstrap import COGS, GatesBot, build_bot, register_persistent_views
+from .bootstrap import (
+    COGS,
+    GatesBot,
+    build_bot,
+    build_index_registry,
+    build_query_catalogue,
+    ensure_indexes,
+    register_persistent_views,
+)
+from .message_router import MessageRouter
 
-__all__ = ["COGS", "GatesBot", "build_bot", "register_persistent_views"]
+__all__ = [
+    "COGS",
+    "GatesBot",
+    "MessageRouter",
+    "build_bot",
+    "build_index_registry",
+    "build_query_catalogue",
+    "ensure_indexes",
+    "register_persistent_views",
+]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from datetime import UTC, datetime
 from typing import Any
 
@@ -7,11 +8,28 @@
 from disnake.ext import commands
 from pymongo import AsyncMongoClient
 
-from bot.prefixes import get_prefix
+from bot.message_router import MessageRouter
+from bot.prefixes import PREFIX_INDEXES, PREFIX_QUERY_SHAPES, PrefixMatcher, get_prefix
+from common.bulk_actions import BulkMemberExecutor
 from common.constants import DEBUG_SERVER
+from common.indexes import IndexRegistry
+from common.query_audit import QueryShape
 from common.settings import settings
+from placeholders import PlaceholderRepository
+from queueing.repositories import (
+    ActivityRepository,
+    AnalyticsRepository,
+    DMQueueRepository,
+    GateRepository,
+    QueueMetaRepository,
+    QueueRepository,
+    StrikeQueueRepository,
+)
+from queueing.services import close_queue_services
 from queueing.views import DMQueueUI, PlayerQueueUI, StrikeQueueUI
 
+log = logging.getLogger(__name__)
+
 COGS = {
     "cogs.util",
     "cogs.queue",
@@ -36,11 +54,26 @@ def __init__(self, command_prefix=get_prefix, desc: str = "", **options: Any):
         self.mongo_client = AsyncMongoClient(settings.mongo_url or "mongodb://localhost:27017")
         self.mdb = self.mongo_client[settings.mongo_db]
         self.prefixes: dict[str, str] = {}
+        self.prefix_matcher = PrefixMatcher(self)
         self.prefix = settings.prefix
         self.persistent_views_added = False
+        self.indexes_ensured = False
+        self.router = MessageRouter()
 
         super().__init__(command_prefix, description=desc, **options)
 
+    async def close(self) -> None:
+        await self.router.drain()
+        await close_queue_services(self)
+        await super().close()
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        # suffix routes depend on the channel name
+        self.router.forget_channel(after.id)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self.router.forget_channel(channel.id)
+
     @property
     def dev_id(self) -> int:
         return self._dev_id
@@ -75,3 +108,44 @@ def register_persistent_views(bot: GatesBot) -> None:
     bot.add_view(DMQueueUI(bot))
     bot.add_view(StrikeQueueUI(bot))
     bot.persistent_views_added = True
+
+
+def build_index_registry() -> IndexRegistry:
+    return IndexRegistry(
+        [
+            *QueueRepository.INDEXES,
+            *GateRepository.INDEXES,
+            *DMQueueRepository.INDEXES,
+            *StrikeQueueRepository.INDEXES,
+            *AnalyticsRepository.INDEXES,
+            *PlaceholderRepository.INDEXES,
+            *BulkMemberExecutor.INDEXES,
+            *PREFIX_INDEXES,
+        ]
+    )
+
+
+def build_query_catalogue() -> list[QueryShape]:
+    return [
+        *QueueRepository.QUERY_SHAPES,
+        *GateRepository.QUERY_SHAPES,
+        *DMQueueRepository.QUERY_SHAPES,
+        *StrikeQueueRepository.QUERY_SHAPES,
+        *AnalyticsRepository.QUERY_SHAPES,
+        *ActivityRepository.QUERY_SHAPES,
+        *QueueMetaRepository.QUERY_SHAPES,
+        *PlaceholderRepository.QUERY_SHAPES,
+        *PREFIX_QUERY_SHAPES,
+    ]
+
+
+async def ensure_indexes(bot: GatesBot) -> None:
+    if bot.indexes_ensured:
+        return
+
+    bot.indexes_ensured = True
+    report = await build_index_registry().ensure(bot.mdb)
+    if report.created:
+        log.info(f"[Indexes] Created {', '.join(map(str, report.created))}")
+    if report.failed:
+        log.error(f"[Indexes] Could not create {', '.join(map(str, report.failed))}")
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import disnake as discord
+
+from common.metrics import MetricsRegistry, metrics
+
+log = logging.getLogger(__name__)
+
+MessageHandler = Callable[[discord.Message], Awaitable[Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class _Route:
+    name: str
+    handler: MessageHandler
+
+
+@dataclass(frozen=True, slots=True)
+class _SuffixRoute:
+    suffix: str
+    guild_id: int | None
+    route: _Route
+
+
+class MessageRouter:
+    """
+    Sends each guild message to the handlers registered for its channel.
+
+    Handlers register either for a channel id or for a channel-name suffix (optionally in one guild). The
+    handlers for a channel are resolved once and cached by channel id, so a message in a channel nobody
+    listens to is dropped after a single dict lookup. Handlers run as their own tasks, so a slow handler
+    never holds up the next message, and each call is timed under ``router.<name>``.
+    """
+
+    def __init__(self, *, registry: MetricsRegistry = metrics):
+        self.registry = registry
+        self._by_channel: dict[int, list[_Route]] = {}
+        self._by_suffix: list[_SuffixRoute] = []
+        self._resolved: dict[int, tuple[_Route, ...]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def add_channel_route(self, channel_id: int, name: str, handler: MessageHandler) -> None:
+        self._by_channel.setdefault(channel_id, []).append(_Route(name, handler))
+        self._resolved.clear()
+
+    def add_suffix_route(self, suffix: str, name: str, handler: MessageHandler, *, guild_id: int | None = None) -> None:
+        self._by_suffix.append(_SuffixRoute(suffix.lower(), guild_id, _Route(name, handler)))
+        self._resolved.clear()
+
+    def remove_route(self, name: str) -> None:
+        for channel_id, routes in list(self._by_channel.items()):
+            routes[:] = [route for route in routes if route.name != name]
+            if not routes:
+                del self._by_channel[channel_id]
+        self._by_suffix = [rule for rule in self._by_suffix if rule.route.name != name]
+        self._resolved.clear()
+
+    def forget_channel(self, channel_id: int) -> None:
+        """Drops the cached routes for a channel, e.g. after it was renamed."""
+        self._resolved.pop(channel_id, None)
+
+    def routes_for(self, message: discord.Message) -> tuple[_Route, ...]:
+        channel = message.channel
+        routes = self._resolved.get(channel.id)
+        if routes is not None:
+            return routes
+
+        resolved = list(self._by_channel.get(channel.id, ()))
+        name = getattr(channel, "name", None)
+        guild_id = message.guild.id if message.guild is not None else None
+        if name:
+            name = name.lower()
+            resolved.extend(
+                rule.route
+                for rule in self._by_suffix
+                if name.endswith(rule.suffix) and rule.guild_id in (None, guild_id)
+            )
+        routes = self._resolved[channel.id] = tuple(resolved)
+        return routes
+
+    def dispatch(self, message: discord.Message) -> None:
+        if message.guild is None:
+            return
+
+        routes = self.routes_for(message)
+        if not routes:
+            self.registry.increment("router.dropped")
+            return
+
+        loop = asyncio.get_running_loop()
+        for route in routes:
+            task = loop.create_task(self._handle(route, message), name=f"router-{route.name}-{message.id}")
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def drain(self) -> None:
+        """Waits for the handlers that are still running, e.g. before shutting down."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle(self, route: _Route, message: discord.Message) -> None:
+        started = time.perf_counter()
+        try:
+            await route.handler(message)
+        except Exception:
+            self.registry.increment(f"router.{route.name}.failed")
+            log.exception(f"[Router] Handler {route.name} failed for message {message.id}.")
+        finally:
+            self.registry.observe(f"router.{route.name}", time.perf_counter() - started)
@@ -1,15 +1,30 @@
 from __future__ import annotations
 
 import disnake as discord
-from disnake.ext import commands
 
+from common.indexes import IndexSpec
+from common.metrics import MetricsRegistry, metrics
+from common.query_audit import QueryShape
 from common.settings import settings
 from common.types import MongoBackedBot
 
+PREFIX_INDEXES = (IndexSpec.on("prefixes", "guild_id"),)
+PREFIX_QUERY_SHAPES = (
+    QueryShape("prefixes.by_guild", "prefixes", {"guild_id": "0"}),
+    QueryShape("prefixes.warm", "prefixes", {"guild_id": {"$in": ["0"]}}),
+)
+
+
+def prefix_candidates(client: MongoBackedBot, prefix: str) -> tuple[str, ...]:
+    """The same prefixes ``commands.when_mentioned_or(prefix)`` gives, without building a closure."""
+    if client.user is None:
+        return (prefix,)
+    return f"<@{client.user.id}> ", f"<@!{client.user.id}> ", prefix
+
 
 async def get_prefix(client: MongoBackedBot, message: discord.Message) -> list[str]:
     if not message.guild:
-        return commands.when_mentioned_or(settings.prefix)(client, message)
+        return list(prefix_candidates(client, settings.prefix))
 
     guild_id = str(message.guild.id)
     if guild_id in client.prefixes:
@@ -22,4 +37,56 @@ async def get_prefix(client: MongoBackedBot, message: discord.Message) -> list[s
             prefix = settings.prefix
         client.prefixes[guild_id] = prefix
 
-    return commands.when_mentioned_or(prefix)(client, message)
+    return list(prefix_candidates(client, prefix))
+
+
+class PrefixMatcher:
+    """
+    Precomputed prefix candidates per guild, used to rule out messages that cannot be commands with a
+    single ``startswith`` before ``get_context`` runs.
+
+    Prefixes live in ``client.prefixes``; change them through ``set_prefix`` so the candidates follow.
+    Guilds whose prefix is not known yet are never short-circuited and take the full ``get_prefix`` path.
+    """
+
+    def __init__(self, client: MongoBackedBot, *, registry: MetricsRegistry = metrics):
+        self.client = client
+        self.registry = registry
+        self._candidates: dict[str | None, tuple[str, ...]] = {}
+
+    def candidates(self, guild_id: str | None) -> tuple[str, ...] | None:
+        cached = self._candidates.get(guild_id)
+        if cached is not None:
+            return cached
+
+        if guild_id is None:
+            prefix = settings.prefix
+        elif guild_id in self.client.prefixes:
+            prefix = self.client.prefixes[guild_id]
+        else:
+            return None
+
+        candidates = prefix_candidates(self.client, prefix)
+        if self.client.user is not None:
+            self._candidates[guild_id] = candidates
+        return candidates
+
+    def set_prefix(self, guild_id: str, prefix: str) -> None:
+        self.client.prefixes[guild_id] = prefix
+        self._candidates.pop(guild_id, None)
+
+    def could_be_command(self, message: discord.Message) -> bool:
+        candidates = self.candidates(str(message.guild.id) if message.guild else None)
+        if candidates is not None and not message.content.startswith(candidates):
+            self.registry.increment("commands.short_circuited")
+            return False
+        self.registry.increment("commands.parsed")
+        return True
+
+    async def warm(self, guild_ids: list[str]) -> None:
+        """Loads every listed guild's prefix in one query, defaulting the ones without a stored prefix."""
+        docs = await self.client.mdb["prefixes"].find({"guild_id": {"$in": guild_ids}}).to_list(length=None)
+        stored = {doc["guild_id"]: doc.get("prefix", settings.prefix) for doc in docs}
+        for guild_id in guild_ids:
+            self.client.prefixes[guild_id] = stored.get(guild_id, settings.prefix)
+        self._candidates.clear()
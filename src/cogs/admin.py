@@ -3,6 +3,11 @@
 import disnake as discord
 from disnake.ext import commands
 
+from bot.bootstrap import build_index_registry, build_query_catalogue
+from common.metrics import Observation, metrics
+from common.query_audit import audit_queries
+from queueing.services import get_queue_services
+
 
 class Admin(commands.Cog):
     def __init__(self, bot):
@@ -45,6 +50,50 @@ async def leave_guild(self, ctx, guild_id: int):
         else:
             return await ctx.send("Guild not found.")
 
+    @admin.command(name="metrics")
+    @commands.is_owner()
+    async def show_metrics(self, ctx):
+        """
+        Shows the process-local counters and timings.
+        """
+        services = get_queue_services(self.bot)
+        lines = [f"analytics.pending: {services.analytics_sink.depth}"]
+        if (hit_ratio := services.gate_repository.hit_ratio) is not None:
+            lines.append(f"gates.hit_ratio: {hit_ratio:.2%}")
+        for name, value in sorted(metrics.snapshot().items()):
+            if isinstance(value, Observation):
+                lines.append(f"{name}: n={value.count} mean={value.mean:.4f} max={value.max:.4f}")
+            else:
+                lines.append(f"{name}: {value}")
+
+        await ctx.send("```\n" + "\n".join(lines)[:1900] + "\n```")
+
+    @admin.command(name="indexes")
+    @commands.is_owner()
+    async def show_indexes(self, ctx):
+        """
+        Lists declared indexes that are missing and indexes that have not been used since Mongo started.
+        """
+        report = await build_index_registry().verify(self.bot.mdb)
+        lines = [f"missing: {spec}" for spec in report.missing]
+        lines.extend(f"unused: {name}" for name in report.unused)
+        if not lines:
+            lines.append("All declared indexes exist and are in use.")
+
+        await ctx.send("```\n" + "\n".join(lines)[:1900] + "\n```")
+
+    @admin.command(name="explain")
+    @commands.is_owner()
+    async def explain_queries(self, ctx):
+        """
+        Explains every catalogued query shape and flags the ones that scan a whole collection.
+        """
+        plans = await audit_queries(self.bot.mdb, build_query_catalogue())
+        plans.sort(key=lambda plan: (not plan.collscan, -plan.docs_examined))
+        lines = [str(plan) for plan in plans]
+
+        await ctx.send("```\n" + "\n".join(lines)[:1900] + "\n```")
+
     # ---- Server Owner Commands ----
 
     @commands.command(name="prefix", description="Changes the Bot's Prefix. Must have Manage Server.")
@@ -69,13 +118,13 @@ async def change_prefix(self, ctx, to_change: str = ""):
                     prefix = db_search.get("prefix", self.bot.prefix)
                 else:
                     prefix = self.bot.prefix
-                self.bot.prefixes[guild_id] = prefix
+                self.bot.prefix_matcher.set_prefix(guild_id, prefix)
             return await ctx.send(f"No prefix specified to Change. Current Prefix: `{prefix}`")
         else:
             await ctx.bot.mdb["prefixes"].update_one(
                 {"guild_id": guild_id}, {"$set": {"prefix": to_change}}, upsert=True
             )
-            ctx.bot.prefixes[guild_id] = to_change
+            ctx.bot.prefix_matcher.set_prefix(guild_id, to_change)
             return await ctx.send(f"Guild prefix updated to `{to_change}`")
 
 
@@ -11,6 +11,7 @@
 import common.constants as constants
 from common.checks import has_any_role, has_role
 from common.embeds import create_default_embed
+from queueing.members import resolve_members
 from queueing.models import Group
 from queueing.services import get_queue_services
 
@@ -35,6 +36,11 @@ def __init__(self, bot):
         self.dm_db = self.bot.mdb["dm_analytics"]
         self.assign_data_db = self.bot.mdb["dm_assign_analytics"]
 
+        self.bot.router.add_channel_route(self.queue_channel_id, "dm_queue.ready", self.dm_queue_listener)
+
+    def cog_unload(self):
+        self.bot.router.remove_route("dm_queue.ready")
+
     async def cog_check(self, ctx):  # type: ignore
         if not ctx.guild:
             return False
@@ -43,11 +49,8 @@ async def cog_check(self, ctx):  # type: ignore
         if ctx.guild.id == constants.DEBUG_SERVER and self.bot.environment == "testing":
             return True
 
-    @commands.Cog.listener(name="on_message")
     async def dm_queue_listener(self, msg):
-        if msg.channel.id != self.queue_channel_id:
-            return
-
+        """Routed messages from the DM queue channel."""
         if not msg.content.lower().startswith("**ready"):
             return
 
@@ -63,19 +66,11 @@ async def dm_queue_listener(self, msg):
         except discord.Forbidden, discord.NotFound:
             pass
 
-        await self.update_queue()
-
     async def generate_embed(self):
         guild = self.bot.get_guild(self.server_id)
         entries = await self.services.dm_queue_repository.list_entries()
         return await self.presentation.build_dm_queue_embed(guild=guild, entries=entries)
 
-    async def update_queue(self):
-        guild = self.bot.get_guild(self.server_id)
-        await self.dm_service.refresh_queue_message(
-            guild=guild,
-        )
-
     @commands.group(name="dm", invoke_without_command=True)
     async def dm(self, ctx):
         """Base command for DM queue"""
@@ -171,7 +166,7 @@ async def load_recent_gates(self, who: discord.Member, existing_data=None):
             name = raw_data.pop("gate_name")
             claimed = raw_data.pop("claimed_date")
             raw_data["position"] = None
-            gate = Group.from_dict(self.bot.get_guild(self.server_id), raw_data)
+            gate = Group.from_dict(raw_data)
             gates.append(GateGroup(gate=gate, name=name, claimed=claimed))
 
         gates = sorted(gates, key=lambda x: x.claimed, reverse=True)
@@ -258,7 +253,8 @@ async def dm_stats_specific(self, ctx, gate_num: int, dm_user: discord.Member |
             value=f"**Rank:** {gate.gate.tier}\n**Name:** {gate.name.title()} Gate\n**Claimed at:** <t:{claimed}:f>",
             inline=False,
         )
-        embed.add_field(name="Players", value=gate.gate.player_levels_str, inline=False)
+        members = resolve_members(ctx.guild, (player.member_id for player in gate.gate.players))
+        embed.add_field(name="Players", value=gate.gate.player_levels_str(members), inline=False)
 
         await ctx.send(embed=embed)
 
@@ -277,7 +273,7 @@ async def dm_stats_dump(self, ctx, who: discord.Member | None = None):
             name = raw_data.pop("gate_name")
             claimed = raw_data.pop("claimed_date")
             raw_data["position"] = None
-            gate = Group.from_dict(self.bot.get_guild(self.server_id), raw_data)
+            gate = Group.from_dict(raw_data)
             gates.append(GateGroup(gate=gate, name=name, claimed=claimed))
 
         pag = commands.Paginator()
@@ -6,6 +6,7 @@
 import common.constants as constants
 from common.checks import has_role
 from common.embeds import create_default_embed
+from queueing.services import get_queue_services
 
 log = logging.getLogger(__name__)
 
@@ -13,13 +14,13 @@
 class GateOwners(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.gates_db = self.bot.mdb["gate_list"]
+        self.gate_repo = get_queue_services(bot).gate_repository
         self.server_id = constants.GATES_SERVER if self.bot.environment != "testing" else constants.DEBUG_SERVER
 
     async def cog_load(self):
         """Loads all claimed Gate channels on"""
         await self.bot.wait_until_ready()
-        all_gates = await self.gates_db.find().to_list(length=None)
+        all_gates = await self.gate_repo.list_gates()
         guild = self.bot.get_guild(self.server_id)
         for gate in all_gates:
             if not gate.get("owner"):
@@ -52,11 +53,11 @@ async def cog_load(self):
     @has_role("DM")
     async def claim_gate(self, ctx, gate_name: str):
         """Claim a gate as yours in the bot's database."""
-        if not (data := await self.gates_db.find_one({"name": gate_name.lower()})):
+        if not (data := await self.gate_repo.get_by_name(gate_name)):
             await ctx.send(f"Gate `{gate_name}` not found, please run command with a valid gate name.")
             return None
 
-        await self.gates_db.update_one({"_id": data["_id"]}, {"$set": {"owner": ctx.author.id}})
+        await self.gate_repo.set_owner(data["name"], ctx.author.id)
 
         embed = create_default_embed(
             ctx,
@@ -74,7 +75,7 @@ async def show_gate_owners(self, ctx):
         Shows known owners of gates.
         If your gate is not on this list, please run `=claim-gate <gate name>`
         """
-        data = await self.gates_db.find({"owner": {"$exists": True}}).to_list(length=None)
+        data = [gate for gate in await self.gate_repo.list_gates() if "owner" in gate]
         embed = create_default_embed(ctx, title="Gate Owners")
         description = "\n".join(
             [f"<@{item.get('owner')}> - {item.get('name').title()} Gate {item.get('emoji')}" for item in data]
@@ -8,40 +8,66 @@
 from disnake.ext import commands, tasks
 
 import common.constants as constants
+from common.bulk_actions import BulkMemberExecutor, MemberOutcome
 from common.checks import has_role
 from common.embeds import create_default_embed
+from common.metrics import metrics
+from placeholders import PlaceholderEvent, PlaceholderRepository, ReminderScheduler, has_placeholder_marker
+from queueing.repositories import ActivityRecord, ActivityRepository
+from queueing.services import get_queue_services
 
 log = logging.getLogger(__name__)
 
+INACTIVE_SPIEL = (
+    "Hello! You have been inactive for at least 6 months. "
+    "Please let us know if/when you plan to hop back into Gates "
+    "(by PMing an Admin or in <#1133560363493904435>). If you do not in the next couple weeks, "
+    "we will have to remove you form the server to keep our member list cleaner. Once that happens,"
+    " all you would need to do is shoot one of us admins a message (Lentan or Aeslyn)"
+    " and we'll get you right back in!"
+)
+
 
 class Placeholders(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.placeholder_db = bot.mdb["placeholder_events"]
-        self.settings_db = bot.mdb["placeholder-settings"]
+        self.repository = PlaceholderRepository(bot.mdb["placeholder_events"], bot.mdb["placeholder-settings"])
+        self.scheduler = ReminderScheduler(self.fire_reminder)
+        # placeholders registered while connected, whose edits and deletes we have seen
+        self.watched: set[int] = set()
         self.active_db = bot.mdb["active_users"]
+        self.activity = ActivityRepository(self.active_db, bot.mdb["activity_sweeps"])
+        self.bulk = BulkMemberExecutor(bot.mdb["bulk_action_runs"])
         self.server_id = constants.GATES_SERVER if self.bot.environment != "testing" else constants.DEBUG_SERVER
-        self.db_task = self.run_placeholders.start()
         self.inactive_listener = self.check_inactive.start()
+        self.bot.router.add_suffix_route(
+            "-ic", "placeholders.register", self.placeholder_listener, guild_id=self.server_id
+        )
+
+    async def cog_load(self):
+        """Rebuilds the pending reminders from the database and starts firing them."""
+        await self.bot.wait_until_ready()
+        if backfilled := await self.repository.backfill_due_times():
+            log.info(f"[Placeholder] Backfilled due times for {backfilled} placeholders.")
+        self.scheduler.load(await self.repository.list_pending())
+        self.scheduler.start()
+        log.info(f"[Placeholder] Loaded {len(self.scheduler)} pending reminders.")
 
     def cog_unload(self):
-        self.db_task.cancel()
+        self.scheduler.stop()
         self.inactive_listener.cancel()
+        self.bot.router.remove_route("placeholders.register")
 
-    @commands.Cog.listener(name="on_message")
     async def placeholder_listener(self, message):
         """
-        Listens to a message to see if it's a placeholder in an IC channel.
+        Checks a routed message from an IC channel to see if it's a placeholder.
         """
 
-        # stop if we're not in the right guild
-        if not message.guild:
-            return
-
-        if not message.guild.id == self.server_id:
+        if message.author.bot:
             return
 
-        if message.author.bot:
+        # stop if there's no placeholder
+        if not has_placeholder_marker(message.content):
             return
 
         # get the member
@@ -54,80 +80,88 @@ async def placeholder_listener(self, message):
         if not discord.utils.find(lambda r: r.name == "Placeholder Notifications", member.roles):
             return
 
-        # stop if the channel is wrong
-        if "-ic" not in message.channel.name.lower():
-            return
-
-        # stop if there's no placeholder:
-        if not any([x in message.content.lower() for x in ["*ph*", "*placeholder*", "_ph_", "_placeholder_"]]):
+        # register the placeholder in the database and queue its reminder
+        event = await self.repository.add_event(
+            author_id=message.author.id,
+            guild_id=message.guild.id,
+            channel_id=message.channel.id,
+            message_id=message.id,
+            message_date=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self.scheduler.schedule(event)
+        self.watched.add(event.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        # only messages in -ic channels are ever scheduled, so the pending set is the channel filter
+        content = payload.data.get("content")
+        if content is None or payload.message_id not in self.scheduler or has_placeholder_marker(content):
             return
-
-        # register the placeholder in the database
-        data = {
-            "author_id": message.author.id,
-            "guild_id": message.guild.id,
-            "channel_id": message.channel.id,
-            "message_id": message.id,
-            "message_date": datetime.datetime.now(datetime.timezone.utc),
-        }
-
-        await self.placeholder_db.insert_one(data)
-
-    @tasks.loop(minutes=2)
-    async def run_placeholders(self):
-        cursor = self.placeholder_db.find().sort("message_date")
-        utc_now = datetime.datetime.now(datetime.timezone.utc)
-        log.debug("running placeholder loop!")
-        for document in await cursor.to_list(length=None):
-            setting = await self.settings_db.find_one({"user_id": document["author_id"]})
-            setting = setting.get("hours", 1) if setting else 1
-
-            if (
-                document["message_date"].replace(tzinfo=datetime.timezone.utc) + datetime.timedelta(hours=setting)
-            ) < utc_now:
-                await self.placeholder_db.delete_one({"message_id": document["message_id"]})
-                await self.run_placeholder_reminder(document, setting)
-
-    async def run_placeholder_reminder(self, placeholder_data: dict, hours: int = 1):
+        await self.cancel_reminder(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if payload.message_id in self.scheduler:
+            await self.cancel_reminder(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        for message_id in payload.message_ids:
+            if message_id in self.scheduler:
+                await self.cancel_reminder(message_id)
+
+    async def cancel_reminder(self, message_id: int):
+        self.scheduler.cancel(message_id)
+        self.watched.discard(message_id)
+        await self.repository.remove(message_id)
+        metrics.increment("placeholders.cancelled")
+
+    async def fire_reminder(self, event: PlaceholderEvent):
+        # only the caller that removes the event sends the reminder
+        if await self.repository.remove(event.message_id):
+            await self.run_placeholder_reminder(event)
+        self.watched.discard(event.message_id)
+
+    async def run_placeholder_reminder(self, event: PlaceholderEvent):
+        hours = event.hours
         # get data from bot
-        guild = self.bot.get_guild(placeholder_data["guild_id"])
-        member: discord.Member = guild.get_member(placeholder_data["author_id"])
-        channel = guild.get_channel(placeholder_data["channel_id"])
+        guild = self.bot.get_guild(event.guild_id)
+        if guild is None:
+            return None
+        member: discord.Member = guild.get_member(event.author_id)
+        channel = guild.get_channel(event.channel_id)
 
         if not channel or not member:
             return None
 
         log.info(f"[Placeholder] running placeholder for {member.display_name} in #{channel.name}")
 
-        try:
-            message = await channel.fetch_message(placeholder_data["message_id"])
-        except discord.NotFound:
-            return None
-
-        # stop if the message is gone or the placeholder is done
-        if message is None or not any(
-            [x in message.content.lower() for x in ["*ph*", "*placeholder*", "_ph_", "_placeholder_"]]
-        ):
-            return None
+        # edits and deletes we saw already cancelled the reminder; only placeholders from before this
+        # session (whose edits we may have missed) still need to be checked against the message
+        if event.message_id not in self.watched:
+            metrics.increment("placeholders.verify_fetch")
+            try:
+                message = await channel.fetch_message(event.message_id)
+            except discord.NotFound:
+                return None
+            if not has_placeholder_marker(message.content):
+                return None
 
+        MessageProxy = namedtuple("MessageProxy", ["author"])
         ContextProxy = namedtuple("ContextProxy", ["message", "bot", "author"])
-        ctx = ContextProxy(message, self.bot, member)
+        ctx = ContextProxy(MessageProxy(member), self.bot, member)
 
         try:
             hour_str = f"{hours} hour{'s' if hours != 1 else ''}"
             embed = create_default_embed(ctx, title="Placeholder Reminder!")
             embed.description = (
                 f"You sent a placeholder in {channel.mention} that hasn't been updated in {hour_str}!\n"
-                f"[Here's a link to the message]({message.jump_url})\n"
+                f"[Here's a link to the message]({event.jump_url})\n"
             )
             return await member.send(embed=embed)
         except Exception:
             log.debug(f"Could not send placeholder reminder to {member.name}")
 
-    @run_placeholders.before_loop
-    async def before_run_placeholders(self):
-        await self.bot.wait_until_ready()
-
     @commands.command(name="updatetime")
     async def placeholder_update_setting(self, ctx, hours: int | None = None):
         """
@@ -139,11 +173,7 @@ async def placeholder_update_setting(self, ctx, hours: int | None = None):
         embed = create_default_embed(ctx)
         if hours is None:
             embed.title = "Current Placeholder Setting"
-            db_result = await self.settings_db.find_one({"user_id": ctx.author.id})
-            if db_result is None:
-                db_result = 1
-            else:
-                db_result = db_result["hours"]
+            db_result = await self.repository.get_hours(ctx.author.id)
             embed.description = (
                 f"The current setting is to send a reminder after {db_result} hour{'s' if db_result != 1 else ''}."
             )
@@ -152,7 +182,14 @@ async def placeholder_update_setting(self, ctx, hours: int | None = None):
         if hours < 1:
             raise commands.BadArgument("`hours` must be greater or equal to one.")
 
-        await self.settings_db.update_one({"user_id": ctx.author.id}, {"$set": {"hours": hours}}, upsert=True)
+        await self.repository.set_hours(ctx.author.id, hours)
+        # pending placeholders follow the new setting, as they did when it was read at check time
+        pending = self.scheduler.pending_for(ctx.author.id)
+        for event in pending:
+            event.hours = hours
+        await self.repository.save_due_times(pending)
+        for event in pending:
+            self.scheduler.schedule(event)
         embed.title = "Placeholder settings updated!"
         embed.description = (
             f"The current setting is now to send a reminder after {hours} hour{'s' if hours != 1 else ''}."
@@ -167,25 +204,16 @@ async def inactive(self, ctx):
         q = self.bot.cogs["QueueChannel"]
         s = self.bot.get_guild(q.server_id)
 
-        role = s.get_role(constants.INACTIVE_ROLE_ID)
-
-        inactive_members = filter(lambda m: role in m.roles, s.members)
-
         desc = [f"| {'Member Name':^30} | {'Last Sign-Up':^30} |"]
-        for x in inactive_members:
-            data = await self.active_db.find_one({"_id": x.id})
+        for x, record in await self.inactive_members(s):
             data = (
-                f"<t:{pendulum.instance(data.get('last_signup')).int_timestamp}:R>"
-                if data and data.get("last_signup")
+                f"<t:{pendulum.instance(record.last_signup).int_timestamp}:R>"
+                if record is not None and record.last_signup
                 else "Unknown"
             )
             desc.append(f"| {x.display_name} | {data} |")
 
-        embed = create_default_embed(ctx)
-        embed.title = "Inactive Users"
-        embed.description = "\n".join(desc)
-
-        await ctx.send(embed=embed)
+        await self.send_report(ctx, "Inactive Users", desc)
 
     @inactive.command(name="final")
     @has_role("Admin")
@@ -198,9 +226,8 @@ async def inactive_final(self, ctx):
         # get members
         q = self.bot.cogs["QueueChannel"]
         s = self.bot.get_guild(q.server_id)
-        role = s.get_role(constants.INACTIVE_ROLE_ID)
 
-        inactive_members: List[discord.Member] = list(filter(lambda m: role in m.roles, s.members))
+        inactive_members: List[discord.Member] = [member for member, _ in await self.inactive_members(s)]
 
         final_msg = (
             'Hi!\n\nYou\'ve recently been pinged as "Inactive" since you have not '
@@ -217,50 +244,60 @@ async def inactive_final(self, ctx):
             "cleaning up our inactive players."
         )
 
-        # send FINAL msg to inactive users
-        count = 0
-        success, fail = [], []
+        async def send_final(member: discord.Member) -> str:
+            await member.send(final_msg)
+            return "Final inactive spiel sent."
 
-        for member in inactive_members:
-            try:
-                await member.send(final_msg)
-            except discord.HTTPException, discord.Forbidden:
-                fail.append(member)
-            else:
-                success.append(member)
-            count += 1
+        # send FINAL msg to inactive users; a rerun the same day only messages the ones not reached yet
+        run_id = f"inactive-final:{datetime.date.today().isoformat()}"
+        report = await self.bulk.run(run_id, inactive_members, send_final)
 
         e = create_default_embed(ctx)
         e.title = "Final Inactive Spiel Report"
-        if success:
-            e.add_field("Success", value="\n".join(m.mention for m in success))
-        if fail:
-            e.add_field("Message Failed to Send", value="\n".join(m.mention for m in fail))
-        e.description = f"Report for {count} inactive users."
+        if report.succeeded:
+            e.add_field("Success", value="\n".join(f"<@{member_id}>" for member_id in report.succeeded))
+        if report.failed:
+            e.add_field("Message Failed to Send", value="\n".join(f"<@{member_id}>" for member_id in report.failed))
+        e.description = f"Report for {len(report.outcomes)} inactive users."
+        if report.skipped:
+            e.description += f" {report.skipped} were already messaged by an earlier run today."
 
         await ctx.send(embed=e)
 
+    async def inactive_members(self, guild: discord.Guild) -> list[tuple[discord.Member, ActivityRecord | None]]:
+        """Members with the Inactive role, with the activity the sweeps recorded for them."""
+        role = guild.get_role(constants.INACTIVE_ROLE_ID)
+        members = [member for member in guild.members if role in member.roles]
+        records = await self.activity.get_many([member.id for member in members])
+        return [(member, records.get(member.id)) for member in members]
+
+    @staticmethod
+    async def send_report(ctx, title: str, lines: list[str]):
+        """Sends ``lines`` as embed descriptions, split over as many embeds as the description limit needs."""
+        pag = commands.Paginator(prefix="", suffix="", max_size=4096)
+        for line in lines:
+            pag.add_line(line)
+
+        pages = pag.pages or [""]
+        for index, page in enumerate(pages, start=1):
+            embed = create_default_embed(ctx)
+            embed.title = title if len(pages) == 1 else f"{title} ({index}/{len(pages)})"
+            embed.description = page
+            await ctx.send(embed=embed)
+
     @inactive.command(name="dm")
     @commands.check_any(has_role("Admin"), commands.is_owner())  # pyright: ignore[reportArgumentType]
     async def inactive_dms(self, ctx):
-        out = ""
-        data = await self.bot.mdb["dm_analytics"].find().sort("dm_claims.last_claim").to_list(length=None)
         q = self.bot.cogs["QueueChannel"]
         serv = self.bot.get_guild(q.server_id)
-        for item in data:
-            u_id = item["_id"]
-            mem = serv.get_member(u_id)
+        dms = {mem.id: mem for mem in serv.members if any(x for x in mem.roles if x.name == "DM")}
+        last_claims = await get_queue_services(self.bot).analytics_repository.get_dm_last_claims(list(dms))
 
-            if mem is None or not any(x for x in mem.roles if x.name == "DM"):
-                continue
-            last_claim = item.get("dm_claims").get("last_claim").timestamp()
-            out += f"{mem.mention}| <t:{int(last_claim)}:R>\n"
-
-        embed = create_default_embed(ctx)
-        embed.title = "Inactive DMs"
-        embed.description = out
-
-        await ctx.send(embed=embed)
+        out = [
+            f"{dms[u_id].mention}| <t:{int(last_claim.timestamp())}:R>"
+            for u_id, last_claim in sorted(last_claims.items(), key=lambda item: item[1])
+        ]
+        await self.send_report(ctx, "Inactive DMs", out)
 
     # inactive role creator
     @tasks.loop(hours=24)
@@ -282,40 +319,53 @@ async def check_inactive(self):
             log.warning("Could not load inactive mod log channel")
             return
 
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         # six months ago
-        old = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=30 * 6)
-
-        data = await self.active_db.find({"last_signup": {"$lte": old}}).to_list(length=None)
-        user_ids = [x["_id"] for x in data]
-
-        # convert into users
-        members_raw = [s.get_member(user_id) for user_id in user_ids]
-        members: List[discord.Member] = [member for member in members_raw if member is not None]
-
-        # add Inactive Role & Member Role, Remove Player Role
-        count = 0
-        for member in members:
-            if not discord.utils.find(lambda r: r.id == inactive_role.id, member.roles):
-                # change roles
-                await member.add_roles(inactive_role, member_role, reason="User is inactive")
-                await member.remove_roles(player_role, reason="User is inactive")
-                # send the spiel
-                try:
-                    await member.send(
-                        "Hello! You have been inactive for at least 6 months. "
-                        "Please let us know if/when you plan to hop back into Gates "
-                        "(by PMing an Admin or in <#1133560363493904435>). If you do not in the next couple weeks, "
-                        "we will have to remove you form the server to keep our member list cleaner. Once that happens,"
-                        " all you would need to do is shoot one of us admins a message (Lentan or Aeslyn)"
-                        " and we'll get you right back in!"
-                    )
-                except discord.HTTPException, discord.Forbidden:
-                    await mod_log_channel.send(f"Could not send inactive spiel to {member.mention} via DM.")
-                else:
-                    await mod_log_channel.send(f"Inactive spiel sent to {member.mention} via DM.")
-                count += 1
-
-        log.info(f"[Activity] {count} users given Inactive role... Check Complete")
+        cutoff = now - datetime.timedelta(days=30 * 6)
+
+        # only the users whose last sign-up crossed the cutoff since the previous sweep
+        candidates = await self.activity.newly_inactive(cutoff)
+
+        # convert into users, fetching the ones that are not cached
+        resolver = get_queue_services(self.bot).member_resolver
+        found, departed = await resolver.lookup(s, [record.member_id for record in candidates])
+        members: List[discord.Member] = list(found.values())
+        if unresolved := len(candidates) - len(found) - len(departed):
+            log.info(f"[Activity] {unresolved} inactive candidates could not be resolved.")
+
+        async def mark_inactive(member: discord.Member) -> str:
+            # change roles
+            await member.add_roles(inactive_role, member_role, reason="User is inactive")
+            await member.remove_roles(player_role, reason="User is inactive")
+            # send the spiel
+            try:
+                await member.send(INACTIVE_SPIEL)
+            except discord.HTTPException:
+                return "Could not send inactive spiel via DM."
+            return "Inactive spiel sent via DM."
+
+        async def log_batch(outcomes: list[MemberOutcome]) -> None:
+            pag = commands.Paginator(prefix="", suffix="")
+            for outcome in outcomes:
+                detail = outcome.detail if outcome.ok else f"Could not mark inactive ({outcome.detail})."
+                pag.add_line(f"<@{outcome.member_id}>: {detail}")
+            for page in pag.pages:
+                await mod_log_channel.send(page)
+
+        to_mark = [member for member in members if inactive_role not in member.roles]
+        run_id = f"inactive-sweep:{datetime.date.today().isoformat()}"
+        report = await self.bulk.run(run_id, to_mark, mark_inactive, on_progress=log_batch)
+
+        failed = set(report.failed)
+        # members who left the guild are done with; a failed fetch or role change is retried by the next sweep
+        handled = {member.id for member in members if member.id not in failed} | departed
+        await self.activity.finish_sweep(
+            cutoff,
+            inactive=sorted(handled),
+            retry=[record for record in candidates if record.member_id not in handled],
+            at=now,
+        )
+        log.info(f"[Activity] {len(report.succeeded)} users given Inactive role... Check Complete")
 
     @commands.command(name="removeemojis")
     @commands.check_any(commands.is_owner(), has_role("Admin"))  # pyright: ignore[reportArgumentType]
@@ -2,6 +2,7 @@
 
 import logging
 import re
+from dataclasses import replace
 
 import disnake as discord
 import pendulum
@@ -11,9 +12,8 @@
 from common.checks import has_role
 from common.discord_utils import try_delete
 from common.embeds import create_default_embed
-from queueing.models import Queue
+from queueing.members import resolve_members, sort_by_display_name
 from queueing.parsing import length_check
-from queueing.repositories import load_queue_for_guild
 from queueing.services import get_queue_services
 
 line_re = re.compile(r"\*\*in line:*\*\*", re.IGNORECASE)
@@ -21,21 +21,15 @@
 log = logging.getLogger(__name__)
 
 
-async def queue_from_guild(db, guild: discord.Guild) -> Queue:
-    return await load_queue_for_guild(db, guild)
-
-
 class QueueChannel(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.services = get_queue_services(bot)
         self.player_service = self.services.player_queue_service
-        self.queue_repo = self.services.queue_repository
+        self.queue_store = self.services.queue_store
         self.gate_repo = self.services.gate_repository
-        self.queue_db = bot.mdb["player_queue"]
         self.old_player_data_db = bot.mdb["queue_analytics"]
         self.old_gates_db = bot.mdb["gate_groups_analytics"]
-        self.gate_list_db = bot.mdb["gate_list"]
         self.emoji_db = bot.mdb["emoji_ranking"]
 
         self.dm_db = bot.mdb["dm_analytics"]
@@ -50,6 +44,7 @@ def __init__(self, bot):
         self.announcement_channel_id = self.services.config.gate_announcement_channel_id
 
         self.update_bot_status.start()
+        self.bot.router.add_channel_route(self.channel_id, "queue.signup", self.queue_listener)
 
     async def cog_check(self, ctx):  # pyright: ignore[reportIncompatibleMethodOverride]
         if not ctx.guild:
@@ -59,17 +54,40 @@ async def cog_check(self, ctx):  # pyright: ignore[reportIncompatibleMethodOverr
         if ctx.guild.id == constants.DEBUG_SERVER and self.bot.environment == "testing":
             return True
 
+    async def cog_load(self):
+        """Loads the player queue into memory so signups and reads never wait on Mongo."""
+        await self.bot.wait_until_ready()
+        guild = self.bot.get_guild(self.server_id)
+        if guild is None:
+            log.warning("[Queue] Could not find queue guild, skipping queue warm-up.")
+            return
+        queue = await self.queue_store.warm(guild)
+        log.info(f"[Queue] Loaded {queue.player_count} queued players into memory.")
+        # prefill texts for the Join modal, for everyone who signed up in the last six months
+        warmed = await self.services.analytics_repository.warm_signup_texts(
+            active_since=pendulum.now(tz=pendulum.tz.UTC).subtract(months=6)
+        )
+        log.info(f"[Queue] Cached the last sign-up text of {warmed} recently active players.")
+
     def cog_unload(self):
         self.update_bot_status.cancel()
+        self.bot.router.remove_route("queue.signup")
 
-    @commands.Cog.listener(name="on_message")
-    async def queue_listener(self, message: discord.Message):
-        if message.guild is None:
-            return None
+    @commands.Cog.listener(name="on_member_remove")
+    async def prune_departed_member(self, member: discord.Member):
+        """Players are kept by id, so drop anyone who leaves the server instead of rendering a dangling id."""
+        if member.guild.id != self.server_id:
+            return
+        queue = self.queue_store.peek(member.guild.id)
+        if queue is not None and queue.in_queue(member.id) is None:
+            return
 
-        if not (self.server_id == message.guild.id and self.channel_id == message.channel.id):
-            return None
+        result = await self.player_service.remove_member(guild=member.guild, member_id=member.id)
+        if result.success:
+            log.info(f"[Queue] Removed {member} from the queue after they left the server.")
 
+    async def queue_listener(self, message: discord.Message):
+        """Routed messages from the player queue channel."""
         if not line_re.match(message.content):
             return None
 
@@ -204,7 +222,7 @@ async def merge_groups(self, ctx, group_1: int, group_2: int):
     @commands.command(name="queue")
     async def send_current_queue(self, ctx):
         """Sends the current queue."""
-        queue = await queue_from_guild(self.queue_db, ctx.guild)
+        queue = await self.queue_store.load_for_guild(ctx.guild)
         embed = await self.services.presentation_service.build_player_queue_embed(queue)
         embed.title = "Gate Sign-Up Queue"
         return await ctx.send(embed=embed)
@@ -213,12 +231,13 @@ async def send_current_queue(self, ctx):
     @commands.check_any(has_role("Admin"), commands.is_owner())  # pyright: ignore[reportArgumentType]
     async def send_queue_waitlist(self, ctx):
         """Lists queued players by wait time, longest first. Requires the Admin role."""
-        queue = await self.queue_repo.load_for_guild(ctx.guild, channel_id=self.channel_id)
-        member_ids = [player.member.id for group in queue.groups for player in group.players]
+        queue = await self.queue_store.load_for_guild(ctx.guild)
+        member_ids = queue.member_ids
         signup_times = await self.services.analytics_repository.get_player_signup_times(member_ids)
         embed = await self.services.presentation_service.build_player_waitlist_embed(
             queue,
             signup_times=signup_times,
+            members=resolve_members(ctx.guild, member_ids),
         )
         return await ctx.send(embed=embed)
 
@@ -242,7 +261,7 @@ async def remove_queue_member(self, ctx, player: discord.Member):
     @commands.command(name="gateinfo", aliases=["groupinfo"])
     async def group_info(self, ctx, group_number: int):
         """Returns Information about a group."""
-        queue = await queue_from_guild(self.queue_db, ctx.guild)
+        queue = await self.queue_store.load_for_guild(ctx.guild)
 
         length = len(queue.groups)
         check = length_check(length, group_number)
@@ -250,11 +269,12 @@ async def group_info(self, ctx, group_number: int):
             return await ctx.send(check)
 
         group = queue.groups[group_number - 1]
-        group.players.sort(key=lambda x: x.member.display_name)
+        members = resolve_members(ctx.guild, (player.member_id for player in group.players))
+        group = replace(group, players=sort_by_display_name(group.players, members))
 
         embed = create_default_embed(ctx)
         embed.title = f"Information for Group #{group_number}"
-        embed.description = group.player_levels_str
+        embed.description = group.player_levels_str(members)
         return await ctx.send(embed=embed)
 
     @commands.command(name="creategroup")
@@ -305,7 +325,7 @@ async def update_bot_status(self):
         guild = self.bot.get_guild(self.server_id)
         if guild is None:
             return None
-        queue = await queue_from_guild(self.queue_db, guild)
+        queue = await self.queue_store.load_for_guild(guild)
         if queue is None:
             return None
 
@@ -324,7 +344,7 @@ async def stats(self, ctx):
         Base command for GatesBot stats.
         This command by itself will show stats about the current Queue.
         """
-        queue = await queue_from_guild(self.queue_db, ctx.guild)
+        queue = await self.queue_store.load_for_guild(ctx.guild)
         if queue is None:
             return None
 
@@ -28,10 +28,14 @@ def __init__(self, bot):
 
         self.db = self.bot.mdb["strike_queue"]
         self.meta_db = self.bot.mdb["queue_meta"]
-        self.gate_db = bot.mdb["gate_list"]
         self.data_db = self.bot.mdb["queue_analytics"]
         self.r_db = self.bot.mdb["reinforcement_analytics"]
 
+        self.bot.router.add_channel_route(self.queue_channel_id, "strike_queue.ready", self.strike_queue_listener)
+
+    def cog_unload(self):
+        self.bot.router.remove_route("strike_queue.ready")
+
     async def cog_check(self, ctx):  # pyright: ignore[reportIncompatibleMethodOverride]
         if not ctx.guild:
             return False
@@ -40,11 +44,8 @@ async def cog_check(self, ctx):  # pyright: ignore[reportIncompatibleMethodOverr
         if ctx.guild.id == constants.DEBUG_SERVER and self.bot.environment == "testing":
             return True
 
-    @commands.Cog.listener(name="on_message")
     async def strike_queue_listener(self, msg):
-        if msg.channel.id != self.queue_channel_id:
-            return
-
+        """Routed messages from the Strike Team queue channel."""
         if not msg.content.lower().startswith("**ready"):
             return
 
@@ -68,19 +69,11 @@ async def strike_queue_listener(self, msg):
         except:
             pass
 
-        await self.update_queue()
-
     async def generate_embed(self):
         guild = self.bot.get_guild(self.server_id)
         entries = await self.services.strike_queue_repository.list_entries()
         return await self.presentation.build_strike_queue_embed(guild=guild, entries=entries)
 
-    async def update_queue(self):
-        guild = self.bot.get_guild(self.server_id)
-        await self.strike_service.refresh_queue_message(
-            guild=guild,
-        )
-
     @commands.group(name="strike", invoke_without_command=True)
     async def strike(self, ctx):
         """Base command for DM queue"""
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, ClassVar
+
+import disnake as discord
+from pymongo.asynchronous.collection import AsyncCollection
+
+from common.constants import (
+    BULK_ACTION_BATCH_SIZE,
+    BULK_ACTION_CONCURRENCY,
+    BULK_ACTION_INTERVAL,
+    BULK_ACTION_RUN_TTL,
+)
+from common.indexes import IndexSpec
+from common.metrics import MetricsRegistry, metrics
+
+log = logging.getLogger(__name__)
+
+# returns a short description of what was done, raises if the member could not be handled
+MemberAction = Callable[[discord.Member], Awaitable[str]]
+
+
+@dataclass(slots=True)
+class MemberOutcome:
+    member_id: int
+    ok: bool
+    detail: str
+
+
+ProgressCallback = Callable[[list[MemberOutcome]], Awaitable[Any]]
+
+
+@dataclass(slots=True)
+class BulkRunReport:
+    run_id: str
+    outcomes: list[MemberOutcome] = field(default_factory=list)
+    skipped: int = 0
+
+    @property
+    def succeeded(self) -> list[int]:
+        return [outcome.member_id for outcome in self.outcomes if outcome.ok]
+
+    @property
+    def failed(self) -> list[int]:
+        return [outcome.member_id for outcome in self.outcomes if not outcome.ok]
+
+
+class BulkMemberExecutor:
+    """
+    Applies one action to many members without tripping Discord's rate limits.
+
+    At most ``concurrency`` actions run at once and their calls are spaced ``interval`` seconds apart; a 429
+    that gets past disnake's own bucket handling is retried after its ``retry_after``. Results are saved to
+    ``progress`` under the run id every ``batch_size`` members, so running the same id again after a restart
+    skips members that were already handled and retries the ones that failed. ``on_progress`` receives the
+    same batches, for summary logging. Run documents expire ``BULK_ACTION_RUN_TTL`` seconds after their last
+    update.
+    """
+
+    INDEXES: ClassVar[tuple[IndexSpec, ...]] = (
+        IndexSpec.on("bulk_action_runs", "updated_at", expire_after=BULK_ACTION_RUN_TTL),
+    )
+
+    def __init__(
+        self,
+        progress: AsyncCollection,
+        *,
+        concurrency: int = BULK_ACTION_CONCURRENCY,
+        interval: float = BULK_ACTION_INTERVAL,
+        batch_size: int = BULK_ACTION_BATCH_SIZE,
+        max_retries: int = 3,
+        registry: MetricsRegistry = metrics,
+    ):
+        self.progress = progress
+        self.concurrency = concurrency
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.registry = registry
+
+    async def run(
+        self,
+        run_id: str,
+        members: list[discord.Member],
+        action: MemberAction,
+        *,
+        on_progress: ProgressCallback | None = None,
+    ) -> BulkRunReport:
+        stored = await self.progress.find_one({"_id": run_id}) or {}
+        done = set(stored.get("done", []))
+        todo = [member for member in members if member.id not in done]
+        report = BulkRunReport(run_id=run_id, skipped=len(members) - len(todo))
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pace_lock = asyncio.Lock()
+        flush_lock = asyncio.Lock()
+        next_slot = loop.time()
+        unsaved: list[MemberOutcome] = []
+
+        async def wait_turn() -> None:
+            nonlocal next_slot
+            async with pace_lock:
+                wait = next_slot - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                next_slot = max(next_slot, loop.time()) + self.interval
+
+        async def flush() -> None:
+            async with flush_lock:
+                batch = unsaved[:]
+                del unsaved[:]
+                if not batch:
+                    return
+                await self._save(run_id, batch)
+                if on_progress is not None:
+                    try:
+                        await on_progress(batch)
+                    except Exception:
+                        log.exception(f"[Bulk] Progress report for {run_id} failed.")
+
+        async def handle(member: discord.Member) -> None:
+            async with semaphore:
+                outcome = await self._attempt(member, action, wait_turn)
+            report.outcomes.append(outcome)
+            unsaved.append(outcome)
+            if len(unsaved) >= self.batch_size:
+                await flush()
+
+        await asyncio.gather(*(handle(member) for member in todo))
+        await flush()
+        await self.progress.update_one(
+            {"_id": run_id},
+            {"$set": {"finished": True}, "$currentDate": {"updated_at": True}},
+            upsert=True,
+        )
+        return report
+
+    async def _attempt(
+        self,
+        member: discord.Member,
+        action: MemberAction,
+        wait_turn: Callable[[], Awaitable[None]],
+    ) -> MemberOutcome:
+        attempt = 0
+        while True:
+            await wait_turn()
+            try:
+                detail = await action(member)
+            except discord.HTTPException as e:
+                if e.status == 429 and attempt < self.max_retries:
+                    attempt += 1
+                    self.registry.increment("bulk.rate_limited")
+                    await asyncio.sleep(getattr(e, "retry_after", None) or self.interval * 2**attempt)
+                    continue
+                self.registry.increment("bulk.failed")
+                return MemberOutcome(member.id, False, f"{e.__class__.__name__} ({e.status})")
+            except Exception as e:
+                self.registry.increment("bulk.failed")
+                log.exception(f"[Bulk] Action failed for member {member.id}.")
+                return MemberOutcome(member.id, False, e.__class__.__name__)
+            else:
+                self.registry.increment("bulk.succeeded")
+                return MemberOutcome(member.id, True, detail)
+
+    async def _save(self, run_id: str, batch: list[MemberOutcome]) -> None:
+        # only successes count as done, so a rerun of the same id tries the failures again
+        pushes: dict[str, Any] = {}
+        succeeded = [outcome.member_id for outcome in batch if outcome.ok]
+        if succeeded:
+            pushes["done"] = {"$each": succeeded}
+        failed = [outcome.member_id for outcome in batch if not outcome.ok]
+        if failed:
+            pushes["failed"] = {"$each": failed}
+        await self.progress.update_one(
+            {"_id": run_id},
+            {"$push": pushes, "$currentDate": {"updated_at": True}},
+            upsert=True,
+        )
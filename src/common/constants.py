@@ -42,3 +42,23 @@
 
 GATE_ASSIGNMENTS_CHANNEL = 874795661198000208
 QUEUE_ENCOUNTER_CHANNEL = 798247432743551067
+
+# seconds a board waits for a burst of changes to settle, and the longest it will wait overall
+BOARD_REFRESH_DELAY = 2.0
+BOARD_REFRESH_MAX_LATENCY = 10.0
+# seconds signups are buffered so an unlock rush is applied to the queue in one pass
+SIGNUP_BATCH_WINDOW = 0.2
+# analytics writes are flushed once this many are queued, or this many seconds after the first one
+ANALYTICS_MAX_BATCH = 500
+ANALYTICS_FLUSH_INTERVAL = 1.0
+# bulk member actions: how many run at once, the minimum seconds between their Discord calls, and how
+# many results are saved and reported to the mod log together
+BULK_ACTION_CONCURRENCY = 4
+BULK_ACTION_INTERVAL = 0.25
+BULK_ACTION_BATCH_SIZE = 20
+# how long a bulk run's progress document is kept after its last update, in seconds
+BULK_ACTION_RUN_TTL = 30 * 24 * 60 * 60
+# members fetched over REST: how many fetches run at once, and how many are kept for how many seconds
+MEMBER_FETCH_CONCURRENCY = 5
+MEMBER_CACHE_SIZE = 512
+MEMBER_CACHE_TTL = 60.0
@@ -5,6 +5,8 @@
 import disnake as discord
 from pymongo.asynchronous.collection import AsyncCollection
 
+from common.metrics import MetricsRegistry, metrics
+
 
 def require_message_guild(message: discord.Message) -> discord.Guild:
     if message.guild is None:
@@ -18,6 +20,24 @@ def require_interaction_guild(interaction: discord.Interaction) -> discord.Guild
     return interaction.guild
 
 
+def observe_first_response(
+    interaction: discord.Interaction,
+    *,
+    name: str | None = None,
+    registry: MetricsRegistry = metrics,
+) -> None:
+    """
+    Records how long after Discord created ``interaction`` the bot first answered it, per component custom id.
+
+    Call it right after the first ``send``, ``defer`` or ``send_modal``; Discord fails the interaction when
+    that takes longer than three seconds. Components without a fixed custom id get a random one per view,
+    so they pass ``name`` instead to keep the metric names bounded.
+    """
+    custom_id = name or getattr(interaction.data, "custom_id", None) or "unknown"
+    elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    registry.observe(f"interaction.first_response.{custom_id}", elapsed)
+
+
 def require_interaction_member(interaction: discord.Interaction) -> discord.Member:
     return cast(discord.Member, interaction.author)
 
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexSpec:
+    collection: str
+    keys: tuple[tuple[str, int], ...]
+    unique: bool = False
+    sparse: bool = False
+    # seconds after the indexed date field that Mongo deletes the document, for TTL indexes
+    expire_after: int | None = None
+
+    @classmethod
+    def on(
+        cls,
+        collection: str,
+        *keys: str | tuple[str, int],
+        unique: bool = False,
+        sparse: bool = False,
+        expire_after: int | None = None,
+    ) -> IndexSpec:
+        """Builds a spec from field names (ascending) or ``(field, direction)`` pairs."""
+        resolved = tuple((key, ASCENDING) if isinstance(key, str) else key for key in keys)
+        return cls(collection=collection, keys=resolved, unique=unique, sparse=sparse, expire_after=expire_after)
+
+    @property
+    def name(self) -> str:
+        # matches the name Mongo generates, so existing hand-made indexes are recognised
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+    def to_model(self) -> IndexModel:
+        options: dict[str, Any] = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.expire_after is not None:
+            options["expireAfterSeconds"] = self.expire_after
+        return IndexModel(list(self.keys), **options)
+
+    def __str__(self) -> str:
+        return f"{self.collection}.{self.name}"
+
+
+@dataclass(slots=True)
+class IndexReport:
+    created: list[IndexSpec] = field(default_factory=list)
+    failed: list[IndexSpec] = field(default_factory=list)
+    missing: list[IndexSpec] = field(default_factory=list)
+    unused: list[str] = field(default_factory=list)
+
+    @property
+    def healthy(self) -> bool:
+        return not (self.failed or self.missing)
+
+
+class IndexRegistry:
+    """
+    The indexes the bot's queries rely on, declared next to the repositories that run those queries.
+
+    ``ensure`` creates whatever is missing and is safe to run on every start; ``verify`` reports declared
+    indexes that do not exist and indexes Mongo has never used since it last restarted.
+    """
+
+    def __init__(self, specs: Iterable[IndexSpec] = ()):
+        self._specs: dict[tuple[str, str], IndexSpec] = {}
+        self.register(*specs)
+
+    def register(self, *specs: IndexSpec) -> None:
+        for spec in specs:
+            self._specs[(spec.collection, spec.name)] = spec
+
+    @property
+    def specs(self) -> list[IndexSpec]:
+        return list(self._specs.values())
+
+    def _by_collection(self) -> dict[str, list[IndexSpec]]:
+        grouped: dict[str, list[IndexSpec]] = {}
+        for spec in self._specs.values():
+            grouped.setdefault(spec.collection, []).append(spec)
+        return grouped
+
+    async def ensure(self, db: Mapping[str, Any]) -> IndexReport:
+        report = IndexReport()
+        for collection_name, specs in self._by_collection().items():
+            collection = db[collection_name]
+            to_create = specs
+            try:
+                existing = await collection.index_information()
+                to_create = [spec for spec in specs if spec.name not in existing]
+                if to_create:
+                    await collection.create_indexes([spec.to_model() for spec in to_create])
+            except PyMongoError:
+                log.exception(f"[Indexes] Could not create indexes on {collection_name}.")
+                report.failed.extend(to_create)
+            else:
+                report.created.extend(to_create)
+        return report
+
+    async def verify(self, db: Mapping[str, Any]) -> IndexReport:
+        report = IndexReport()
+        for collection_name, specs in self._by_collection().items():
+            collection = db[collection_name]
+            existing = await collection.index_information()
+            report.missing.extend(spec for spec in specs if spec.name not in existing)
+
+            try:
+                cursor = await collection.aggregate([{"$indexStats": {}}])
+                stats = await cursor.to_list(length=None)
+            except PyMongoError:
+                log.warning(f"[Indexes] $indexStats is unavailable for {collection_name}.")
+                continue
+            for stat in stats:
+                if stat.get("name") == "_id_":
+                    continue
+                if int(stat.get("accesses", {}).get("ops", 0)) == 0:
+                    report.unused.append(f"{collection_name}.{stat['name']}")
+        return report
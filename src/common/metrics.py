@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Observation:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class MetricsRegistry:
+    """Process-local counters and timings, cheap enough to record on every command."""
+
+    def __init__(self):
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self.observations: defaultdict[str, Observation] = defaultdict(Observation)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def observe(self, name: str, value: float) -> None:
+        observation = self.observations[name]
+        observation.count += 1
+        observation.total += value
+        observation.max = max(observation.max, value)
+
+    def snapshot(self) -> dict[str, int | Observation]:
+        out: dict[str, int | Observation] = dict(self.counters)
+        out.update({name: Observation(item.count, item.total, item.max) for name, item in self.observations.items()})
+        return out
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.observations.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from common.indexes import IndexSpec
+
+
+@dataclass(frozen=True, slots=True)
+class QueryShape:
+    """One query the bot issues, with sample values standing in for the real ids."""
+
+    name: str
+    collection: str
+    filter: dict[str, Any] = field(default_factory=dict)
+    sort: tuple[tuple[str, int], ...] = ()
+    limit: int | None = None
+
+
+@dataclass(slots=True)
+class QueryPlan:
+    shape: QueryShape
+    stages: list[str]
+    docs_examined: int
+    keys_examined: int
+    returned: int
+    millis: int
+
+    @property
+    def collscan(self) -> bool:
+        return "COLLSCAN" in self.stages
+
+    def __str__(self) -> str:
+        flag = " [COLLSCAN]" if self.collscan else ""
+        return (
+            f"{self.shape.name}: {'>'.join(self.stages)} examined={self.docs_examined} "
+            f"keys={self.keys_examined} returned={self.returned} {self.millis}ms{flag}"
+        )
+
+
+def _plan_stages(plan: dict[str, Any]) -> list[str]:
+    # newer servers nest the classic plan under "queryPlan"
+    plan = plan.get("queryPlan", plan)
+    stages = [plan["stage"]] if "stage" in plan else []
+    children = plan.get("inputStages") or ([plan["inputStage"]] if "inputStage" in plan else [])
+    for child in children:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def explain_shape(db: Any, shape: QueryShape) -> QueryPlan:
+    find: dict[str, Any] = {"find": shape.collection, "filter": shape.filter}
+    if shape.sort:
+        find["sort"] = dict(shape.sort)
+    if shape.limit is not None:
+        find["limit"] = shape.limit
+
+    result = await db.command({"explain": find, "verbosity": "executionStats"})
+    stats = result.get("executionStats", {})
+    return QueryPlan(
+        shape=shape,
+        stages=_plan_stages(result.get("queryPlanner", {}).get("winningPlan", {})),
+        docs_examined=int(stats.get("totalDocsExamined", 0)),
+        keys_examined=int(stats.get("totalKeysExamined", 0)),
+        returned=int(stats.get("nReturned", 0)),
+        millis=int(stats.get("executionTimeMillis", 0)),
+    )
+
+
+async def audit_queries(db: Any, shapes: Iterable[QueryShape]) -> list[QueryPlan]:
+    return [await explain_shape(db, shape) for shape in shapes]
+
+
+def _is_covered(
+    collection: str,
+    query: dict[str, Any],
+    sort: tuple[tuple[str, int], ...],
+    specs: list[IndexSpec],
+) -> bool:
+    if "$or" in query:
+        return all(_is_covered(collection, branch, sort, specs) for branch in query["$or"])
+
+    fields = {key for key in query if not key.startswith("$")}
+    if "_id" in fields:
+        return True
+    if not fields and sort:
+        fields = {sort[0][0]}
+    if not fields:
+        # a plain full listing is a scan whatever indexes exist
+        return True
+    return any(spec.collection == collection and spec.keys[0][0] in fields for spec in specs)
+
+
+def find_unindexed(shapes: Iterable[QueryShape], specs: Iterable[IndexSpec]) -> list[QueryShape]:
+    """
+    Returns the shapes no declared index could serve, i.e. whose filter (or, for an unfiltered query, sort)
+    does not start with the leading key of an index on that collection. Every ``$or`` branch must be served.
+
+    This is a static check for tests; ``audit_queries`` asks a live server for the real plans.
+    """
+    specs = list(specs)
+    return [shape for shape in shapes if not _is_covered(shape.collection, shape.filter, shape.sort, specs)]
@@ -1,7 +1,7 @@
 import asyncio
 import datetime
 
-from bot.bootstrap import COGS, build_bot, register_persistent_views
+from bot.bootstrap import COGS, build_bot, ensure_indexes, register_persistent_views
 from bot.logging_setup import configure_logging
 from common.discord_utils import try_delete
 from common.settings import settings
@@ -15,6 +15,8 @@ async def on_ready():
     bot.ready_time = datetime.datetime.now(datetime.timezone.utc)
     bot.loop = asyncio.get_running_loop()
     register_persistent_views(bot)
+    await ensure_indexes(bot)
+    await bot.prefix_matcher.warm([str(guild.id) for guild in bot.guilds])
 
     ready_message = (
         f"\n---------------------------------------------------\n"
@@ -28,12 +30,18 @@ async def on_ready():
 
 @bot.event
 async def on_message(message):
+    bot.router.dispatch(message)
+
     if message.author.bot:
         return None
 
     if not bot.is_ready():
         return None
 
+    # most messages are chat; rule them out before building a context
+    if not bot.prefix_matcher.could_be_command(message):
+        return None
+
     context = await bot.get_context(message)
     if context.command is not None:
         return await bot.invoke(context)
@@ -0,0 +1,12 @@
+from .models import DEFAULT_REMINDER_HOURS, PLACEHOLDER_MARKER_RE, PlaceholderEvent, has_placeholder_marker
+from .repository import PlaceholderRepository
+from .scheduler import ReminderScheduler
+
+__all__ = [
+    "DEFAULT_REMINDER_HOURS",
+    "PLACEHOLDER_MARKER_RE",
+    "PlaceholderEvent",
+    "PlaceholderRepository",
+    "ReminderScheduler",
+    "has_placeholder_marker",
+]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+DEFAULT_REMINDER_HOURS = 1
+# *ph*, *placeholder*, _ph_ or _placeholder_, in any case
+PLACEHOLDER_MARKER_RE = re.compile(r"([*_])(?:ph|placeholder)\1", re.IGNORECASE)
+
+
+def has_placeholder_marker(content: str) -> bool:
+    return PLACEHOLDER_MARKER_RE.search(content) is not None
+
+
+def as_utc(value: datetime) -> datetime:
+    # Mongo hands datetimes back naive, in UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+@dataclass(slots=True)
+class PlaceholderEvent:
+    author_id: int
+    guild_id: int
+    channel_id: int
+    message_id: int
+    message_date: datetime
+    hours: int = DEFAULT_REMINDER_HOURS
+
+    @property
+    def due_at(self) -> datetime:
+        return self.message_date + timedelta(hours=self.hours)
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.message_id}"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PlaceholderEvent:
+        return cls(
+            author_id=int(data["author_id"]),
+            guild_id=int(data["guild_id"]),
+            channel_id=int(data["channel_id"]),
+            message_id=int(data["message_id"]),
+            message_date=as_utc(data["message_date"]),
+            hours=int(data.get("hours", DEFAULT_REMINDER_HOURS)),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "author_id": self.author_id,
+            "guild_id": self.guild_id,
+            "channel_id": self.channel_id,
+            "message_id": self.message_id,
+            "message_date": self.message_date,
+            "hours": self.hours,
+            "due_at": self.due_at,
+        }
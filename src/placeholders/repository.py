@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import ClassVar
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+
+from common.indexes import IndexSpec
+from common.query_audit import QueryShape
+from placeholders.models import DEFAULT_REMINDER_HOURS, PlaceholderEvent
+
+
+class PlaceholderRepository:
+    """
+    Pending placeholder reminders and each user's reminder delay.
+
+    Every event stores its ``due_at`` so pending reminders can be read back in due order from an index.
+    The ``hours`` settings are cached per user; ``set_hours`` is the only writer and keeps the cache current.
+    """
+
+    INDEXES: ClassVar[tuple[IndexSpec, ...]] = (
+        IndexSpec.on("placeholder_events", "due_at"),
+        IndexSpec.on("placeholder_events", "message_id"),
+        IndexSpec.on("placeholder-settings", "user_id"),
+    )
+    QUERY_SHAPES: ClassVar[tuple[QueryShape, ...]] = (
+        QueryShape("placeholders.pending", "placeholder_events", {"due_at": {"$exists": True}}, (("due_at", 1),)),
+        QueryShape("placeholders.missing_due_at", "placeholder_events", {"due_at": {"$exists": False}}),
+        QueryShape("placeholders.by_message", "placeholder_events", {"message_id": 0}),
+        QueryShape("placeholders.settings", "placeholder-settings", {"user_id": {"$in": [0]}}),
+    )
+
+    def __init__(self, events: AsyncCollection, settings: AsyncCollection):
+        self.events = events
+        self.settings = settings
+        self._hours: dict[int, int] = {}
+
+    async def get_hours(self, user_id: int) -> int:
+        return (await self.get_hours_for([user_id]))[user_id]
+
+    async def get_hours_for(self, user_ids: list[int]) -> dict[int, int]:
+        missing = [user_id for user_id in set(user_ids) if user_id not in self._hours]
+        if missing:
+            docs = await self.settings.find({"user_id": {"$in": missing}}).to_list(length=None)
+            found = {int(doc["user_id"]): int(doc.get("hours", DEFAULT_REMINDER_HOURS)) for doc in docs}
+            for user_id in missing:
+                self._hours[user_id] = found.get(user_id, DEFAULT_REMINDER_HOURS)
+        return {user_id: self._hours[user_id] for user_id in user_ids}
+
+    async def set_hours(self, user_id: int, hours: int) -> None:
+        await self.settings.update_one({"user_id": user_id}, {"$set": {"hours": hours}}, upsert=True)
+        self._hours[user_id] = hours
+
+    async def add_event(
+        self,
+        *,
+        author_id: int,
+        guild_id: int,
+        channel_id: int,
+        message_id: int,
+        message_date: datetime,
+    ) -> PlaceholderEvent:
+        event = PlaceholderEvent(
+            author_id=author_id,
+            guild_id=guild_id,
+            channel_id=channel_id,
+            message_id=message_id,
+            message_date=message_date,
+            hours=await self.get_hours(author_id),
+        )
+        await self.events.insert_one(event.to_dict())
+        return event
+
+    async def list_pending(self) -> list[PlaceholderEvent]:
+        docs = await self.events.find({"due_at": {"$exists": True}}).sort("due_at", 1).to_list(length=None)
+        return [PlaceholderEvent.from_dict(doc) for doc in docs]
+
+    async def save_due_times(self, events: list[PlaceholderEvent]) -> None:
+        if not events:
+            return
+        await self.events.bulk_write(
+            [
+                UpdateOne({"message_id": event.message_id}, {"$set": {"hours": event.hours, "due_at": event.due_at}})
+                for event in events
+            ],
+            ordered=False,
+        )
+
+    async def backfill_due_times(self) -> int:
+        """Gives events stored before ``due_at`` existed their due time, using one settings lookup."""
+        docs = await self.events.find({"due_at": {"$exists": False}}).to_list(length=None)
+        if not docs:
+            return 0
+        hours = await self.get_hours_for([int(doc["author_id"]) for doc in docs])
+        events = [PlaceholderEvent.from_dict(doc) for doc in docs]
+        for event in events:
+            event.hours = hours[event.author_id]
+        await self.save_due_times(events)
+        return len(events)
+
+    async def remove(self, message_id: int) -> bool:
+        result = await self.events.delete_one({"message_id": message_id})
+        return bool(result.deleted_count)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import UTC, datetime
+from typing import Any, Awaitable, Callable
+
+from common.metrics import MetricsRegistry, metrics
+from placeholders.models import PlaceholderEvent
+
+log = logging.getLogger(__name__)
+
+ReminderCallback = Callable[[PlaceholderEvent], Awaitable[Any]]
+Clock = Callable[[], datetime]
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class ReminderScheduler:
+    """
+    Fires placeholder reminders at their due time.
+
+    Pending reminders sit in a min-heap keyed on ``due_at``. A single task sleeps until the earliest one is
+    due and is woken early whenever the head of the heap changes. Cancelled or rescheduled reminders are
+    left in the heap and skipped when they reach the top.
+    """
+
+    def __init__(self, fire: ReminderCallback, *, clock: Clock = _utc_now, registry: MetricsRegistry = metrics):
+        self.fire = fire
+        self.clock = clock
+        self.registry = registry
+        self._heap: list[tuple[datetime, int, int]] = []
+        self._pending: dict[int, tuple[int, PlaceholderEvent]] = {}
+        self._sequence = itertools.count()
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self._pending
+
+    def load(self, events: list[PlaceholderEvent]) -> None:
+        self._heap.clear()
+        self._pending.clear()
+        for event in events:
+            sequence = next(self._sequence)
+            self._pending[event.message_id] = (sequence, event)
+            self._heap.append((event.due_at, sequence, event.message_id))
+        heapq.heapify(self._heap)
+        self._notify()
+
+    def schedule(self, event: PlaceholderEvent) -> None:
+        sequence = next(self._sequence)
+        self._pending[event.message_id] = (sequence, event)
+        heapq.heappush(self._heap, (event.due_at, sequence, event.message_id))
+        if self._heap[0][1] == sequence:
+            self._notify()
+
+    def cancel(self, message_id: int) -> PlaceholderEvent | None:
+        entry = self._pending.pop(message_id, None)
+        return entry[1] if entry is not None else None
+
+    def pending_for(self, author_id: int) -> list[PlaceholderEvent]:
+        return [event for _, event in self._pending.values() if event.author_id == author_id]
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="placeholder-reminders")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        self._task = None
+
+    def _notify(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _peek(self) -> tuple[datetime, int, int] | None:
+        while self._heap:
+            due_at, sequence, message_id = self._heap[0]
+            entry = self._pending.get(message_id)
+            if entry is not None and entry[0] == sequence:
+                return due_at, sequence, message_id
+            heapq.heappop(self._heap)
+        return None
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        while True:
+            self._wake.clear()
+            head = self._peek()
+            if head is None:
+                await self._wake.wait()
+                continue
+
+            due_at, _, message_id = head
+            delay = (due_at - self.clock()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            _, event = self._pending.pop(message_id)
+            self.registry.observe("placeholders.fire_lateness", -delay)
+            try:
+                await self.fire(event)
+            except Exception:
+                log.exception(f"[Placeholder] Reminder for message {message_id} failed.")
@@ -17,6 +17,11 @@ class QueueRuntimeConfig:
     dm_queue_assignment_channel_id: int
     strike_queue_channel_id: int
     strike_queue_assignment_channel_id: int
+    board_refresh_delay: float = constants.BOARD_REFRESH_DELAY
+    board_refresh_max_latency: float = constants.BOARD_REFRESH_MAX_LATENCY
+    signup_batch_window: float = constants.SIGNUP_BATCH_WINDOW
+    analytics_max_batch: int = constants.ANALYTICS_MAX_BATCH
+    analytics_flush_interval: float = constants.ANALYTICS_FLUSH_INTERVAL
 
     @classmethod
     def from_environment(cls, environment: str) -> "QueueRuntimeConfig":
@@ -42,6 +47,11 @@ def from_environment(cls, environment: str) -> "QueueRuntimeConfig":
                 if is_testing
                 else constants.STRIKE_QUEUE_ASSIGNMENT_CHANNEL
             ),
+            board_refresh_delay=constants.BOARD_REFRESH_DELAY,
+            board_refresh_max_latency=constants.BOARD_REFRESH_MAX_LATENCY,
+            signup_batch_window=constants.SIGNUP_BATCH_WINDOW,
+            analytics_max_batch=constants.ANALYTICS_MAX_BATCH,
+            analytics_flush_interval=constants.ANALYTICS_FLUSH_INTERVAL,
         )
 
     @property
@@ -57,8 +57,10 @@ class QueueDocument(TypedDict):
 
 
 class StoredQueueDocument(TypedDict, total=False):
+    _id: Any
     groups: list[GroupDocument]
     server_id: int
     guild_id: int
     channel_id: int | None
     locked: bool
+    version: int
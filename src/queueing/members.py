@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+import disnake as discord
+
+from common.constants import MEMBER_CACHE_SIZE, MEMBER_CACHE_TTL, MEMBER_FETCH_CONCURRENCY
+from common.metrics import MetricsRegistry, metrics
+from queueing.models import Player
+
+
+def resolve_members(guild: discord.Guild, member_ids: Iterable[int]) -> dict[int, discord.Member]:
+    """
+    Looks up the members behind a set of queued players in one pass over the guild cache.
+
+    Queue models only carry member ids; this is called when something is about to be rendered. Members that
+    are no longer cached are left out, so callers fall back to the bare id.
+    """
+    members: dict[int, discord.Member] = {}
+    missing = 0
+    for member_id in dict.fromkeys(member_ids):
+        member = guild.get_member(member_id)
+        if member is None:
+            missing += 1
+            continue
+        members[member_id] = member
+
+    metrics.increment("members.resolved", len(members))
+    if missing:
+        metrics.increment("members.missing", missing)
+    return members
+
+
+def sort_by_display_name(players: Iterable[Player], members: dict[int, discord.Member]) -> list[Player]:
+    def key(player: Player) -> str:
+        member = members.get(player.member_id)
+        return member.display_name if member is not None else str(player.member_id)
+
+    return sorted(players, key=key)
+
+
+class MemberLookup(NamedTuple):
+    members: dict[int, discord.Member]
+    # ids Discord answered 404 for, as opposed to fetches that failed and may work next time
+    departed: set[int]
+
+
+class MemberResolver:
+    """
+    ``resolve_members`` for paths an interaction is waiting on, falling back to REST for uncached members.
+
+    Members missing from the guild cache are fetched at most ``concurrency`` at a time, so a group resolves
+    in about one round trip. Lookups of a member whose fetch is already running share it, and fetched
+    members are kept for ``ttl`` seconds in an LRU of ``max_size`` entries. Members that cannot be fetched
+    are left out, as with ``resolve_members``; ``lookup`` also says which of them have left the guild.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = MEMBER_FETCH_CONCURRENCY,
+        max_size: int = MEMBER_CACHE_SIZE,
+        ttl: float = MEMBER_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+        registry: MetricsRegistry = metrics,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.registry = registry
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._cache: OrderedDict[tuple[int, int], tuple[float, discord.Member]] = OrderedDict()
+        self._in_flight: dict[tuple[int, int], asyncio.Future[discord.Member | None]] = {}
+
+    async def resolve(self, guild: discord.Guild, member_ids: Iterable[int]) -> dict[int, discord.Member]:
+        return (await self.lookup(guild, member_ids)).members
+
+    async def lookup(self, guild: discord.Guild, member_ids: Iterable[int]) -> MemberLookup:
+        member_ids = list(dict.fromkeys(member_ids))
+        members = resolve_members(guild, member_ids)
+        missing = [member_id for member_id in member_ids if member_id not in members]
+        departed: set[int] = set()
+        if not missing:
+            return MemberLookup(members, departed)
+
+        async def fetch(member_id: int) -> discord.Member | None:
+            try:
+                return await self._get(guild, member_id)
+            except discord.NotFound:
+                departed.add(member_id)
+                return None
+
+        fetched = await asyncio.gather(*(fetch(member_id) for member_id in missing))
+        for member_id, member in zip(missing, fetched, strict=True):
+            if member is not None:
+                members[member_id] = member
+        # keep the caller's order, which the fetched members were appended out of
+        return MemberLookup(
+            {member_id: members[member_id] for member_id in member_ids if member_id in members}, departed
+        )
+
+    async def _get(self, guild: discord.Guild, member_id: int) -> discord.Member | None:
+        """Raises ``NotFound`` for a member that has left the guild; other failed fetches give ``None``."""
+        key = (guild.id, member_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            expires_at, member = cached
+            if expires_at > self.clock():
+                self._cache.move_to_end(key)
+                self.registry.increment("members.cache_hit")
+                return member
+            del self._cache[key]
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._in_flight[key] = asyncio.ensure_future(self._fetch(guild, member_id))
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.registry.increment("members.fetch_shared")
+        # one caller giving up must not cancel the fetch for the others
+        return await asyncio.shield(future)
+
+    async def _fetch(self, guild: discord.Guild, member_id: int) -> discord.Member | None:
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                member = await guild.fetch_member(member_id)
+            except discord.NotFound:
+                self.registry.increment("members.fetch_departed")
+                raise
+            except discord.Forbidden, discord.HTTPException:
+                self.registry.increment("members.fetch_failed")
+                return None
+            finally:
+                self.registry.observe("members.fetch", time.perf_counter() - started)
+
+        self._cache[(guild.id, member_id)] = (self.clock() + self.ttl, member)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return member
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
-
-import disnake as discord
+from typing import TYPE_CHECKING
 
 from common.constants import GROUP_SIZE, ROLE_MARKERS, TIERS
 from queueing.documents import (
@@ -13,84 +13,97 @@
     QueueDocument,
 )
 
+if TYPE_CHECKING:
+    import disnake as discord
+
+# (class, subclass, level); class/subclass are None when the stored document omitted them
+ClassLevel = tuple[str | None, str | None, int]
+
+_interned_class_levels: dict[tuple[ClassLevel, ...], tuple[ClassLevel, ...]] = {}
+
 
 def parse_tier_from_total(total_level: int) -> int:
     return ([1] + [TIERS[tier] for tier in TIERS if total_level >= tier])[-1]
 
 
+def intern_class_levels(levels: Iterable[ClassLevelDocument]) -> tuple[ClassLevel, ...]:
+    """Returns a shared tuple for ``levels``, so every player with the same build points at one object."""
+    key = tuple((level.get("class"), level.get("subclass"), level["level"]) for level in levels)
+    return _interned_class_levels.setdefault(key, key)
+
+
 class QueueException(Exception):
     pass
 
 
 @dataclass(slots=True)
 class Player:
-    member: discord.Member
-    _total_level: int
-    _levels: list[ClassLevelDocument]
+    member_id: int
+    total_level: int
+    class_levels: tuple[ClassLevel, ...]
     tier: int = field(init=False)
 
     def __post_init__(self) -> None:
-        self.tier = parse_tier_from_total(self._total_level)
+        self.tier = parse_tier_from_total(self.total_level)
 
     @classmethod
     def new(
         cls,
-        member: discord.Member,
+        member_id: int,
         classes: ParsedPlayerClassDocument,
     ) -> Player:
         if "total_level" not in classes:
             raise QueueException("No total level found.")
         return cls(
-            member=member,
-            _total_level=classes["total_level"],
-            _levels=classes.get("classes", []),
+            member_id=member_id,
+            total_level=classes["total_level"],
+            class_levels=intern_class_levels(classes.get("classes", [])),
         )
 
     @classmethod
-    def from_dict(cls, guild: discord.Guild, data: PlayerDocument) -> Player | None:
-        member = guild.get_member(data["member_id"])
-        if member is None:
-            return None
+    def from_dict(cls, data: PlayerDocument) -> Player:
         return cls(
-            member=member,
-            _total_level=data["total_level"],
-            _levels=data.get("classes", []),
+            member_id=data["member_id"],
+            total_level=data["total_level"],
+            class_levels=intern_class_levels(data.get("classes", [])),
         )
 
     def to_dict(self) -> PlayerDocument:
         return {
             "total_level": self.total_level,
             "classes": self.levels,
-            "member_id": self.member.id,
+            "member_id": self.member_id,
         }
 
-    @property
-    def total_level(self) -> int:
-        return self._total_level
-
     @property
     def levels(self) -> list[ClassLevelDocument]:
-        return self._levels
+        out: list[ClassLevelDocument] = []
+        for class_name, subclass, level in self.class_levels:
+            doc: ClassLevelDocument = {"level": level}  # pyright: ignore[reportAssignmentType]
+            if class_name is not None:
+                doc["class"] = class_name
+            if subclass is not None:
+                doc["subclass"] = subclass
+            out.append(doc)
+        return out
 
     @property
     def mention(self) -> str:
-        return f"<@{self.member.id}>"
+        return f"<@{self.member_id}>"
 
     @property
     def level_str(self) -> str:
         out: list[str] = []
-        for level in self.levels:
-            subclass = level.get("subclass")
-            class_name = level.get("class")
+        for class_name, subclass, level in self.class_levels:
             out_str = ""
             out_str += f"{subclass} " if subclass is not None else ""
             out_str += f"{class_name} " if class_name is not None else "*None*"
-            out_str += str(level["level"])
+            out_str += str(level)
             out.append(out_str)
         return " / ".join(out)
 
     def __repr__(self) -> str:
-        return f"<Player member={self.member!r}, levels={self.levels!r}, tier={self.tier!r}>"
+        return f"<Player member_id={self.member_id!r}, levels={self.class_levels!r}, tier={self.tier!r}>"
 
 
 @dataclass(slots=True)
@@ -120,12 +133,8 @@ def new(
         return cls(players=players or [], tier=tier, position=position)
 
     @classmethod
-    def from_dict(cls, guild: discord.Guild, data: GroupDocument) -> Group:
-        players: list[Player] = []
-        for item in data.get("players", []):
-            player = Player.from_dict(guild, item)
-            if player is not None:
-                players.append(player)
+    def from_dict(cls, data: GroupDocument) -> Group:
+        players = [Player.from_dict(item) for item in data.get("players", [])]
         tier = data.get("tier")
         if tier is None:
             tier = players[0].tier if players else 1
@@ -137,17 +146,18 @@ def from_dict(cls, guild: discord.Guild, data: GroupDocument) -> Group:
             assigned=data.get("assigned"),
         )
 
-    @property
-    def player_levels_str(self) -> str:
+    def player_levels_str(self, members: Mapping[int, discord.Member]) -> str:
         out = ["```diff"]
         for player in self.players:
+            member = members.get(player.member_id)
+            if member is None:
+                out.append(f"- Unknown member ({player.member_id}): {player.level_str}")
+                continue
             markers = ", ".join(
-                mark
-                for role_id, mark in ROLE_MARKERS.items()
-                if any(role.id == role_id for role in player.member.roles)
+                mark for role_id, mark in ROLE_MARKERS.items() if any(role.id == role_id for role in member.roles)
             )
             suffix = f" [{markers}]" if markers else ""
-            out.append(f"- {player.member.display_name}: {player.level_str}{suffix}")
+            out.append(f"- {member.display_name}: {player.level_str}{suffix}")
         out.append("```")
         return "\n".join(out)
 
@@ -162,14 +172,29 @@ def __repr__(self) -> str:
 
 @dataclass(slots=True)
 class Queue:
+    """
+    The groups waiting for a gate, plus two lookup indexes over them.
+
+    ``member_id -> (group index, player index)`` answers ``in_queue`` and ``tier -> group indexes`` answers
+    ``can_fit_in_group`` without scanning the whole queue. The mutation methods below keep both indexes up
+    to date; code that edits ``groups`` directly is picked up when the list is replaced or its length
+    changes, and anything else can call ``reindex``.
+    """
+
     groups: list[Group]
     server_id: int
     channel_id: int | None
     locked: bool = False
+    _member_index: dict[int, tuple[int, int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _tier_index: dict[int, list[int]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _tier_full_prefix: dict[int, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed_groups: list[Group] | None = field(default=None, init=False, repr=False, compare=False)
+    _indexed_group_count: int = field(default=0, init=False, repr=False, compare=False)
+    _has_duplicates: bool = field(default=False, init=False, repr=False, compare=False)
 
     @classmethod
-    def from_dict(cls, guild: discord.Guild, data: QueueDocument) -> Queue:
-        groups = [Group.from_dict(guild, item) for item in data["groups"]]
+    def from_dict(cls, data: QueueDocument) -> Queue:
+        groups = [Group.from_dict(item) for item in data["groups"]]
         return cls(
             groups=groups,
             server_id=data["server_id"],
@@ -185,19 +210,69 @@ def to_dict(self) -> QueueDocument:
             "locked": self.locked,
         }
 
-    def in_queue(self, member_id: int) -> tuple[int, int] | None:
+    def reindex(self) -> None:
+        member_index: dict[int, tuple[int, int]] = {}
+        tier_index: dict[int, list[int]] = {}
+        has_duplicates = False
         for group_index, group in enumerate(self.groups):
+            tier_index.setdefault(group.tier, []).append(group_index)
             for player_index, player in enumerate(group.players):
-                if player.member.id == member_id:
-                    return (group_index, player_index)
-        return None
+                if player.member_id in member_index:
+                    has_duplicates = True
+                    continue
+                member_index[player.member_id] = (group_index, player_index)
+
+        self._member_index = member_index
+        self._tier_index = tier_index
+        self._tier_full_prefix = {}
+        self._has_duplicates = has_duplicates
+        self._indexed_groups = self.groups
+        self._indexed_group_count = len(self.groups)
+
+    def _ensure_index(self) -> None:
+        if self._indexed_groups is not self.groups or self._indexed_group_count != len(self.groups):
+            self.reindex()
+
+    def _invalidate_index(self) -> None:
+        self._indexed_groups = None
+
+    def in_queue(self, member_id: int) -> tuple[int, int] | None:
+        self._ensure_index()
+        location = self._member_index.get(member_id)
+        if location is None:
+            return None
+
+        group_index, player_index = location
+        players = self.groups[group_index].players
+        if player_index < len(players) and players[player_index].member_id == member_id:
+            return location
+
+        # a player list was edited behind the index's back; rebuild once and trust the result
+        self.reindex()
+        return self._member_index.get(member_id)
+
+    @property
+    def member_ids(self) -> list[int]:
+        self._ensure_index()
+        return list(self._member_index)
 
     def can_fit_in_group(
         self,
         player: Player,
         group_size: int = GROUP_SIZE,
     ) -> int | None:
-        for index, group in enumerate(self.groups):
+        self._ensure_index()
+        indexes = self._tier_index.get(player.tier, ())
+        start = 0
+        if group_size <= GROUP_SIZE:
+            # groups fill front to back, so remember the run of full groups at the front of each tier
+            start = self._tier_full_prefix.get(player.tier, 0)
+            while start < len(indexes) and len(self.groups[indexes[start]].players) >= GROUP_SIZE:
+                start += 1
+            self._tier_full_prefix[player.tier] = start
+
+        for index in indexes[start:]:
+            group = self.groups[index]
             if group.tier != player.tier:
                 continue
             if len(group.players) >= group_size or group.locked:
@@ -205,6 +280,57 @@ def can_fit_in_group(
             return index
         return None
 
+    def append_player(self, group_index: int, player: Player) -> None:
+        self._ensure_index()
+        players = self.groups[group_index].players
+        players.append(player)
+        if player.member_id in self._member_index:
+            self._has_duplicates = True
+        else:
+            self._member_index[player.member_id] = (group_index, len(players) - 1)
+
+    def pop_player(self, group_index: int, player_index: int) -> Player:
+        self._ensure_index()
+        players = self.groups[group_index].players
+        player = players.pop(player_index)
+        if self._has_duplicates:
+            self._invalidate_index()
+            return player
+
+        del self._member_index[player.member_id]
+        self._tier_full_prefix.pop(self.groups[group_index].tier, None)
+        for index in range(player_index, len(players)):
+            self._member_index[players[index].member_id] = (group_index, index)
+        return player
+
+    def add_player(self, player: Player, group_size: int = GROUP_SIZE, group_type: type[Group] = Group) -> int:
+        """Adds ``player`` to the first open group of their tier, or a new group kept in tier order."""
+        if (index := self.can_fit_in_group(player, group_size)) is not None:
+            self.append_player(index, player)
+            return index
+
+        later_tiers = [indexes[0] for tier, indexes in self._tier_index.items() if tier > player.tier and indexes]
+        index = min(later_tiers, default=len(self.groups))
+        self.insert_group(index, group_type.new(player.tier, [player]))
+        return index
+
+    def insert_group(self, index: int, group: Group) -> None:
+        self.groups.insert(index, group)
+        self._invalidate_index()
+
+    def pop_group(self, index: int) -> Group:
+        group = self.groups.pop(index)
+        self._invalidate_index()
+        return group
+
+    def index_of(self, group: Group) -> int | None:
+        """Position of this exact group object; equal groups elsewhere in the queue do not count."""
+        return next((index for index, item in enumerate(self.groups) if item is group), None)
+
+    def merge_groups(self, into: int, other: int) -> None:
+        self.groups[into].players.extend(self.groups[other].players)
+        self.pop_group(other)
+
     @property
     def player_count(self) -> int:
         return sum(len(group.players) for group in self.groups)
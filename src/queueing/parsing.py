@@ -28,12 +28,12 @@ def length_check(group_length: int, requested_length: int) -> str | None:
     return out
 
 
-async def check_level_role(player: Player) -> discord.Message | None:
+async def check_level_role(member: discord.Member, player: Player) -> discord.Message | None:
     level = player.total_level
     level_role = f"Level {level}"
     has_level_role = discord.utils.find(
         lambda role: role.name == level_role,
-        player.member.roles,
+        member.roles,
     )
 
     if has_level_role:
@@ -41,14 +41,14 @@ async def check_level_role(player: Player) -> discord.Message | None:
 
     wrong_role = discord.utils.find(
         lambda role: role.name.lower().startswith("level"),
-        player.member.roles,
+        member.roles,
     )
     if wrong_role is None:
-        return await player.member.send(
+        return await member.send(
             "Hi! You currently do not have a level role. Grab one from near the top of <#874436255088275496>!"
         )
 
-    return await player.member.send(
+    return await member.send(
         f"Hi! You currently have the role for {wrong_role.name}, but you put your level"
         f" as Level {player.total_level} into the signup."
         f"\nPlease either grab the correct role "
@@ -1,15 +1,31 @@
-from .analytics import AnalyticsRepository
+from .activity import ActivityRecord, ActivityRepository
+from .analytics import AnalyticsRepository, PlayerMark, PlayerSignupRecord
+from .analytics_sink import AnalyticsSink
 from .gates import GateRepository
 from .meta import QueueMetaRepository
-from .queue import QueueRepository, QueueType, build_empty_queue_document, load_queue_for_guild
+from .queue import (
+    QueueRepository,
+    QueueType,
+    QueueVersionConflict,
+    build_empty_queue_document,
+    load_queue_for_guild,
+)
+from .queue_state import QueueStateStore
 from .ready_queue import DMQueueRepository, ReadyQueueEntry, ReadyQueueRepository, StrikeQueueRepository
 
 __all__ = [
+    "ActivityRecord",
+    "ActivityRepository",
     "AnalyticsRepository",
+    "AnalyticsSink",
     "GateRepository",
+    "PlayerMark",
+    "PlayerSignupRecord",
     "QueueMetaRepository",
     "QueueRepository",
+    "QueueStateStore",
     "QueueType",
+    "QueueVersionConflict",
     "build_empty_queue_document",
     "load_queue_for_guild",
     "ReadyQueueEntry",
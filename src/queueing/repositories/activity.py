@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, ClassVar
+
+from pymongo.asynchronous.collection import AsyncCollection
+
+from common.query_audit import QueryShape
+
+INACTIVE_SWEEP_ID = "inactive"
+
+
+@dataclass(frozen=True, slots=True)
+class ActivityRecord:
+    member_id: int
+    last_signup: datetime | None
+    inactive_at: datetime | None = None
+
+    @classmethod
+    def from_dict(cls, doc: dict[str, Any]) -> ActivityRecord:
+        return cls(member_id=int(doc["_id"]), last_signup=doc.get("last_signup"), inactive_at=doc.get("inactive_at"))
+
+
+class ActivityRepository:
+    """
+    Tracks which users have gone too long without a queue sign-up.
+
+    A sweep only reads users whose ``last_signup`` fell between the previous sweep's cutoff (the watermark,
+    kept in ``activity_sweeps``) and its own, so daily work follows the number of newly inactive users. Users
+    a sweep handled get ``inactive_at``, which the next sign-up clears (see ``AnalyticsRepository``).
+    """
+
+    QUERY_SHAPES: ClassVar[tuple[QueryShape, ...]] = (
+        QueryShape(
+            "activity.newly_inactive",
+            "active_users",
+            {"last_signup": {"$gt": 0, "$lte": 0}, "inactive_at": {"$exists": False}},
+        ),
+        QueryShape("activity.by_members", "active_users", {"_id": {"$in": [0]}}),
+        QueryShape("activity.sweep", "activity_sweeps", {"_id": INACTIVE_SWEEP_ID}),
+    )
+
+    def __init__(self, active_users: AsyncCollection, sweeps: AsyncCollection):
+        self.active_users = active_users
+        self.sweeps = sweeps
+
+    async def get_watermark(self) -> datetime | None:
+        doc = await self.sweeps.find_one({"_id": INACTIVE_SWEEP_ID}) or {}
+        return doc.get("watermark")
+
+    async def newly_inactive(self, cutoff: datetime) -> list[ActivityRecord]:
+        """Users whose last sign-up is at or before ``cutoff`` and who no earlier sweep has handled."""
+        window: dict[str, Any] = {"$lte": cutoff}
+        watermark = await self.get_watermark()
+        if watermark is not None:
+            window["$gt"] = watermark
+        docs = await self.active_users.find(
+            {"last_signup": window, "inactive_at": {"$exists": False}},
+            projection={"last_signup": True},
+        ).to_list(length=None)
+        return [ActivityRecord.from_dict(doc) for doc in docs]
+
+    async def finish_sweep(
+        self,
+        cutoff: datetime,
+        *,
+        inactive: list[int],
+        retry: list[ActivityRecord],
+        at: datetime,
+    ) -> None:
+        """
+        Marks ``inactive`` as handled and moves the watermark up to ``cutoff``, or to just before the oldest
+        ``retry`` sign-up so those users are picked up again by the next sweep.
+        """
+        if inactive:
+            await self.active_users.update_many({"_id": {"$in": inactive}}, {"$set": {"inactive_at": at}})
+
+        watermark = cutoff
+        pending = [record.last_signup for record in retry if record.last_signup is not None]
+        if pending:
+            watermark = min(pending) - timedelta(milliseconds=1)
+        await self.sweeps.update_one(
+            {"_id": INACTIVE_SWEEP_ID},
+            {"$set": {"watermark": watermark, "last_run": at}},
+            upsert=True,
+        )
+
+    async def get_many(self, member_ids: list[int]) -> dict[int, ActivityRecord]:
+        docs = await self.active_users.find(
+            {"_id": {"$in": member_ids}},
+            projection={"last_signup": True, "inactive_at": True},
+        ).to_list(length=None)
+        return {record.member_id: record for record in map(ActivityRecord.from_dict, docs)}
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, ClassVar
 
 import disnake as discord
+from pymongo import InsertOne, UpdateMany, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.database import AsyncDatabase
 
+from common.indexes import IndexSpec
+from common.query_audit import QueryShape
 from queueing.documents import ClassLevelDocument, DMAnalyticsDocument, GateDocument, GroupDocument
+from queueing.repositories.analytics_sink import AnalyticsSink, DeferredWrite
+
+# a sign-up makes the user active again, so a later inactivity sweep handles them afresh
+SIGNUP_ACTIVITY_UPDATE: dict[str, Any] = {"$currentDate": {"last_signup": True}, "$unset": {"inactive_at": ""}}
 
 
 def _format_class_level(class_level: Any) -> str | None:
@@ -31,8 +41,126 @@ def _format_class_level(class_level: Any) -> str | None:
     return " ".join(parts)
 
 
+@dataclass(slots=True)
+class PlayerSignupRecord:
+    member: discord.Member
+    total_level: int
+    levels: list[ClassLevelDocument]
+    signup_text: str | None = None
+
+
+def _class_levels_text(classes: Any) -> str | None:
+    if not isinstance(classes, list):
+        return None
+
+    class_lines = [_format_class_level(class_level) for class_level in classes]
+    class_lines = [line for line in class_lines if line]
+    if not class_lines:
+        return None
+    return " / ".join(class_lines)
+
+
+def _last_signup_text(data: dict[str, Any]) -> str | None:
+    last = data.get("last")
+    if isinstance(last, dict):
+        signup_text = last.get("signup_text")
+        classes = last.get("classes")
+    else:
+        signup_text = data.get("last.signup_text")
+        classes = data.get("last.classes")
+
+    if isinstance(signup_text, str) and signup_text.strip():
+        return signup_text
+    return _class_levels_text(classes)
+
+
+def _record_signup_text(record: PlayerSignupRecord) -> str | None:
+    if record.signup_text is not None and record.signup_text.strip():
+        return record.signup_text
+    return _class_levels_text(record.levels)
+
+
+def _player_signup_update(record: PlayerSignupRecord) -> dict[str, Any]:
+    set_data: dict[str, Any] = {
+        "user_id": record.member.id,
+        "last.level": record.total_level,
+        "last.classes": record.levels,
+        "last.name": record.member.display_name,
+        "joined_at": record.member.joined_at,
+    }
+    if record.signup_text is not None:
+        set_data["last.signup_text"] = record.signup_text
+
+    return {
+        "$set": set_data,
+        "$currentDate": {"last_gate_signup": True},
+        "$inc": {"gate_signup_count": 1},
+    }
+
+
+def _gate_summon_update(member_id: int, gate_name: str, total_level: int) -> dict[str, Any]:
+    return {
+        "$set": {"user_id": member_id, "last_gate_name": gate_name},
+        "$currentDate": {"last_gate_summoned": True},
+        "$inc": {
+            f"gates_summoned_per_level.{total_level}": 1,
+            "gate_summon_count": 1,
+        },
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerMark:
+    marked: bool = False
+    custom: str = ""
+
+    @property
+    def suffix(self) -> str:
+        return f"{'*' if self.marked else ''}{self.custom}"
+
+
 class AnalyticsRepository:
-    def __init__(self, mdb: AsyncDatabase):
+    """
+    Analytics bookkeeping for the queues.
+
+    With a ``sink`` every write is queued and flushed in the background, so the write methods return
+    without a round trip; without one they write straight through.
+
+    Player marks are cached in memory: ``get_marks`` loads the members it has not seen in one query and the
+    mark writers update the cache as they queue their writes. ``custom`` tags are only ever set by hand in
+    the database, so they are read once per member.
+
+    Each player's last sign-up text, which prefills the Join modal, is cached the same way: warmed at startup
+    for recently active players and replaced on every sign-up.
+    """
+
+    INDEXES: ClassVar[tuple[IndexSpec, ...]] = (
+        IndexSpec.on("queue_analytics", "user_id"),
+        IndexSpec.on("active_users", "last_signup"),
+        IndexSpec.on("dm_assign_analytics", "claimed", ("summonDate", -1)),
+        IndexSpec.on("reinforcement_analytics", "dm_id", "gate_info.claimed_date"),
+        IndexSpec.on("reinforcement_analytics", "gate_info.claimed_date"),
+        IndexSpec.on("player_marked", "_mark", sparse=True),
+    )
+    QUERY_SHAPES: ClassVar[tuple[QueryShape, ...]] = (
+        QueryShape("analytics.player_by_user", "queue_analytics", {"user_id": 0}),
+        QueryShape("analytics.players_by_users", "queue_analytics", {"user_id": {"$in": [0]}}),
+        QueryShape("analytics.recently_active", "active_users", {"last_signup": {"$gte": 0}}),
+        QueryShape("analytics.marked_timestamp", "player_marked", {"_mark": True}),
+        QueryShape("analytics.marked_members", "player_marked", {"_id": {"$in": [0]}}),
+        QueryShape(
+            "analytics.latest_unclaimed_assignment",
+            "dm_assign_analytics",
+            {"claimed": False},
+            sort=(("summonDate", -1),),
+            limit=1,
+        ),
+        QueryShape("analytics.dm_info", "dm_analytics", {"_id": 0}),
+        QueryShape("analytics.dm_last_claims", "dm_analytics", {"_id": {"$in": [0]}}),
+    )
+
+    def __init__(self, mdb: AsyncDatabase, *, sink: AnalyticsSink | None = None):
+        self.sink = sink
         self.player_queue_analytics = mdb["queue_analytics"]
         self.gate_group_analytics = mdb["gate_groups_analytics"]
         self.dm_analytics = mdb["dm_analytics"]
@@ -40,6 +168,40 @@ def __init__(self, mdb: AsyncDatabase):
         self.reinforcement_analytics = mdb["reinforcement_analytics"]
         self.player_marked = mdb["player_marked"]
         self.active_users = mdb["active_users"]
+        self._marked: dict[int, bool] = {}
+        self._custom: dict[int, str] = {}
+        self._signup_texts: dict[int, str | None] = {}
+
+    async def _update_one(
+        self,
+        collection: AsyncCollection,
+        query: dict[str, Any],
+        update: dict[str, Any],
+        *,
+        upsert: bool = False,
+    ) -> None:
+        if self.sink is not None:
+            self.sink.enqueue(collection, UpdateOne(query, update, upsert=upsert))
+            return
+        await collection.update_one(query, update, upsert=upsert)
+
+    async def _update_many(self, collection: AsyncCollection, query: dict[str, Any], update: dict[str, Any]) -> None:
+        if self.sink is not None:
+            self.sink.enqueue(collection, UpdateMany(query, update))
+            return
+        await collection.update_many(query, update)
+
+    async def _insert_one(self, collection: AsyncCollection, document: dict[str, Any]) -> None:
+        if self.sink is not None:
+            self.sink.enqueue(collection, InsertOne(document))
+            return
+        await collection.insert_one(document)
+
+    async def _run_or_defer(self, job: DeferredWrite) -> None:
+        if self.sink is not None:
+            self.sink.defer(job)
+            return
+        await job()
 
     async def record_player_signup(
         self,
@@ -49,59 +211,72 @@ async def record_player_signup(
         levels: list[ClassLevelDocument],
         signup_text: str | None = None,
     ) -> None:
-        set_data: dict[str, Any] = {
-            "user_id": member.id,
-            "last.level": total_level,
-            "last.classes": levels,
-            "last.name": member.display_name,
-            "joined_at": member.joined_at,
-        }
-        if signup_text is not None:
-            set_data["last.signup_text"] = signup_text
-
-        data = {
-            "$set": set_data,
-            "$currentDate": {"last_gate_signup": True},
-            "$inc": {"gate_signup_count": 1},
-        }
-        await self.player_queue_analytics.update_one(
+        record = PlayerSignupRecord(member=member, total_level=total_level, levels=levels, signup_text=signup_text)
+        self._signup_texts[member.id] = _record_signup_text(record)
+        await self._update_one(
+            self.player_queue_analytics,
             {"user_id": member.id},
-            data,
+            _player_signup_update(record),
             upsert=True,
         )
-        await self.active_users.update_one(
+        await self._update_one(
+            self.active_users,
             {"_id": member.id},
-            {"$currentDate": {"last_signup": True}},
+            SIGNUP_ACTIVITY_UPDATE,
             upsert=True,
         )
 
-    async def get_last_player_signup_text(self, member_id: int) -> str | None:
-        data = await self.player_queue_analytics.find_one({"user_id": member_id})
-        if data is None:
-            return None
-
-        last = data.get("last")
-        if isinstance(last, dict):
-            signup_text = last.get("signup_text")
-            if isinstance(signup_text, str) and signup_text.strip():
-                return signup_text
-
-            classes = last.get("classes")
-        else:
-            signup_text = data.get("last.signup_text")
-            if isinstance(signup_text, str) and signup_text.strip():
-                return signup_text
+    async def record_player_signups(self, records: list[PlayerSignupRecord]) -> None:
+        if not records:
+            return
+        if self.sink is not None:
+            for record in records:
+                # record_player_signup caches the text itself
+                await self.record_player_signup(
+                    member=record.member,
+                    total_level=record.total_level,
+                    levels=record.levels,
+                    signup_text=record.signup_text,
+                )
+            return
 
-            classes = data.get("last.classes")
+        for record in records:
+            self._signup_texts[record.member.id] = _record_signup_text(record)
+        await self.player_queue_analytics.bulk_write(
+            [
+                UpdateOne({"user_id": record.member.id}, _player_signup_update(record), upsert=True)
+                for record in records
+            ],
+            ordered=False,
+        )
+        await self.active_users.bulk_write(
+            [UpdateOne({"_id": record.member.id}, SIGNUP_ACTIVITY_UPDATE, upsert=True) for record in records],
+            ordered=False,
+        )
 
-        if not isinstance(classes, list):
-            return None
+    async def get_last_player_signup_text(self, member_id: int) -> str | None:
+        if member_id in self._signup_texts:
+            return self._signup_texts[member_id]
+        data = await self.player_queue_analytics.find_one({"user_id": member_id})
+        # a sign-up recorded while we waited is newer than what the database returned
+        return self._signup_texts.setdefault(member_id, _last_signup_text(data) if data is not None else None)
+
+    async def warm_signup_texts(self, *, active_since: datetime) -> int:
+        """Caches the last sign-up text of everyone who signed up since ``active_since``, in two queries."""
+        active = await self.active_users.find(
+            {"last_signup": {"$gte": active_since}},
+            projection={"_id": True},
+        ).to_list(length=None)
+        member_ids = [doc["_id"] for doc in active]
+        if not member_ids:
+            return 0
 
-        class_lines = [_format_class_level(class_level) for class_level in classes]
-        class_lines = [line for line in class_lines if line]
-        if not class_lines:
-            return None
-        return " / ".join(class_lines)
+        docs = await self.player_queue_analytics.find({"user_id": {"$in": member_ids}}).to_list(length=None)
+        found = {doc["user_id"]: doc for doc in docs}
+        for member_id in member_ids:
+            data = found.get(member_id)
+            self._signup_texts.setdefault(member_id, _last_signup_text(data) if data is not None else None)
+        return len(member_ids)
 
     async def get_player_signup_times(self, member_ids: list[int]) -> dict[int, datetime]:
         if not member_ids:
@@ -117,35 +292,79 @@ async def get_player_signup_times(self, member_ids: list[int]) -> dict[int, date
         return signup_times
 
     async def decrement_player_signup(self, member_id: int) -> None:
-        await self.player_queue_analytics.update_one(
+        await self._update_one(
+            self.player_queue_analytics,
             {"user_id": member_id},
             {"$set": {"user_id": member_id}, "$inc": {"gate_signup_count": -1}},
             upsert=True,
         )
 
+    async def get_marks(self, member_ids: Iterable[int]) -> dict[int, PlayerMark]:
+        member_ids = list(member_ids)
+        missing = [member_id for member_id in set(member_ids) if member_id not in self._custom]
+        if missing:
+            docs = await self.player_marked.find(
+                {"_id": {"$in": missing}},
+                projection={"marked": True, "custom": True},
+            ).to_list(length=None)
+            found = {doc["_id"]: doc for doc in docs}
+            for member_id in missing:
+                doc = found.get(member_id, {})
+                # a mark written since is newer than what the database returned
+                self._marked.setdefault(member_id, bool(doc.get("marked", False)))
+                self._custom[member_id] = str(doc.get("custom", ""))
+        return {
+            member_id: PlayerMark(marked=self._marked[member_id], custom=self._custom[member_id])
+            for member_id in member_ids
+        }
+
     async def set_marked(self, member_id: int, *, marked: bool) -> None:
-        await self.player_marked.update_one(
+        self._marked[member_id] = marked
+        await self._update_one(
+            self.player_marked,
             {"_id": member_id},
             {"$set": {"_id": member_id, "marked": marked}},
             upsert=True,
         )
 
+    async def set_marked_many(self, member_ids: list[int], *, marked: bool) -> None:
+        if not member_ids:
+            return
+        for member_id in member_ids:
+            self._marked[member_id] = marked
+        requests = [
+            UpdateOne({"_id": member_id}, {"$set": {"_id": member_id, "marked": marked}}, upsert=True)
+            for member_id in member_ids
+        ]
+        if self.sink is not None:
+            for request in requests:
+                self.sink.enqueue(self.player_marked, request)
+            return
+        await self.player_marked.bulk_write(requests, ordered=False)
+
     async def clear_marks_for_members(self, member_ids: list[int]) -> None:
         if not member_ids:
             return
-        await self.player_marked.update_many(
+        for member_id in member_ids:
+            self._marked[member_id] = False
+        await self._update_many(
+            self.player_marked,
             {"_id": {"$in": member_ids}},
             {"$set": {"marked": False}},
         )
 
     async def set_unlock_timestamp(self) -> None:
-        await self.player_marked.update_one(
+        await self._update_one(
+            self.player_marked,
             {"_mark": True},
             {"$set": {"_mark": True, "timestamp": datetime.now(UTC)}},
             upsert=True,
         )
 
     async def mark_assignment_claimed(self) -> None:
+        await self._run_or_defer(self._mark_assignment_claimed)
+
+    async def _mark_assignment_claimed(self) -> None:
         assign_analytics = await self.dm_assign_analytics.find(
             sort=[("summonDate", -1)],
             limit=1,
@@ -165,7 +384,8 @@ async def record_dm_claim(
         dm_id: int,
         gate_data: GateDocument,
     ) -> None:
-        await self.dm_analytics.update_one(
+        await self._update_one(
+            self.dm_analytics,
             {"_id": dm_id},
             {
                 "$inc": {"dm_claims.claims": 1},
@@ -181,17 +401,41 @@ async def record_gate_reinforcement(
         dm_id: int,
         gate_info: GateDocument,
     ) -> None:
-        await self.reinforcement_analytics.insert_one(
+        await self._insert_one(
+            self.reinforcement_analytics,
             {
                 "type": "reinforcements",
                 "gate_info": gate_info,
                 "dm_id": dm_id,
-            }
+            },
         )
 
+    async def record_latest_gate_reinforcement(self, dm_id: int) -> None:
+        """Records a reinforcement against the DM's most recent gate, if they have one."""
+
+        async def record() -> None:
+            dm_info = await self.get_dm_info(dm_id)
+            dm_gates = dm_info.get("dm_gates") if dm_info else None
+            if dm_gates:
+                await self.record_gate_reinforcement(dm_id=dm_id, gate_info=dm_gates[-1])
+
+        await self._run_or_defer(record)
+
     async def get_dm_info(self, dm_id: int) -> DMAnalyticsDocument | None:
         return await self.dm_analytics.find_one({"_id": dm_id})
 
+    async def get_dm_last_claims(self, dm_ids: list[int]) -> dict[int, datetime]:
+        """The last claim date of each listed DM that has claimed a gate."""
+        docs = await self.dm_analytics.find(
+            {"_id": {"$in": dm_ids}},
+            projection={"dm_claims.last_claim": True},
+        ).to_list(length=None)
+        return {
+            doc["_id"]: last_claim
+            for doc in docs
+            if (last_claim := (doc.get("dm_claims") or {}).get("last_claim")) is not None
+        }
+
     async def record_claimed_group(
         self,
         *,
@@ -205,14 +449,15 @@ async def record_claimed_group(
             key = str(level)
             levels[key] = levels.get(key, 0) + 1
 
-        await self.gate_group_analytics.insert_one(
+        await self._insert_one(
+            self.gate_group_analytics,
             {
                 "gate_name": gate_name,
                 "date_summoned": datetime.now(UTC),
                 "dm_id": claimed_by,
                 "tier": tier,
                 "levels": levels,
-            }
+            },
         )
 
     async def record_player_gate_summon(
@@ -222,21 +467,37 @@ async def record_player_gate_summon(
         gate_name: str,
         total_level: int,
     ) -> None:
-        await self.player_queue_analytics.update_one(
+        await self._update_one(
+            self.player_queue_analytics,
             {"user_id": member_id},
-            {
-                "$set": {"user_id": member_id, "last_gate_name": gate_name},
-                "$currentDate": {"last_gate_summoned": True},
-                "$inc": {
-                    f"gates_summoned_per_level.{total_level}": 1,
-                    "gate_summon_count": 1,
-                },
-            },
+            _gate_summon_update(member_id, gate_name, total_level),
             upsert=True,
         )
 
+    async def record_player_gate_summons(self, *, gate_name: str, summons: list[tuple[int, int]]) -> None:
+        """Records a gate summon for each ``(member_id, total_level)`` pair in one batch."""
+        if not summons:
+            return
+        if self.sink is not None:
+            for member_id, total_level in summons:
+                await self.record_player_gate_summon(member_id=member_id, gate_name=gate_name, total_level=total_level)
+            return
+
+        await self.player_queue_analytics.bulk_write(
+            [
+                UpdateOne(
+                    {"user_id": member_id},
+                    _gate_summon_update(member_id, gate_name, total_level),
+                    upsert=True,
+                )
+                for member_id, total_level in summons
+            ],
+            ordered=False,
+        )
+
     async def record_dm_queue_signup(self, member_id: int, *, delta: int = 1) -> None:
-        await self.dm_analytics.update_one(
+        await self._update_one(
+            self.dm_analytics,
             {"_id": member_id},
             {
                 "$inc": {"dm_queue.signups": delta},
@@ -246,7 +507,8 @@ async def record_dm_queue_signup(self, member_id: int, *, delta: int = 1) -> Non
         )
 
     async def increment_dm_assignments(self, dm_id: int) -> None:
-        await self.dm_analytics.update_one(
+        await self._update_one(
+            self.dm_analytics,
             {"_id": dm_id},
             {"$inc": {"dm_queue.assignments": 1}},
             upsert=True,
@@ -259,18 +521,20 @@ async def record_dm_assignment(
         dm_id: int,
         gate_data: GroupDocument,
     ) -> None:
-        await self.dm_assign_analytics.insert_one(
+        await self._insert_one(
+            self.dm_assign_analytics,
             {
                 "summoner": summoner_id,
                 "dm": dm_id,
                 "gate_data": gate_data,
                 "claimed": False,
                 "summonDate": datetime.now(UTC),
-            }
+            },
         )
 
     async def set_last_strike_gate(self, member_id: int, gate_name: str) -> None:
-        await self.player_queue_analytics.update_one(
+        await self._update_one(
+            self.player_queue_analytics,
             {"user_id": member_id},
             {"$set": {"last_strike": gate_name}},
             upsert=True,
@@ -284,12 +548,13 @@ async def record_strike_team_reinforcement(
         gate_name: str,
         gate_info: GateDocument,
     ) -> None:
-        await self.reinforcement_analytics.insert_one(
+        await self._insert_one(
+            self.reinforcement_analytics,
             {
                 "type": "strike_team",
                 "user_ids": user_ids,
                 "dm_id": dm_id,
                 "gate_name": gate_name.lower(),
                 "gate_info": gate_info,
-            }
+            },
         )
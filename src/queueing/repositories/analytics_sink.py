@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from pymongo import InsertOne, UpdateMany, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError
+
+from common.metrics import MetricsRegistry, metrics
+
+log = logging.getLogger(__name__)
+
+WriteRequest = InsertOne | UpdateOne | UpdateMany
+DeferredWrite = Callable[[], Awaitable[None]]
+
+
+@dataclass(slots=True)
+class _PendingWrites:
+    collection: AsyncCollection
+    requests: list[WriteRequest] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _Segment:
+    """Writes queued since the previous deferred job, followed by the jobs queued after them."""
+
+    writes: dict[int, _PendingWrites] = field(default_factory=dict)
+    jobs: list[DeferredWrite] = field(default_factory=list)
+
+
+class AnalyticsSink:
+    """
+    Write-behind buffer for analytics bookkeeping.
+
+    Writes are queued per collection and sent as one ordered ``bulk_write`` per collection, either once
+    ``max_batch`` writes are pending or ``flush_interval`` seconds after the first queued write. Writes
+    that need to read before they update are queued as deferred jobs, which run after the writes queued
+    before them and before the ones queued after. Callers never wait on Mongo; ``close`` flushes whatever
+    is left on shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch: int,
+        flush_interval: float,
+        registry: MetricsRegistry = metrics,
+    ):
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.registry = registry
+        self._segments: list[_Segment] = []
+        self._depth = 0
+        self._flush_task: asyncio.Task[None] | None = None
+        self._size_flushes: set[asyncio.Task[None]] = set()
+        self._flush_lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def enqueue(self, collection: AsyncCollection, request: WriteRequest) -> None:
+        if not self._segments or self._segments[-1].jobs:
+            self._segments.append(_Segment())
+        writes = self._segments[-1].writes
+        pending = writes.get(id(collection))
+        if pending is None:
+            pending = writes[id(collection)] = _PendingWrites(collection)
+        pending.requests.append(request)
+        self._depth += 1
+        self._schedule()
+
+    def defer(self, job: DeferredWrite) -> None:
+        if not self._segments:
+            self._segments.append(_Segment())
+        self._segments[-1].jobs.append(job)
+        self._depth += 1
+        self._schedule()
+
+    async def flush(self) -> None:
+        async with self._lock():
+            # deferred jobs usually queue their own writes, so keep going until nothing is left
+            while self.depth:
+                await self._flush()
+
+    async def close(self) -> None:
+        task = self._flush_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            # a timer already flushing is shielded, so this only stops it waiting; the flush below queues behind it
+            task.cancel()
+        self._flush_task = None
+        if self._size_flushes:
+            await asyncio.gather(*self._size_flushes, return_exceptions=True)
+        await self.flush()
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._flush_lock is None or self._loop is not loop:
+            self._flush_lock = asyncio.Lock()
+            self._loop = loop
+        return self._flush_lock
+
+    def _schedule(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.registry.increment("analytics.enqueued")
+        if self.depth >= self.max_batch and not self._size_flushes:
+            # size trigger: flush now, the running timer (if any) will find nothing left to do
+            flush = loop.create_task(self.flush(), name="analytics-flush")
+            self._size_flushes.add(flush)
+            flush.add_done_callback(self._size_flushes.discard)
+            return
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._flush_later(), name="analytics-flush-timer")
+
+    async def _flush_later(self) -> None:
+        # writes queued while a flush is running are picked up by the next pass
+        while self.depth:
+            await asyncio.sleep(self.flush_interval)
+            # cancelling the timer (see close) must not drop a batch that is already on its way to Mongo
+            await asyncio.shield(self.flush())
+
+    async def _flush(self) -> None:
+        segments, self._segments = self._segments, []
+        self.registry.observe("analytics.queue_depth", self._depth)
+        self._depth = 0
+
+        started = time.perf_counter()
+        for segment in segments:
+            for item in segment.writes.values():
+                await self._write(item)
+            for job in segment.jobs:
+                try:
+                    await job()
+                except Exception:
+                    self.registry.increment("analytics.flush_failures")
+                    log.exception("[Analytics] Deferred analytics write failed.")
+
+        self.registry.observe("analytics.flush_latency", time.perf_counter() - started)
+
+    async def _write(self, item: _PendingWrites) -> None:
+        # ordered, because later writes to a key can depend on earlier ones (a mark and its clear, $push order)
+        requests = item.requests
+        while requests:
+            try:
+                await item.collection.bulk_write(requests, ordered=True)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if not errors:
+                    self.registry.increment("analytics.flush_failures")
+                    log.error(f"[Analytics] Dropped {len(requests)} writes: {e.details}")
+                    return
+                # an ordered batch stops at its first error; skip the bad write and send the rest
+                index = errors[0]["index"]
+                self.registry.increment("analytics.flush_failures")
+                self.registry.increment("analytics.written", index)
+                log.error(f"[Analytics] Dropped 1 of {len(requests)} writes: {errors[0]}")
+                requests = requests[index + 1 :]
+            except Exception:
+                self.registry.increment("analytics.flush_failures")
+                log.exception(f"[Analytics] Dropped {len(requests)} writes after a failed bulk write.")
+                return
+            else:
+                self.registry.increment("analytics.written", len(requests))
+                return
@@ -1,29 +1,109 @@
 from __future__ import annotations
 
+from typing import ClassVar
+
 from pymongo.asynchronous.collection import AsyncCollection
 
+from common.indexes import IndexSpec
+from common.metrics import MetricsRegistry, metrics
+from common.query_audit import QueryShape
 from queueing.documents import RegisteredGateDocument
 
+_GateIndexes = tuple[dict[str, RegisteredGateDocument], dict[int, RegisteredGateDocument]]
+
+
+def _index_owners(by_name: dict[str, RegisteredGateDocument]) -> dict[int, RegisteredGateDocument]:
+    # first match wins, like the find_one lookups the indexes replace
+    by_owner: dict[int, RegisteredGateDocument] = {}
+    for doc in by_name.values():
+        if doc.get("owner") is not None:
+            by_owner.setdefault(doc["owner"], doc)
+    return by_owner
+
 
 class GateRepository:
-    def __init__(self, collection: AsyncCollection):
+    """
+    The registered gates, read through an in-memory copy of the whole collection.
+
+    The gate list is small and changes rarely, so the first read loads every gate and later reads are served
+    from name and owner indexes until a write through this repository drops them. Reads return copies.
+    """
+
+    INDEXES: ClassVar[tuple[IndexSpec, ...]] = (
+        IndexSpec.on("gate_list", "name"),
+        IndexSpec.on("gate_list", "owner", sparse=True),
+    )
+    QUERY_SHAPES: ClassVar[tuple[QueryShape, ...]] = (QueryShape("gates.by_name", "gate_list", {"name": "sample"}),)
+
+    def __init__(self, collection: AsyncCollection, *, registry: MetricsRegistry = metrics):
         self.collection = collection
+        self.registry = registry
+        self._indexes: _GateIndexes | None = None
+        self._generation = 0
+
+    @property
+    def hit_ratio(self) -> float | None:
+        hits = self.registry.counters.get("gates.cache_hit", 0)
+        total = hits + self.registry.counters.get("gates.cache_miss", 0)
+        return hits / total if total else None
+
+    def invalidate(self) -> None:
+        self._indexes = None
+        self._generation += 1
+
+    async def _load(self) -> _GateIndexes:
+        if self._indexes is not None:
+            self.registry.increment("gates.cache_hit")
+            return self._indexes
+
+        self.registry.increment("gates.cache_miss")
+        generation = self._generation
+        docs: list[RegisteredGateDocument] = await self.collection.find().to_list(length=None)
+        by_name: dict[str, RegisteredGateDocument] = {}
+        for doc in docs:
+            by_name.setdefault(doc["name"], doc)
+
+        indexes = (by_name, _index_owners(by_name))
+        if generation == self._generation:
+            # a write landed while we were reading, so this copy may already be stale
+            self._indexes = indexes
+        return indexes
 
     async def list_gates(self) -> list[RegisteredGateDocument]:
-        return await self.collection.find().to_list(length=None)
+        by_name, _ = await self._load()
+        return [gate.copy() for gate in by_name.values()]
 
     async def get_by_name(self, gate_name: str) -> RegisteredGateDocument | None:
-        return await self.collection.find_one({"name": gate_name.lower()})
+        by_name, _ = await self._load()
+        gate = by_name.get(gate_name.lower())
+        return gate.copy() if gate is not None else None
 
     async def get_by_owner(self, owner_id: int) -> RegisteredGateDocument | None:
-        return await self.collection.find_one({"owner": owner_id})
+        _, by_owner = await self._load()
+        gate = by_owner.get(owner_id)
+        return gate.copy() if gate is not None else None
 
     async def set_owner(self, gate_name: str, owner_id: int) -> None:
+        by_name, _ = await self._load()
+        gate = by_name.get(gate_name.lower())
+        if gate is not None and gate.get("owner") == owner_id:
+            self.registry.increment("gates.owner_write_skipped")
+            return
+
         await self.collection.update_one(
             {"name": gate_name.lower()},
             {"$set": {"owner": owner_id}},
             upsert=False,
         )
+        cached = self._indexes
+        if gate is None or cached is None:
+            self.invalidate()
+            return
+
+        # claims set the owner all the time, so patch the cached copy instead of reloading the list
+        self._generation += 1
+        by_name = {name: doc | {"owner": owner_id} if name == gate["name"] else doc for name, doc in cached[0].items()}
+        self._indexes = (by_name, _index_owners(by_name))
 
     async def upsert_gate(self, gate_name: str, gate_emoji: str) -> None:
         await self.collection.update_one(
@@ -31,6 +111,8 @@ async def upsert_gate(self, gate_name: str, gate_emoji: str) -> None:
             {"$set": {"name": gate_name.lower(), "emoji": gate_emoji}},
             upsert=True,
         )
+        self.invalidate()
 
     async def remove_gate(self, gate_name: str) -> None:
         await self.collection.delete_one({"name": gate_name.lower()})
+        self.invalidate()
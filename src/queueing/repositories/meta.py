@@ -1,21 +1,37 @@
 from __future__ import annotations
 
+from typing import ClassVar
+
 import disnake as discord
 from pymongo.asynchronous.collection import AsyncCollection
 
 from common.discord_utils import find_or_migrate_queue_message_id
+from common.query_audit import QueryShape
 
 
 class QueueMetaRepository:
+    """
+    Ids of the messages the bot keeps in its channels, keyed like ``player_queue:<channel id>``.
+
+    Known ids are kept in memory, so only the first lookup of a key reads ``queue_meta`` and only a key with
+    no stored id falls back to scanning the channel history.
+    """
+
+    QUERY_SHAPES: ClassVar[tuple[QueryShape, ...]] = (QueryShape("queue_meta.by_key", "queue_meta", {"_id": "sample"}),)
+
     def __init__(self, collection: AsyncCollection):
         self.collection = collection
+        self._message_ids: dict[str, int] = {}
 
     async def get_message_id(self, key: str) -> int | None:
+        if key in self._message_ids:
+            return self._message_ids[key]
         meta = await self.collection.find_one({"_id": key}) or {}
         message_id = meta.get("message_id")
         if message_id is None:
             return None
-        return int(message_id)
+        message_id = self._message_ids[key] = int(message_id)
+        return message_id
 
     async def set_message_id(self, key: str, message_id: int) -> None:
         await self.collection.update_one(
@@ -23,6 +39,11 @@ async def set_message_id(self, key: str, message_id: int) -> None:
             {"$set": {"message_id": message_id}},
             upsert=True,
         )
+        self._message_ids[key] = message_id
+
+    async def clear_message_id(self, key: str) -> None:
+        self._message_ids.pop(key, None)
+        await self.collection.update_one({"_id": key}, {"$unset": {"message_id": ""}})
 
     async def resolve_message_id(
         self,
@@ -32,10 +53,15 @@ async def resolve_message_id(
         embed_title_prefix: str,
         bot_user_id: int,
     ) -> int | None:
-        return await find_or_migrate_queue_message_id(
+        if meta_key in self._message_ids:
+            return self._message_ids[meta_key]
+        message_id = await find_or_migrate_queue_message_id(
             channel=channel,
             meta_db=self.collection,
             meta_key=meta_key,
             embed_title_prefix=embed_title_prefix,
             bot_user_id=bot_user_id,
         )
+        if message_id is not None:
+            self._message_ids[meta_key] = message_id
+        return message_id
@@ -1,15 +1,109 @@
 from __future__ import annotations
 
-from typing import Any, TypeVar
+from dataclasses import dataclass
+from typing import Any, ClassVar, TypeVar
 
 import disnake as discord
+from pymongo import ReturnDocument
 from pymongo.asynchronous.collection import AsyncCollection
 
-from queueing.documents import QueueDocument, StoredQueueDocument
-from queueing.models import Queue
+from common.indexes import IndexSpec
+from common.query_audit import QueryShape
+from queueing.documents import GroupDocument, PlayerDocument, QueueDocument, StoredQueueDocument
+from queueing.models import Group, Queue
 
 QueueType = TypeVar("QueueType", bound=Queue)
 
+_QUEUE_FIELDS = ("server_id", "channel_id", "locked")
+
+
+class QueueVersionConflict(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class _QueueSnapshot:
+    """What this process last read from or wrote to Mongo for one queue object."""
+
+    queue: Queue
+    document_id: Any
+    version: int | None
+    groups: list[tuple[Group, GroupDocument]]
+    fields: dict[str, Any]
+    in_sync: bool = True
+
+
+def _snapshot_groups(queue: Queue) -> list[tuple[Group, GroupDocument]]:
+    return [(group, group.to_dict()) for group in queue.groups]
+
+
+def _player_ids(players: list[PlayerDocument]) -> list[int]:
+    return [player["member_id"] for player in players]
+
+
+def build_queue_delta(snapshot: _QueueSnapshot, queue: Queue) -> dict[str, Any] | None:
+    """
+    Returns the single update document that turns the snapshot into ``queue``, or ``None`` when groups were
+    reordered and only a full rewrite can express the change.
+
+    Mongo rejects an update that touches one path twice, so adding or dropping a group rewrites the ``groups``
+    array and a group that both lost and gained players has its roster set whole.
+    """
+    old_groups = [group for group, _ in snapshot.groups]
+    old_docs = {id(group): doc for group, doc in snapshot.groups}
+    new_ids = {id(group) for group in queue.groups}
+
+    kept_old = [group for group in old_groups if id(group) in new_ids]
+    kept_new = [group for group in queue.groups if id(group) in old_docs]
+    if [id(group) for group in kept_old] != [id(group) for group in kept_new]:
+        return None
+
+    sets: dict[str, Any] = {}
+    pulls: dict[str, Any] = {}
+    pushes: dict[str, Any] = {}
+    if len(kept_new) != len(old_groups) or len(kept_new) != len(queue.groups):
+        sets["groups"] = [group.to_dict() for group in queue.groups]
+    else:
+        for index, group in enumerate(queue.groups):
+            old_doc = old_docs[id(group)]
+            new_doc = group.to_dict()
+            for key, value in new_doc.items():
+                if key != "players" and old_doc.get(key) != value:
+                    sets[f"groups.{index}.{key}"] = value
+
+            old_players = old_doc.get("players", [])
+            new_players = new_doc.get("players", [])
+            if old_players == new_players:
+                continue
+
+            new_ids_in_group = set(_player_ids(new_players))
+            remaining = [player for player in old_players if player["member_id"] in new_ids_in_group]
+            added = new_players[len(remaining) :]
+            left = [player["member_id"] for player in old_players if player["member_id"] not in new_ids_in_group]
+            if new_players[: len(remaining)] != remaining or (left and added):
+                # reordered, edited in place or both pulled and pushed, rewrite just this group's roster
+                sets[f"groups.{index}.players"] = new_players
+                continue
+
+            if left:
+                pulls[f"groups.{index}.players"] = {"member_id": {"$in": left}}
+            if added:
+                pushes[f"groups.{index}.players"] = {"$each": added}
+
+    for key in _QUEUE_FIELDS:
+        value = getattr(queue, key)
+        if snapshot.fields.get(key) != value:
+            sets[key] = value
+
+    update: dict[str, Any] = {}
+    if sets:
+        update["$set"] = sets
+    if pulls:
+        update["$pull"] = pulls
+    if pushes:
+        update["$push"] = pushes
+    return update
+
 
 def build_empty_queue_document(guild_id: int, channel_id: int | None = None) -> QueueDocument:
     return {
@@ -21,9 +115,16 @@ def build_empty_queue_document(guild_id: int, channel_id: int | None = None) ->
 
 
 class QueueRepository:
+    # both branches of the guild ``$or`` need their own index, or the whole query falls back to a scan
+    INDEXES: ClassVar[tuple[IndexSpec, ...]] = (
+        IndexSpec.on("player_queue", "guild_id", "channel_id"),
+        IndexSpec.on("player_queue", "server_id", "channel_id"),
+    )
+
     def __init__(self, collection: AsyncCollection, *, default_channel_id: int | None = None):
         self.collection = collection
         self.default_channel_id = default_channel_id
+        self._snapshots: dict[int, _QueueSnapshot] = {}
 
     async def load_for_guild(
         self,
@@ -43,18 +144,78 @@ async def load_for_guild(
         else:
             raw_document = self._normalize_document(raw, guild.id, resolved_channel_id)
 
-        queue = queue_type.from_dict(guild, raw_document)
+        queue = queue_type.from_dict(raw_document)
         queue.groups.sort(key=lambda group: group.tier)
+
+        snapshot = self._take_snapshot(
+            queue,
+            document_id=raw.get("_id") if raw is not None else None,
+            version=raw.get("version") if raw is not None else None,
+        )
+        # missing members are dropped and groups re-sorted on load, so array positions may not match Mongo yet
+        snapshot.in_sync = (
+            raw is not None
+            and "version" in raw
+            and [doc for _, doc in snapshot.groups] == raw_document["groups"]
+            and all(snapshot.fields[key] == raw.get(key) for key in _QUEUE_FIELDS)
+        )
         return queue  # pyright: ignore[reportReturnType]
 
     async def save(self, queue: Queue) -> None:
+        """
+        Writes ``queue`` with one update guarded by the version it was read at.
+
+        Raises ``QueueVersionConflict`` if the stored document moved on in the meantime; the caller has to
+        reload and re-apply its change, the stale copy is never written over the newer one.
+        """
+        snapshot = self._snapshots.get(queue.server_id)
+        if snapshot is None or snapshot.queue is not queue or snapshot.document_id is None:
+            await self._save_full(queue)
+            return
+
+        update = build_queue_delta(snapshot, queue) if snapshot.in_sync else None
+        if update is None:
+            update = {"$set": {**queue.to_dict(), "guild_id": queue.server_id}}
+        await self._save_versioned(snapshot, update)
+
+    async def _save_versioned(self, snapshot: _QueueSnapshot, update: dict[str, Any]) -> None:
+        if not update:
+            return
+
+        # documents written before versioning have no field yet, the first guarded write adds it
+        version = snapshot.version if snapshot.version is not None else {"$exists": False}
+        result = await self.collection.update_one(
+            {"_id": snapshot.document_id, "version": version},
+            {**update, "$inc": {"version": 1}},
+        )
+        if result.matched_count != 1:
+            snapshot.in_sync = False
+            raise QueueVersionConflict(
+                f"Queue {snapshot.queue.server_id} changed underneath us (expected version {snapshot.version})."
+            )
+        self._take_snapshot(snapshot.queue, document_id=snapshot.document_id, version=(snapshot.version or 0) + 1)
+
+    async def _save_full(self, queue: Queue) -> None:
         payload: StoredQueueDocument = {**queue.to_dict(), "guild_id": queue.server_id}
-        selector = self._build_save_selector(queue.server_id, queue.channel_id)
-        await self.collection.update_one(
-            selector,
-            {"$set": payload},
+        stored = await self.collection.find_one_and_update(
+            self._build_save_selector(queue.server_id, queue.channel_id),
+            {"$set": payload, "$inc": {"version": 1}},
+            projection={"version": True},
             upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self._take_snapshot(queue, document_id=stored["_id"], version=stored["version"])
+
+    def _take_snapshot(self, queue: Queue, *, document_id: Any, version: int | None) -> _QueueSnapshot:
+        snapshot = _QueueSnapshot(
+            queue=queue,
+            document_id=document_id,
+            version=version,
+            groups=_snapshot_groups(queue),
+            fields={key: getattr(queue, key) for key in _QUEUE_FIELDS},
         )
+        self._snapshots[queue.server_id] = snapshot
+        return snapshot
 
     @staticmethod
     def _choose_preferred_document(
@@ -107,6 +268,13 @@ def _build_save_selector(server_id: int, channel_id: int | None) -> dict[str, An
             ]
         }
 
+    # built from the real selectors so the audit follows them if they change
+    QUERY_SHAPES: ClassVar[tuple[QueryShape, ...]] = (
+        QueryShape("queue.load_for_guild", "player_queue", {"$or": [{"guild_id": 0}, {"server_id": 0}]}),
+        QueryShape("queue.save_selector", "player_queue", _build_save_selector(0, 0)),
+        QueryShape("queue.delta_save", "player_queue", {"_id": 0, "version": 0}),
+    )
+
 
 async def load_queue_for_guild(
     db: AsyncCollection,
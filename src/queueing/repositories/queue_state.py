@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import disnake as discord
+
+from queueing.models import Queue
+from queueing.repositories.queue import QueueRepository, QueueType
+
+
+class QueueStateStore:
+    """
+    In-process owner of each guild's player queue.
+
+    The queue is loaded from Mongo once per guild and the same ``Queue`` instance is handed out on every
+    later load, so reads and membership checks never touch the database. Callers mutate that instance in
+    place and ``save`` writes it through to the repository.
+    """
+
+    def __init__(self, repository: QueueRepository, *, default_channel_id: int | None = None):
+        self.repository = repository
+        self.default_channel_id = default_channel_id
+        self._queues: dict[int, Queue] = {}
+
+    async def load_for_guild(
+        self,
+        guild: discord.Guild,
+        *,
+        queue_type: type[QueueType] = Queue,
+        channel_id: int | None = None,
+    ) -> QueueType:
+        queue = self._queues.get(guild.id)
+        if queue is None:
+            loaded = await self.repository.load_for_guild(
+                guild,
+                queue_type=queue_type,
+                channel_id=channel_id if channel_id is not None else self.default_channel_id,
+            )
+            # another caller may have finished loading while we awaited; keep whichever landed first
+            queue = self._queues.setdefault(guild.id, loaded)
+        return queue  # pyright: ignore[reportReturnType]
+
+    async def save(self, queue: Queue) -> None:
+        self._queues[queue.server_id] = queue
+        try:
+            await self.repository.save(queue)
+        except Exception:
+            # the in-memory copy is ahead of Mongo now, so drop it and re-read on next access
+            self.invalidate(queue.server_id)
+            raise
+
+    async def warm(self, guild: discord.Guild) -> Queue:
+        return await self.load_for_guild(guild)
+
+    def peek(self, guild_id: int) -> Queue | None:
+        return self._queues.get(guild_id)
+
+    def invalidate(self, guild_id: int) -> None:
+        self._queues.pop(guild_id, None)
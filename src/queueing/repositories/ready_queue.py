@@ -2,10 +2,14 @@
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import ClassVar
 
 import pymongo
 from pymongo.asynchronous.collection import AsyncCollection
 
+from common.indexes import IndexSpec
+from common.query_audit import QueryShape
+
 
 @dataclass(slots=True)
 class ReadyQueueEntry:
@@ -16,6 +20,9 @@ class ReadyQueueEntry:
 
 
 class ReadyQueueRepository:
+    INDEXES: ClassVar[tuple[IndexSpec, ...]] = ()
+    QUERY_SHAPES: ClassVar[tuple[QueryShape, ...]] = ()
+
     def __init__(
         self,
         collection: AsyncCollection,
@@ -71,10 +78,30 @@ async def get_queue_member(self, queue_number: int) -> ReadyQueueEntry | None:
 
 
 class DMQueueRepository(ReadyQueueRepository):
+    INDEXES = (IndexSpec.on("dm_queue", "readyOn"),)
+    QUERY_SHAPES = (
+        QueryShape("dm_queue.list_entries", "dm_queue", sort=(("readyOn", pymongo.ASCENDING),)),
+        # the reinforcement dump in the DM queue cog
+        QueryShape(
+            "dm_queue.reinforcements_by_dm",
+            "reinforcement_analytics",
+            {"dm_id": 0},
+            sort=(("gate_info.claimed_date", pymongo.ASCENDING),),
+        ),
+        QueryShape(
+            "dm_queue.reinforcements",
+            "reinforcement_analytics",
+            sort=(("gate_info.claimed_date", pymongo.ASCENDING),),
+        ),
+    )
+
     def __init__(self, collection: AsyncCollection):
         super().__init__(collection, text_field="ranks")
 
 
 class StrikeQueueRepository(ReadyQueueRepository):
+    INDEXES = (IndexSpec.on("strike_queue", "readyOn"),)
+    QUERY_SHAPES = (QueryShape("strike_queue.list_entries", "strike_queue", sort=(("readyOn", pymongo.ASCENDING),)),)
+
     def __init__(self, collection: AsyncCollection):
         super().__init__(collection, text_field="content")
@@ -1,16 +1,34 @@
-from .container import QueueServices, get_queue_services
+from .container import QueueServices, close_queue_services, get_queue_services
 from .dm_queue import DMQueueService
 from .player_queue import PlayerQueueService
-from .presentation import QueuePresentationService, replace_persistent_message, send_gate_assignment
+from .presentation import (
+    QueuePresentationService,
+    group_member_mentions,
+    replace_persistent_message,
+    send_gate_assignment,
+)
+from .queue_actor import QueueActorPool
+from .refresh import RefreshScheduler
+from .signup_ingest import PendingSignup, SignupIngestor
 from .strike_queue import StrikeQueueService
+from .unit_of_work import QueueUnitOfWork, UnitOfWorkCounters, normalize_queue
 
 __all__ = [
     "DMQueueService",
+    "PendingSignup",
     "PlayerQueueService",
+    "QueueActorPool",
     "QueuePresentationService",
     "QueueServices",
+    "QueueUnitOfWork",
+    "RefreshScheduler",
+    "SignupIngestor",
     "StrikeQueueService",
+    "UnitOfWorkCounters",
+    "close_queue_services",
     "get_queue_services",
+    "group_member_mentions",
+    "normalize_queue",
     "replace_persistent_message",
     "send_gate_assignment",
 ]
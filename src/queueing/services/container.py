@@ -6,12 +6,15 @@
 
 from common.types import MongoBackedBot
 from queueing.config import QueueRuntimeConfig
+from queueing.members import MemberResolver
 from queueing.repositories import (
     AnalyticsRepository,
+    AnalyticsSink,
     DMQueueRepository,
     GateRepository,
     QueueMetaRepository,
     QueueRepository,
+    QueueStateStore,
     StrikeQueueRepository,
 )
 from queueing.services.dm_queue import DMQueueService
@@ -43,11 +46,14 @@ def _strike_queue_view(bot: MongoBackedBot) -> discord.ui.View:
 class QueueServices:
     config: QueueRuntimeConfig
     queue_repository: QueueRepository
+    queue_store: QueueStateStore
     dm_queue_repository: DMQueueRepository
     strike_queue_repository: StrikeQueueRepository
     gate_repository: GateRepository
     analytics_repository: AnalyticsRepository
+    analytics_sink: AnalyticsSink
     meta_repository: QueueMetaRepository
+    member_resolver: MemberResolver
     presentation_service: QueuePresentationService
     player_queue_service: PlayerQueueService
     dm_queue_service: DMQueueService
@@ -67,19 +73,31 @@ def get_queue_services(bot: MongoBackedBot) -> QueueServices:
         bot.mdb["player_queue"],
         default_channel_id=config.player_queue_channel_id,
     )
+    queue_store = QueueStateStore(queue_repository, default_channel_id=config.player_queue_channel_id)
     dm_queue_repository = DMQueueRepository(bot.mdb["dm_queue"])
     strike_queue_repository = StrikeQueueRepository(bot.mdb["strike_queue"])
     gate_repository = GateRepository(bot.mdb["gate_list"])
-    analytics_repository = AnalyticsRepository(bot.mdb)
+    analytics_sink = AnalyticsSink(
+        max_batch=config.analytics_max_batch,
+        flush_interval=config.analytics_flush_interval,
+    )
+    analytics_repository = AnalyticsRepository(bot.mdb, sink=analytics_sink)
     meta_repository = QueueMetaRepository(bot.mdb["queue_meta"])
-    presentation_service = QueuePresentationService(bot=bot, meta_repository=meta_repository)
+    member_resolver = MemberResolver()
+    presentation_service = QueuePresentationService(
+        bot=bot,
+        meta_repository=meta_repository,
+        analytics_repository=analytics_repository,
+        member_resolver=member_resolver,
+    )
 
     player_queue_service = PlayerQueueService(
         bot=bot,
         config=config,
-        queue_repository=queue_repository,
+        queue_store=queue_store,
         gate_repository=gate_repository,
         analytics_repository=analytics_repository,
+        meta_repository=meta_repository,
         presentation_service=presentation_service,
         view_factory=lambda: _player_queue_view(bot),
     )
@@ -87,7 +105,8 @@ def get_queue_services(bot: MongoBackedBot) -> QueueServices:
         bot=bot,
         config=config,
         dm_queue_repository=dm_queue_repository,
-        queue_repository=queue_repository,
+        queue_store=queue_store,
+        queue_actors=player_queue_service.queue_actors,
         analytics_repository=analytics_repository,
         presentation_service=presentation_service,
         view_factory=lambda: _dm_queue_view(bot),
@@ -105,11 +124,14 @@ def get_queue_services(bot: MongoBackedBot) -> QueueServices:
     services = QueueServices(
         config=config,
         queue_repository=queue_repository,
+        queue_store=queue_store,
         dm_queue_repository=dm_queue_repository,
         strike_queue_repository=strike_queue_repository,
         gate_repository=gate_repository,
         analytics_repository=analytics_repository,
+        analytics_sink=analytics_sink,
         meta_repository=meta_repository,
+        member_resolver=member_resolver,
         presentation_service=presentation_service,
         player_queue_service=player_queue_service,
         dm_queue_service=dm_queue_service,
@@ -117,3 +139,11 @@ def get_queue_services(bot: MongoBackedBot) -> QueueServices:
     )
     setattr(bot, _SERVICE_CACHE_ATTR, services)
     return services
+
+
+async def close_queue_services(bot: MongoBackedBot) -> None:
+    """Flushes buffered writes on shutdown; does nothing if the services were never built."""
+    services: QueueServices | None = getattr(bot, _SERVICE_CACHE_ATTR, None)
+    if services is None:
+        return
+    await services.analytics_sink.close()
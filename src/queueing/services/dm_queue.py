@@ -9,9 +9,12 @@
 from queueing.config import QueueRuntimeConfig
 from queueing.contracts import AssignResult, LeaveResult, QueueRefreshResult, QueueViewState, SignupResult
 from queueing.documents import GroupDocument
+from queueing.models import Group, Queue
 from queueing.parsing import length_check
-from queueing.repositories import AnalyticsRepository, DMQueueRepository, QueueRepository, ReadyQueueEntry
+from queueing.repositories import AnalyticsRepository, DMQueueRepository, QueueStateStore, ReadyQueueEntry
 from queueing.services.presentation import QueuePresentationService
+from queueing.services.queue_actor import QueueActorPool
+from queueing.services.refresh import RefreshScheduler
 
 
 class DMQueueService:
@@ -21,7 +24,8 @@ def __init__(
         bot: MongoBackedBot,
         config: QueueRuntimeConfig,
         dm_queue_repository: DMQueueRepository,
-        queue_repository: QueueRepository,
+        queue_store: QueueStateStore,
+        queue_actors: QueueActorPool,
         analytics_repository: AnalyticsRepository,
         presentation_service: QueuePresentationService,
         view_factory: Callable[[], discord.ui.View],
@@ -29,10 +33,20 @@ def __init__(
         self.bot = bot
         self.config = config
         self.dm_queue_repository = dm_queue_repository
-        self.queue_repository = queue_repository
+        self.queue_store = queue_store
+        self.queue_actors = queue_actors
         self.analytics_repository = analytics_repository
         self.presentation_service = presentation_service
         self.view_factory = view_factory
+        self.board_refresh = RefreshScheduler(
+            lambda guild: self.refresh_queue_message(guild=guild),
+            delay=config.board_refresh_delay,
+            max_latency=config.board_refresh_max_latency,
+            name="dm_queue",
+        )
+
+    def request_refresh(self, guild: discord.Guild) -> None:
+        self.board_refresh.request(guild)
 
     async def signup_from_message(
         self,
@@ -46,7 +60,7 @@ async def signup_from_message(
             message_id=message.id,
         )
         await self.analytics_repository.record_dm_queue_signup(message.author.id, delta=1)
-        await self.refresh_queue_message(guild=require_message_guild(message))
+        self.request_refresh(require_message_guild(message))
         return SignupResult(success=True, message="Signed up for DM queue.", queue_updated=True)
 
     async def update_member(
@@ -57,7 +71,7 @@ async def update_member(
         text: str,
     ) -> SignupResult:
         await self.dm_queue_repository.update_text(member_id=member_id, text=text)
-        await self.refresh_queue_message(guild=guild)
+        self.request_refresh(guild)
         return SignupResult(success=True, message="DM queue entry updated.", queue_updated=True)
 
     async def leave_member(
@@ -72,7 +86,7 @@ async def leave_member(
             return LeaveResult(success=False, message="You were not in the DM queue, or an error occurred.")
         if adjust_signup_count:
             await self.analytics_repository.record_dm_queue_signup(member_id, delta=-1)
-        await self.refresh_queue_message(guild=guild)
+        self.request_refresh(guild)
         return LeaveResult(success=True, message="You have left the DM queue.", queue_updated=True)
 
     async def assign_dm_to_group(
@@ -108,25 +122,37 @@ async def assign_dm_to_group(
         if dm_member is None:
             return AssignResult(success=False, message="Selected DM is no longer in this server.")
 
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
-        check = length_check(len(queue.groups), group_number)
-        if check is not None:
-            return AssignResult(success=False, message=check)
+        assigned: list[Group] = []
+
+        def apply(queue: Queue) -> AssignResult:
+            check = length_check(len(queue.groups), group_number)
+            if check is not None:
+                return AssignResult(success=False, message=check)
 
-        group = queue.groups[group_number - 1]
-        if group.assigned is not None and not allow_reassignment:
+            group = queue.groups[group_number - 1]
+            if group.assigned is not None and not allow_reassignment:
+                return AssignResult(
+                    success=False,
+                    message=(
+                        "A DM is already assigned to this gate. Please assign via command if you wish to assign again."
+                    ),
+                )
+
+            group.assigned = dm_member.id
+            # a version conflict replays this on a fresh queue, so only the last run's group counts
+            assigned[:] = [group]
             return AssignResult(
-                success=False,
-                message=(
-                    "A DM is already assigned to this gate. Please assign via command if you wish to assign again."
-                ),
+                success=True,
+                message=f"Gate #{group_number} assigned to {dm_member.mention}",
+                queue_updated=True,
+                assigned_member_id=dm_member.id,
             )
 
-        group.assigned = dm_member.id
-        await self.queue_repository.save(queue)
+        # the player board does not show assignments, so skip its refresh
+        result = await self.queue_actors.submit(guild, apply, refresh=False)
+        if not result.success:
+            return result
+        group = assigned[-1]
 
         raw_assignment_channel = guild.get_channel(self.config.dm_queue_assignment_channel_id)
         if raw_assignment_channel is None:
@@ -152,14 +178,9 @@ async def assign_dm_to_group(
         await self.analytics_repository.increment_dm_assignments(dm_member.id)
 
         await self.dm_queue_repository.remove_member(dm_member.id)
-        await self.refresh_queue_message(guild=guild)
+        self.request_refresh(guild)
 
-        return AssignResult(
-            success=True,
-            message=f"Gate #{group_number} assigned to {dm_member.mention}",
-            queue_updated=True,
-            assigned_member_id=dm_member.id,
-        )
+        return result
 
     async def queue_view_state(self, guild: discord.Guild) -> QueueViewState:
         entries = await self.dm_queue_repository.list_entries()
@@ -169,6 +190,7 @@ async def refresh_queue_message(
         self,
         *,
         guild: discord.Guild,
+        bump: bool = False,
     ) -> QueueRefreshResult:
         entries = await self.dm_queue_repository.list_entries()
         channel = require_text_channel(guild, self.config.dm_queue_channel_id, name="DM queue")
@@ -180,4 +202,5 @@ async def refresh_queue_message(
             embed_title_prefix="DM Queue",
             embed=embed,
             view=self.view_factory(),
+            bump=bump,
         )
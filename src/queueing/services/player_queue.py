@@ -6,39 +6,82 @@
 
 import disnake as discord
 
-from common.discord_utils import require_message_guild, require_text_channel
+from common.discord_utils import require_message_guild, require_text_channel, try_delete
 from common.embeds import create_queue_embed
 from common.types import MongoBackedBot
 from queueing.config import QueueRuntimeConfig
 from queueing.contracts import ClaimResult, LeaveResult, LockResult, QueueRefreshResult, SignupResult
 from queueing.documents import GateDocument, RegisteredGateDocument
+from queueing.members import resolve_members, sort_by_display_name
 from queueing.models import Group, Player, Queue
 from queueing.parsing import check_level_role, length_check, parse_player_class
-from queueing.repositories import AnalyticsRepository, GateRepository, QueueRepository
+from queueing.repositories import (
+    AnalyticsRepository,
+    GateRepository,
+    PlayerSignupRecord,
+    QueueMetaRepository,
+    QueueStateStore,
+)
 from queueing.services.presentation import QueuePresentationService
+from queueing.services.queue_actor import QueueActorPool
+from queueing.services.refresh import RefreshScheduler
+from queueing.services.signup_ingest import PendingSignup, SignupIngestor
 
 PLAYER_QUEUE_JOIN_CUSTOM_ID = "gatesbot_playerqueue_join"
 
 
+def current_group_number(queue: Queue, member_id: int) -> int | None:
+    """Where ``member_id`` sits once the batch is saved; normalization can shift the number a mutation saw."""
+    location = queue.in_queue(member_id)
+    return location[0] + 1 if location is not None else None
+
+
 class PlayerQueueService:
     def __init__(
         self,
         *,
         bot: MongoBackedBot,
         config: QueueRuntimeConfig,
-        queue_repository: QueueRepository,
+        queue_store: QueueStateStore,
         gate_repository: GateRepository,
         analytics_repository: AnalyticsRepository,
+        meta_repository: QueueMetaRepository,
         presentation_service: QueuePresentationService,
         view_factory: Callable[[], discord.ui.View],
     ):
         self.bot = bot
         self.config = config
-        self.queue_repository = queue_repository
+        self.queue_store = queue_store
         self.gate_repository = gate_repository
         self.analytics_repository = analytics_repository
+        self.meta_repository = meta_repository
         self.presentation_service = presentation_service
         self.view_factory = view_factory
+        self.queue_actors = QueueActorPool(
+            queue_store,
+            channel_id=config.player_queue_channel_id,
+            on_commit=self._on_queue_commit,
+        )
+        self.board_refresh = RefreshScheduler(
+            lambda guild: self.refresh_queue_message(guild=guild),
+            delay=config.board_refresh_delay,
+            max_latency=config.board_refresh_max_latency,
+            name="player_queue",
+        )
+        self.signup_ingestor = SignupIngestor(
+            self.queue_actors,
+            apply=self._apply_signup,
+            settle=self._settle_signup,
+            on_applied=self._record_signups,
+            window=config.signup_batch_window,
+        )
+
+    async def _on_queue_commit(self, guild: discord.Guild, queue: Queue) -> None:
+        del queue
+        self.request_refresh(guild)
+
+    def request_refresh(self, guild: discord.Guild) -> None:
+        self.board_refresh.request(guild)
 
     async def signup_from_message(
         self,
@@ -64,8 +107,8 @@ async def signup_from_text(
         should_delete_duplicate_source: bool = False,
     ) -> SignupResult:
         player_details = parse_player_class(text.strip())
-        player = Player.new(member, player_details)
-        await check_level_role(player)
+        player = Player.new(member.id, player_details)
+        await check_level_role(member, player)
 
         return await self.signup_player(
             guild=guild,
@@ -84,40 +127,47 @@ async def signup_player(
         signup_text: str | None = None,
         should_delete_duplicate_source: bool = False,
     ) -> SignupResult:
-        queue = await self.queue_repository.load_for_guild(
+        return await self.signup_ingestor.submit(
             guild,
-            channel_id=self.config.player_queue_channel_id,
+            PendingSignup(
+                member=member,
+                player=player,
+                signup_text=signup_text,
+                should_delete_duplicate_source=should_delete_duplicate_source,
+            ),
         )
 
-        if queue.in_queue(player.member.id) and not self.config.is_testing:
+    def _apply_signup(self, queue: Queue, signup: PendingSignup) -> SignupResult:
+        player = signup.player
+        if queue.in_queue(player.member_id) and not self.config.is_testing:
             return SignupResult(
                 success=False,
                 message="You are already in a queue!",
-                should_delete_source_message=should_delete_duplicate_source,
+                should_delete_source_message=signup.should_delete_duplicate_source,
             )
 
-        if (index := queue.can_fit_in_group(player)) is not None:
-            queue.groups[index].players.append(player)
-            group_number = index + 1
-        else:
-            queue.groups.append(Group.new(player.tier, [player]))
-            group_number = len(queue.groups)
-
-        await self.analytics_repository.record_player_signup(
-            member=member,
-            total_level=player.total_level,
-            levels=player.levels,  # pyright: ignore[reportArgumentType]
-            signup_text=signup_text,
-        )
-
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-
-        return SignupResult(
-            success=True,
-            message=f"Signed up in Group #{group_number}.",
-            queue_updated=True,
-            group_number=group_number,
+        queue.add_player(player)
+        return SignupResult(success=True, message="", queue_updated=True)
+
+    @staticmethod
+    def _settle_signup(queue: Queue, signup: PendingSignup, result: SignupResult) -> SignupResult:
+        group_number = current_group_number(queue, signup.player.member_id)
+        if result.success and group_number is not None:
+            result.group_number = group_number
+            result.message = f"Signed up in Group #{group_number}."
+        return result
+
+    async def _record_signups(self, applied: list[tuple[PendingSignup, SignupResult]]) -> None:
+        await self.analytics_repository.record_player_signups(
+            [
+                PlayerSignupRecord(
+                    member=signup.member,
+                    total_level=signup.player.total_level,
+                    levels=signup.player.levels,
+                    signup_text=signup.signup_text,
+                )
+                for signup, _ in applied
+            ]
         )
 
     async def leave_member(
@@ -128,34 +178,29 @@ async def leave_member(
         decrement_signup_count: bool,
         clear_marked: bool,
     ) -> LeaveResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
+        def apply(queue: Queue) -> LeaveResult:
+            group_index = queue.in_queue(member_id)
+            if group_index is None:
+                return LeaveResult(
+                    success=False,
+                    message="You are not currently in the queue, so I cannot remove you from it.",
+                )
 
-        group_index = queue.in_queue(member_id)
-        if group_index is None:
+            queue.pop_player(*group_index)
             return LeaveResult(
-                success=False,
-                message="You are not currently in the queue, so I cannot remove you from it.",
+                success=True,
+                message=f"You have been removed from group #{group_index[0] + 1}",
+                queue_updated=True,
+                group_number=group_index[0] + 1,
             )
 
-        queue.groups[group_index[0]].players.pop(group_index[1])
-
-        if decrement_signup_count:
-            await self.analytics_repository.decrement_player_signup(member_id)
-        if clear_marked:
-            await self.analytics_repository.set_marked(member_id, marked=False)
-
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-
-        return LeaveResult(
-            success=True,
-            message=f"You have been removed from group #{group_index[0] + 1}",
-            queue_updated=True,
-            group_number=group_index[0] + 1,
-        )
+        result = await self.queue_actors.submit(guild, apply)
+        if result.success:
+            if decrement_signup_count:
+                await self.analytics_repository.decrement_player_signup(member_id)
+            if clear_marked:
+                await self.analytics_repository.set_marked(member_id, marked=False)
+        return result
 
     async def remove_member(
         self,
@@ -180,11 +225,6 @@ async def claim_group(
         reinforcement: bool = False,
         use_assignment: bool = False,
     ) -> ClaimResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
-
         gate: RegisteredGateDocument | None
         if gate_name is not None:
             gate = await self.gate_repository.get_by_name(gate_name)
@@ -200,24 +240,40 @@ async def claim_group(
                     message=("You have not claimed a gate. Refer to Assistant/Admin instructions for further details."),
                 )
 
-        if group_number is not None:
-            check = length_check(len(queue.groups), group_number)
-            if check is not None:
-                return ClaimResult(success=False, message=check)
-            group_index = group_number - 1
-        elif use_assignment:
-            group_index = None
-            for index, group in enumerate(queue.groups):
-                if group.assigned == claimant.id:
-                    group_index = index
-                    break
-            if group_index is None:
-                return ClaimResult(success=False, message="You do not currently have a Gate assigned.")
-        else:
-            return ClaimResult(success=False, message="A group number is required.")
+        claimed: list[Group] = []
+
+        def apply(queue: Queue) -> ClaimResult:
+            if group_number is not None:
+                check = length_check(len(queue.groups), group_number)
+                if check is not None:
+                    return ClaimResult(success=False, message=check)
+                group_index = group_number - 1
+            elif use_assignment:
+                group_index = None
+                for index, group in enumerate(queue.groups):
+                    if group.assigned == claimant.id:
+                        group_index = index
+                        break
+                if group_index is None:
+                    return ClaimResult(success=False, message="You do not currently have a Gate assigned.")
+            else:
+                return ClaimResult(success=False, message="A group number is required.")
+
+            # a version conflict replays this on a fresh queue, so only the last run's group counts
+            claimed[:] = [queue.pop_group(group_index)]
+            return ClaimResult(
+                success=True,
+                message=f"You have claimed Group #{group_index + 1}.",
+                queue_updated=True,
+                claimed_group_number=group_index + 1,
+            )
+
+        result = await self.queue_actors.submit(guild, apply)
+        if not result.success:
+            return result
+        popped = claimed[-1]
 
-        popped = queue.groups.pop(group_index)
-        player_ids = [player.member.id for player in popped.players]
+        player_ids = [player.member_id for player in popped.players]
         await self.analytics_repository.clear_marks_for_members(player_ids)
 
         raw_group = popped.to_dict()
@@ -231,13 +287,7 @@ async def claim_group(
         if reinforcement:
             dm_owner = gate.get("owner")
             if dm_owner is not None:
-                dm_info = await self.analytics_repository.get_dm_info(dm_owner)
-                dm_gates = dm_info.get("dm_gates") if dm_info else None
-                if dm_gates:
-                    await self.analytics_repository.record_gate_reinforcement(
-                        dm_id=dm_owner,
-                        gate_info=dm_gates[-1],
-                    )
+                await self.analytics_repository.record_latest_gate_reinforcement(dm_owner)
         else:
             await self.analytics_repository.mark_assignment_claimed()
             await self.analytics_repository.record_dm_claim(
@@ -245,12 +295,10 @@ async def claim_group(
                 gate_data=raw_gate,
             )
 
-        for player in popped.players:
-            await self.analytics_repository.record_player_gate_summon(
-                member_id=player.member.id,
-                gate_name=gate["name"],
-                total_level=player.total_level,
-            )
+        await self.analytics_repository.record_player_gate_summons(
+            gate_name=gate["name"],
+            summons=[(player.member_id, player.total_level) for player in popped.players],
+        )
 
         await self.analytics_repository.record_claimed_group(
             gate_name=gate["name"],
@@ -265,7 +313,7 @@ async def claim_group(
         )
         assignments_str = f"<#{assignment_channel.id}>" if assignment_channel is not None else "#gate-assignments-v2"
 
-        sorted_players = sorted(popped.players, key=lambda player: player.member.display_name)
+        sorted_players = sort_by_display_name(popped.players, resolve_members(guild, player_ids))
         mentions = [player.mention for player in sorted_players]
 
         if summons_channel is not None:
@@ -287,32 +335,22 @@ async def claim_group(
                 allowed_mentions=discord.AllowedMentions(users=True),
             )
 
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-
-        return ClaimResult(
-            success=True,
-            message=f"You have claimed Group #{group_index + 1}.",
-            queue_updated=True,
-            claimed_group_number=group_index + 1,
-            summoned_mentions=mentions,
-        )
+        result.summoned_mentions = mentions
+        return result
 
     async def refresh_queue_message(
         self,
         *,
         guild: discord.Guild,
         queue: Queue | None = None,
+        bump: bool = False,
     ) -> QueueRefreshResult:
         if queue is None:
-            queue = await self.queue_repository.load_for_guild(
+            queue = await self.queue_store.load_for_guild(
                 guild,
                 channel_id=self.config.player_queue_channel_id,
             )
 
-        queue.groups = [group for group in queue.groups if group.players]
-        await self.queue_repository.save(queue)
-
         channel = require_text_channel(guild, self.config.player_queue_channel_id, name="Queue")
 
         embed = await self.presentation_service.build_player_queue_embed(queue)
@@ -328,6 +366,7 @@ async def refresh_queue_message(
             embed_title_prefix="Gate Sign-Up List",
             embed=embed,
             view=view,
+            bump=bump,
         )
 
     async def move_member(
@@ -338,40 +377,33 @@ async def move_member(
         member_id: int,
         new_group: int,
     ) -> LeaveResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
+        def apply(queue: Queue) -> LeaveResult:
+            check = length_check(len(queue.groups), original_group)
+            if check is not None:
+                return LeaveResult(success=False, message=check)
+            check = length_check(len(queue.groups), new_group)
+            if check is not None:
+                return LeaveResult(success=False, message=check)
 
-        check = length_check(len(queue.groups), original_group)
-        if check is not None:
-            return LeaveResult(success=False, message=check)
-        check = length_check(len(queue.groups), new_group)
-        if check is not None:
-            return LeaveResult(success=False, message=check)
-
-        old_group = queue.groups[original_group - 1]
-        old_index = next(
-            (index for index, player in enumerate(old_group.players) if player.member.id == member_id),
-            None,
-        )
-        if old_index is None:
-            return LeaveResult(
-                success=False,
-                message=f"Could not find <@{member_id}> in Group #{original_group}",
-            )
+            location = queue.in_queue(member_id)
+            if location is None or location[0] != original_group - 1:
+                return LeaveResult(
+                    success=False,
+                    message=f"Could not find <@{member_id}> in Group #{original_group}",
+                )
 
-        player = queue.groups[original_group - 1].players.pop(old_index)
-        queue.groups[new_group - 1].players.append(player)
+            player = queue.pop_player(*location)
+            queue.append_player(new_group - 1, player)
+            return LeaveResult(success=True, message="", queue_updated=True)
 
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-        return LeaveResult(
-            success=True,
-            message=f"{player.mention} has been moved from Group #{original_group} to Group #{new_group}",
-            queue_updated=True,
-            group_number=new_group,
-        )
+        def settle(queue: Queue, result: LeaveResult) -> LeaveResult:
+            group_number = current_group_number(queue, member_id)
+            if result.success and group_number is not None:
+                result.group_number = group_number
+                result.message = f"<@{member_id}> has been moved from Group #{original_group} to Group #{group_number}"
+            return result
+
+        return await self.queue_actors.submit(guild, apply, settle=settle)
 
     async def merge_groups(
         self,
@@ -380,29 +412,32 @@ async def merge_groups(
         group_1: int,
         group_2: int,
     ) -> LeaveResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
-        if len(queue.groups) <= 1:
-            return LeaveResult(success=False, message="There is only one group in the queue.")
+        merged: list[Group] = []
 
-        for group_number in (group_1, group_2):
-            check = length_check(len(queue.groups), group_number)
-            if check is not None:
-                return LeaveResult(success=False, message=check)
+        def apply(queue: Queue) -> LeaveResult:
+            if len(queue.groups) <= 1:
+                return LeaveResult(success=False, message="There is only one group in the queue.")
 
-        queue.groups[group_1 - 1].players.extend(queue.groups[group_2 - 1].players)
-        queue.groups.pop(group_2 - 1)
+            for group_number in (group_1, group_2):
+                check = length_check(len(queue.groups), group_number)
+                if check is not None:
+                    return LeaveResult(success=False, message=check)
 
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-        return LeaveResult(
-            success=True,
-            message=f"Group #{group_1} and #{group_2} have been merged.",
-            queue_updated=True,
-            group_number=group_1,
-        )
+            merged[:] = [queue.groups[group_1 - 1]]
+            queue.merge_groups(group_1 - 1, group_2 - 1)
+
+            return LeaveResult(
+                success=True,
+                message=f"Group #{group_1} and #{group_2} have been merged.",
+                queue_updated=True,
+            )
+
+        def settle(queue: Queue, result: LeaveResult) -> LeaveResult:
+            if result.success and (index := queue.index_of(merged[-1])) is not None:
+                result.group_number = index + 1
+            return result
+
+        return await self.queue_actors.submit(guild, apply, settle=settle)
 
     async def create_group_from_member(
         self,
@@ -410,29 +445,29 @@ async def create_group_from_member(
         guild: discord.Guild,
         member_id: int,
     ) -> LeaveResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
-        group_index = queue.in_queue(member_id)
-        if group_index is None:
+        def apply(queue: Queue) -> LeaveResult:
+            group_index = queue.in_queue(member_id)
+            if group_index is None:
+                return LeaveResult(
+                    success=False,
+                    message=f"<@{member_id}> was not in the queue, so they have not been moved.",
+                )
+
+            player = queue.pop_player(*group_index)
+            queue.insert_group(group_index[0] + 1, Group.new(player.tier, [player]))
+
             return LeaveResult(
-                success=False,
-                message=f"<@{member_id}> was not in the queue, so they have not been moved.",
+                success=True,
+                message=f"{player.mention} has been moved to a new tier {player.tier} group!",
+                queue_updated=True,
             )
 
-        player = queue.groups[group_index[0]].players.pop(group_index[1])
-        queue.groups.insert(group_index[0] + 1, Group.new(player.tier, [player]))
+        def settle(queue: Queue, result: LeaveResult) -> LeaveResult:
+            if result.success:
+                result.group_number = current_group_number(queue, member_id)
+            return result
 
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-
-        return LeaveResult(
-            success=True,
-            message=f"{player.mention} has been moved to a new tier {player.tier} group!",
-            queue_updated=True,
-            group_number=group_index[0] + 2,
-        )
+        return await self.queue_actors.submit(guild, apply, settle=settle)
 
     async def shuffle_groups(
         self,
@@ -441,37 +476,32 @@ async def shuffle_groups(
         tier: int,
         group_size: int,
     ) -> LeaveResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
+        def apply(queue: Queue) -> LeaveResult:
+            selected_players: list[Player] = []
+            kept: list[Group] = []
+            group_type = Group
+            for group in queue.groups:
+                group_type = group.__class__
+                if group.tier != tier or group.locked:
+                    kept.append(group)
+                    continue
+                selected_players.extend(group.players)
 
-        selected_players: list[Player] = []
-        group_type = Group
-        for group in queue.groups.copy():
-            group_type = group.__class__
-            if group.tier != tier or group.locked:
-                continue
-            queue.groups.remove(group)
-            selected_players.extend(group.players)
-
-        if not selected_players:
-            return LeaveResult(success=False, message=f"No players in Rank {tier} was found.")
-
-        selected_players = random.sample(selected_players, len(selected_players))
-        for player in selected_players:
-            if (index := queue.can_fit_in_group(player, group_size)) is not None:
-                queue.groups[index].players.append(player)
-            else:
-                queue.groups.append(group_type.new(player.tier, [player]))
-
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-        return LeaveResult(
-            success=True,
-            message="Queue shuffled.",
-            queue_updated=True,
-        )
+            if not selected_players:
+                return LeaveResult(success=False, message=f"No players in Rank {tier} was found.")
+
+            queue.groups = kept
+            selected_players = random.sample(selected_players, len(selected_players))
+            for player in selected_players:
+                queue.add_player(player, group_size, group_type)
+
+            return LeaveResult(
+                success=True,
+                message="Queue shuffled.",
+                queue_updated=True,
+            )
+
+        return await self.queue_actors.submit(guild, apply)
 
     async def toggle_group_lock(
         self,
@@ -479,26 +509,22 @@ async def toggle_group_lock(
         guild: discord.Guild,
         group_number: int,
     ) -> LockResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
-        check = length_check(len(queue.groups), group_number)
-        if check is not None:
-            return LockResult(success=False, message=check)
+        def apply(queue: Queue) -> LockResult:
+            check = length_check(len(queue.groups), group_number)
+            if check is not None:
+                return LockResult(success=False, message=check)
 
-        group = queue.groups[group_number - 1]
-        group.locked = not group.locked
+            group = queue.groups[group_number - 1]
+            group.locked = not group.locked
 
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
+            return LockResult(
+                success=True,
+                message=f"Group #{group_number} {'locked' if group.locked else 'unlocked'}.",
+                queue_updated=True,
+                is_locked=group.locked,
+            )
 
-        return LockResult(
-            success=True,
-            message=f"Group #{group_number} {'locked' if group.locked else 'unlocked'}.",
-            queue_updated=True,
-            is_locked=group.locked,
-        )
+        return await self.queue_actors.submit(guild, apply)
 
     async def toggle_queue_lock(
         self,
@@ -511,11 +537,6 @@ async def toggle_queue_lock(
         reason: str | None,
         send_announcement: bool,
     ) -> LockResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
-
         perms = queue_channel.overwrites
         player_perms = perms.get(player_role, discord.PermissionOverwrite())
         player_perms.update(send_messages=not should_lock)
@@ -533,51 +554,54 @@ async def toggle_queue_lock(
             embed.description = f"The queue channel has been temporarily locked by {actor}."
             if reason:
                 embed.add_field(name="Reason", value=reason)
-            await queue_channel.send(embed=embed)
+            notice = await queue_channel.send(embed=embed)
+            await self.meta_repository.set_message_id(f"lock_notice:{queue_channel.id}", notice.id)
         else:
-            await self.analytics_repository.set_unlock_timestamp()
-            for group in queue.groups:
-                for player in group.players:
-                    await self.analytics_repository.set_marked(player.member.id, marked=True)
-
-            async for msg in queue_channel.history(limit=25):
-                bot_user = self.bot.user
-                if bot_user is None:
-                    break
+            # players are waiting on the ping, so it goes out before any bookkeeping
+            if send_announcement:
+                await self._announce_unlock(guild)
 
-                if msg.author.id != bot_user.id:
-                    continue
-                if msg.embeds and msg.embeds[0].title == "Queue Channel Locked":
-                    try:
-                        await msg.delete()
-                    except discord.Forbidden, discord.NotFound, discord.HTTPException:
-                        pass
-                    break
+            await self.analytics_repository.set_unlock_timestamp()
+            queue = await self.queue_store.load_for_guild(
+                guild,
+                channel_id=self.config.player_queue_channel_id,
+            )
+            await self.analytics_repository.set_marked_many(queue.member_ids, marked=True)
+            await self._remove_lock_notice(queue_channel)
+
+        def apply(queue: Queue) -> LockResult:
+            queue.locked = should_lock
+            return LockResult(
+                success=True,
+                message=f"Queue {'locked' if should_lock else 'unlocked'}.",
+                queue_updated=True,
+                is_locked=should_lock,
+            )
 
-            if send_announcement:
-                try:
-                    announce_channel = require_text_channel(
-                        guild, self.config.gate_announcement_channel_id, name="Gate Announcement Channels"
-                    )
-                    await announce_channel.send(
-                        (
-                            f"<@&778973153962885161>, <#{self.config.player_queue_channel_id}> "
-                            "has been unlocked! Sign up to join the queue!"
-                        ),
-                        allowed_mentions=discord.AllowedMentions(roles=True),
-                    )
-                except ValueError:
-                    pass
-
-        queue.locked = should_lock
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-
-        return LockResult(
-            success=True,
-            message=f"Queue {'locked' if should_lock else 'unlocked'}.",
-            queue_updated=True,
-            is_locked=should_lock,
+        return await self.queue_actors.submit(guild, apply)
+
+    async def _remove_lock_notice(self, queue_channel: discord.TextChannel) -> None:
+        # only a notice whose id was stored is removed, the channel history is never scanned for one
+        key = f"lock_notice:{queue_channel.id}"
+        message_id = await self.meta_repository.get_message_id(key)
+        if message_id is None:
+            return
+        await try_delete(queue_channel.get_partial_message(message_id))
+        await self.meta_repository.clear_message_id(key)
+
+    async def _announce_unlock(self, guild: discord.Guild) -> None:
+        try:
+            announce_channel = require_text_channel(
+                guild, self.config.gate_announcement_channel_id, name="Gate Announcement Channels"
+            )
+        except ValueError:
+            return
+        await announce_channel.send(
+            (
+                f"<@&778973153962885161>, <#{self.config.player_queue_channel_id}> "
+                "has been unlocked! Sign up to join the queue!"
+            ),
+            allowed_mentions=discord.AllowedMentions(roles=True),
         )
 
     async def force_unlock_channel(
@@ -604,11 +628,8 @@ async def empty_queue(
         *,
         guild: discord.Guild,
     ) -> LeaveResult:
-        queue = await self.queue_repository.load_for_guild(
-            guild,
-            channel_id=self.config.player_queue_channel_id,
-        )
-        queue.groups = []
-        await self.queue_repository.save(queue)
-        await self.refresh_queue_message(guild=guild, queue=queue)
-        return LeaveResult(success=True, message="Queue emptied.", queue_updated=True)
+        def apply(queue: Queue) -> LeaveResult:
+            queue.groups = []
+            return LeaveResult(success=True, message="Queue emptied.", queue_updated=True)
+
+        return await self.queue_actors.submit(guild, apply)
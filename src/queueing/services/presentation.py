@@ -1,29 +1,33 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 
 import disnake as discord
-from pymongo.asynchronous.collection import AsyncCollection
 
 from common.embeds import create_queue_embed
+from common.metrics import metrics
 from common.types import MongoBackedBot
 from queueing.contracts import QueueRefreshResult, QueueViewState
+from queueing.members import MemberResolver, sort_by_display_name
 from queueing.messages import build_gate_assignment_message
-from queueing.models import Group, Queue
-from queueing.repositories import QueueMetaRepository, ReadyQueueEntry
+from queueing.models import Group, Player, Queue
+from queueing.repositories import AnalyticsRepository, PlayerMark, QueueMetaRepository, ReadyQueueEntry
 
 
 async def replace_persistent_message(
     *,
     channel: discord.TextChannel,
-    meta_db: AsyncCollection,
+    meta_repository: QueueMetaRepository,
     meta_key: str,
     embed_title_prefix: str,
     bot_user_id: int,
     embed: discord.Embed,
     view: discord.ui.View,
 ) -> discord.Message:
-    old_message_id = await QueueMetaRepository(meta_db).resolve_message_id(
+    old_message_id = await meta_repository.resolve_message_id(
         channel=channel,
         meta_key=meta_key,
         embed_title_prefix=embed_title_prefix,
@@ -41,11 +45,7 @@ async def replace_persistent_message(
                 pass
 
     message = await channel.send(embed=embed, view=view)
-    await meta_db.update_one(
-        {"_id": meta_key},
-        {"$set": {"message_id": message.id}},
-        upsert=True,
-    )
+    await meta_repository.set_message_id(meta_key, message.id)
     return message
 
 
@@ -57,7 +57,12 @@ async def send_gate_assignment(
     dm_member: discord.Member,
     assignment_channel: discord.TextChannel,
 ) -> None:
-    service = QueuePresentationService(bot=bot, meta_repository=QueueMetaRepository(bot.mdb["queue_meta"]))
+    service = QueuePresentationService(
+        bot=bot,
+        meta_repository=QueueMetaRepository(bot.mdb["queue_meta"]),
+        analytics_repository=AnalyticsRepository(bot.mdb),
+        member_resolver=MemberResolver(),
+    )
     await service.send_gate_assignment(
         group=group,
         group_number=group_number,
@@ -66,22 +71,56 @@ async def send_gate_assignment(
     )
 
 
+def group_member_mentions(group: Group, marks: dict[int, PlayerMark]) -> str:
+    names = [f"{player.mention}{marks.get(player.member_id, PlayerMark()).suffix}" for player in group.players]
+    return discord.utils.escape_markdown(", ".join(names))
+
+
+def render_digest(embed: discord.Embed, view: discord.ui.View) -> str | None:
+    """Hashes what a board would look like, ignoring the embed timestamp that changes on every render."""
+    to_dict = getattr(embed, "to_dict", None)
+    to_components = getattr(view, "to_components", None)
+    if to_dict is None or to_components is None:
+        return None
+
+    rendered = dict(to_dict())
+    rendered.pop("timestamp", None)
+    payload = json.dumps({"embed": rendered, "components": to_components()}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(slots=True)
+class _BoardState:
+    message: discord.Message
+    digest: str | None = None
+
+
 class QueuePresentationService:
-    def __init__(self, *, bot: MongoBackedBot, meta_repository: QueueMetaRepository):
+    def __init__(
+        self,
+        *,
+        bot: MongoBackedBot,
+        meta_repository: QueueMetaRepository,
+        analytics_repository: AnalyticsRepository,
+        member_resolver: MemberResolver,
+    ):
         self.bot = bot
         self.meta_repository = meta_repository
-        self.mark_repository = bot.mdb["player_marked"]
+        self.analytics_repository = analytics_repository
+        self.member_resolver = member_resolver
+        self._boards: dict[str, _BoardState] = {}
 
     async def build_player_queue_embed(self, queue: Queue) -> discord.Embed:
-        queue.groups.sort(key=lambda group: group.tier)
         embed = create_queue_embed(self.bot)
         embed.title = "Gate Sign-Up List" + (" 🔒" if queue.locked else "")
 
-        for index, group in enumerate(queue.groups):
+        marks = await self.analytics_repository.get_marks(queue.member_ids)
+        # rendering happens outside the queue actor, so order a copy rather than the live groups
+        for index, group in enumerate(sorted(queue.groups, key=lambda group: group.tier)):
             locked = " 🔒" if group.locked else ""
             embed.add_field(
                 name=f"{index + 1}. Rank {group.tier}{locked}",
-                value=await self._group_member_mentions(group),
+                value=group_member_mentions(group, marks),
                 inline=False,
             )
 
@@ -92,7 +131,12 @@ async def build_player_waitlist_embed(
         queue: Queue,
         *,
         signup_times: dict[int, datetime],
+        members: dict[int, discord.Member],
     ) -> discord.Embed:
+        def display_name(player: Player) -> str:
+            member = members.get(player.member_id)
+            return member.display_name if member is not None else str(player.member_id)
+
         players = [
             (group_index, group.tier, player)
             for group_index, group in enumerate(queue.groups)
@@ -100,15 +144,15 @@ async def build_player_waitlist_embed(
         ]
         players.sort(
             key=lambda item: (
-                signup_times.get(item[2].member.id) is None,
-                signup_times.get(item[2].member.id) or datetime.max.replace(tzinfo=timezone.utc),
-                item[2].member.display_name.casefold(),
+                signup_times.get(item[2].member_id) is None,
+                signup_times.get(item[2].member_id) or datetime.max.replace(tzinfo=timezone.utc),
+                display_name(item[2]).casefold(),
             )
         )
 
         lines: list[str] = []
         for index, (group_index, tier, player) in enumerate(players, start=1):
-            signup_time = signup_times.get(player.member.id)
+            signup_time = signup_times.get(player.member_id)
             if signup_time is None:
                 wait_text = "unknown signup time"
             else:
@@ -168,23 +212,66 @@ async def refresh_queue_message(
         embed_title_prefix: str,
         embed: discord.Embed,
         view: discord.ui.View,
+        bump: bool = False,
     ) -> QueueRefreshResult:
+        payload = {"meta_key": meta_key, "embed_title_prefix": embed_title_prefix}
+        digest = render_digest(embed, view)
+
+        if not bump:
+            board = self._boards.get(meta_key) or await self._load_board(
+                channel=channel,
+                meta_key=meta_key,
+                embed_title_prefix=embed_title_prefix,
+            )
+            if board is not None:
+                if digest is not None and board.digest == digest:
+                    metrics.increment("board.skipped")
+                    return QueueRefreshResult(message_id=board.message.id, payload=payload)
+                try:
+                    await board.message.edit(embed=embed, view=view)
+                except discord.NotFound, discord.Forbidden, discord.HTTPException:
+                    # the board is gone or no longer editable, post a fresh one below
+                    self._boards.pop(meta_key, None)
+                else:
+                    board.digest = digest
+                    metrics.increment("board.edited")
+                    return QueueRefreshResult(message_id=board.message.id, payload=payload)
+
         message = await replace_persistent_message(
             channel=channel,
-            meta_db=self.meta_repository.collection,
+            meta_repository=self.meta_repository,
             meta_key=meta_key,
             embed_title_prefix=embed_title_prefix,
             bot_user_id=self.bot.user.id,
             embed=embed,
             view=view,
         )
-        return QueueRefreshResult(
-            message_id=message.id,
-            payload={
-                "meta_key": meta_key,
-                "embed_title_prefix": embed_title_prefix,
-            },
+        self._boards[meta_key] = _BoardState(message=message, digest=digest)
+        metrics.increment("board.replaced")
+        return QueueRefreshResult(message_id=message.id, payload=payload)
+
+    async def _load_board(
+        self,
+        *,
+        channel: discord.TextChannel,
+        meta_key: str,
+        embed_title_prefix: str,
+    ) -> _BoardState | None:
+        message_id = await self.meta_repository.resolve_message_id(
+            channel=channel,
+            meta_key=meta_key,
+            embed_title_prefix=embed_title_prefix,
+            bot_user_id=self.bot.user.id,
         )
+        if message_id is None:
+            return None
+        try:
+            message = await channel.fetch_message(message_id)
+        except discord.NotFound, discord.Forbidden, discord.HTTPException:
+            return None
+        board = _BoardState(message=message)
+        self._boards[meta_key] = board
+        return board
 
     async def send_gate_assignment(
         self,
@@ -194,9 +281,10 @@ async def send_gate_assignment(
         dm_member: discord.Member,
         assignment_channel: discord.TextChannel,
     ) -> None:
-        group.players.sort(key=lambda player: player.member.display_name)
-        for player in group.players:
-            player.member = await assignment_channel.guild.fetch_member(player.member.id)
+        guild = assignment_channel.guild
+        members = await self.member_resolver.resolve(guild, (player.member_id for player in group.players))
+        # the group may be the live queue instance, so sort a copy instead of reordering its players
+        group = replace(group, players=sort_by_display_name(group.players, members))
 
         assignment_embed = create_queue_embed(self.bot)
         assignment_embed.title = "Gate Assignment"
@@ -208,7 +296,7 @@ async def send_gate_assignment(
 
         group_embed = create_queue_embed(self.bot)
         group_embed.title = f"Information for Group #{group_number}"
-        group_embed.description = group.player_levels_str
+        group_embed.description = group.player_levels_str(members)
 
         await assignment_channel.send(embed=group_embed)
         await assignment_channel.send(
@@ -252,11 +340,3 @@ async def strike_view_state(
                 continue
             lines.append(f"#{index + 1} {member.display_name} - {item.text}")
         return QueueViewState(title="Strike Team Queue", lines=lines)
-
-    async def _group_member_mentions(self, group: Group) -> str:
-        names: list[str] = []
-        for player in group.players:
-            mark_info = await self.mark_repository.find_one({"_id": player.member.id}) or {}
-            postfix = f"{'*' if mark_info.get('marked', False) else ''}{mark_info.get('custom', '')}"
-            names.append(f"{player.mention}{postfix}")
-        return discord.utils.escape_markdown(", ".join(names))
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, TypeVar
+
+import disnake as discord
+
+from queueing.models import Queue
+from queueing.repositories import QueueStateStore, QueueVersionConflict
+from queueing.services.unit_of_work import QueueUnitOfWork, UnitOfWorkCounters
+
+log = logging.getLogger(__name__)
+
+ResultT = TypeVar("ResultT")
+
+QueueMutation = Callable[[Queue], ResultT]
+QueueSettle = Callable[[Queue, ResultT], ResultT]
+QueueCommitHook = Callable[[discord.Guild, Queue], Awaitable[Any]]
+
+
+@dataclass(slots=True)
+class _QueueCommand:
+    guild: discord.Guild
+    mutate: QueueMutation[Any]
+    future: asyncio.Future[Any]
+    refresh: bool = True
+    settle: QueueSettle[Any] | None = None
+    result: Any = None
+    error: BaseException | None = None
+
+
+@dataclass(slots=True)
+class _GuildActor:
+    loop: asyncio.AbstractEventLoop
+    inbox: asyncio.Queue[_QueueCommand] = field(default_factory=asyncio.Queue)
+    task: asyncio.Task[None] | None = None
+
+
+def _queue_updated(result: Any) -> bool:
+    return bool(getattr(result, "queue_updated", False))
+
+
+class QueueActorPool:
+    """
+    Runs every player queue mutation for a guild on a single task, in submission order.
+
+    Mutations are plain synchronous callables that edit the cached ``Queue`` and return a result contract.
+    Commands that pile up while a batch is being saved are drained together into one ``QueueUnitOfWork``,
+    so a burst of signups costs one save and one commit hook call. The commit hook (the board refresh) runs
+    after the save and before callers are resumed, but it never blocks other guilds. If another process
+    saved the queue first, the batch is replayed on a fresh read a bounded number of times.
+    """
+
+    def __init__(
+        self,
+        store: QueueStateStore,
+        *,
+        channel_id: int | None = None,
+        on_commit: QueueCommitHook | None = None,
+        max_batch: int = 50,
+        max_conflict_retries: int = 3,
+    ):
+        self.store = store
+        self.channel_id = channel_id
+        self.on_commit = on_commit
+        self.max_batch = max_batch
+        self.max_conflict_retries = max_conflict_retries
+        self.counters = UnitOfWorkCounters()
+        self._actors: dict[int, _GuildActor] = {}
+
+    async def submit(
+        self,
+        guild: discord.Guild,
+        mutate: QueueMutation[ResultT],
+        *,
+        refresh: bool = True,
+        settle: QueueSettle[ResultT] | None = None,
+    ) -> ResultT:
+        """
+        Runs ``mutate`` on the guild's queue. ``settle`` is called with the saved queue and the result once the
+        batch has been normalized, for results that report positions which normalization may have shifted.
+        """
+        loop = asyncio.get_running_loop()
+        command = _QueueCommand(
+            guild=guild,
+            mutate=mutate,
+            future=loop.create_future(),
+            refresh=refresh,
+            settle=settle,
+        )
+        self._actor_for(guild.id, loop).inbox.put_nowait(command)
+        return await command.future
+
+    def _actor_for(self, guild_id: int, loop: asyncio.AbstractEventLoop) -> _GuildActor:
+        actor = self._actors.get(guild_id)
+        if actor is None or actor.loop is not loop or actor.task is None or actor.task.done():
+            actor = _GuildActor(loop=loop)
+            actor.task = loop.create_task(self._run(actor), name=f"queue-actor-{guild_id}")
+            self._actors[guild_id] = actor
+        return actor
+
+    async def _run(self, actor: _GuildActor) -> None:
+        while True:
+            batch = [await actor.inbox.get()]
+            while len(batch) < self.max_batch and not actor.inbox.empty():
+                batch.append(actor.inbox.get_nowait())
+
+            try:
+                await self._apply_batch(batch)
+            except Exception as e:
+                log.exception("[QueueActor] Loading queue failed.")
+                for command in batch:
+                    if command.error is None:
+                        command.error = e
+
+            for command in batch:
+                if command.future.done():
+                    continue
+                if command.error is not None:
+                    command.future.set_exception(command.error)
+                else:
+                    command.future.set_result(command.result)
+
+    async def _apply_batch(self, batch: list[_QueueCommand]) -> None:
+        guild = batch[-1].guild
+        for attempt in range(self.max_conflict_retries + 1):
+            unit_of_work = QueueUnitOfWork(self.store, counters=self.counters)
+            queue = await unit_of_work.begin(guild, channel_id=self.channel_id)
+            refresh = self._apply_commands(batch, queue, unit_of_work)
+
+            try:
+                committed = await unit_of_work.commit()
+            except QueueVersionConflict as e:
+                if attempt < self.max_conflict_retries:
+                    # the store dropped its stale copy, so the batch is replayed on a fresh read
+                    log.warning(f"[QueueActor] {e} Retrying batch of {len(batch)}.")
+                    continue
+                self._fail_writers(batch, e)
+                return
+            except Exception as e:
+                self._fail_writers(batch, e)
+                return
+            break
+
+        self._settle_commands(batch, queue)
+        if committed and refresh and self.on_commit is not None:
+            try:
+                await self.on_commit(guild, queue)
+            except Exception:
+                log.exception("[QueueActor] Commit hook failed.")
+
+    @staticmethod
+    def _apply_commands(batch: list[_QueueCommand], queue: Queue, unit_of_work: QueueUnitOfWork) -> bool:
+        refresh = False
+        for command in batch:
+            command.result, command.error = None, None
+            try:
+                command.result = command.mutate(queue)
+            except Exception as e:
+                command.error = e
+                continue
+            if _queue_updated(command.result):
+                unit_of_work.mark_dirty()
+                refresh = refresh or command.refresh
+        return refresh
+
+    @staticmethod
+    def _settle_commands(batch: list[_QueueCommand], queue: Queue) -> None:
+        for command in batch:
+            if command.settle is None or command.error is not None:
+                continue
+            try:
+                command.result = command.settle(queue, command.result)
+            except Exception as e:
+                log.exception("[QueueActor] Settling command result failed.")
+                command.error = e
+
+    @staticmethod
+    def _fail_writers(batch: list[_QueueCommand], error: Exception) -> None:
+        log.error("[QueueActor] Saving queue failed.", exc_info=error)
+        # callers must not be told their change landed when it did not
+        for command in batch:
+            if command.error is None and _queue_updated(command.result):
+                command.error = error
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import disnake as discord
+
+from common.metrics import metrics
+
+log = logging.getLogger(__name__)
+
+BoardRenderer = Callable[[discord.Guild], Awaitable[Any]]
+
+
+@dataclass(slots=True)
+class _PendingRefresh:
+    loop: asyncio.AbstractEventLoop
+    guild: discord.Guild
+    first_requested_at: float | None = None
+    last_requested_at: float = 0.0
+    task: asyncio.Task[None] | None = None
+
+
+class RefreshScheduler:
+    """
+    Coalesces board refresh requests per guild.
+
+    A request marks the board dirty and returns immediately. The board is rendered once the requests have
+    been quiet for ``delay`` seconds (trailing edge), but never later than ``max_latency`` seconds after the
+    first request of the burst, so a steady stream of signups still shows up on the board.
+    """
+
+    def __init__(self, render: BoardRenderer, *, delay: float, max_latency: float, name: str = "board"):
+        self.render = render
+        self.delay = delay
+        self.max_latency = max(max_latency, delay)
+        self.name = name
+        self._pending: dict[int, _PendingRefresh] = {}
+
+    def request(self, guild: discord.Guild) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending = self._pending.get(guild.id)
+        if pending is None or pending.loop is not loop:
+            pending = _PendingRefresh(loop=loop, guild=guild)
+            self._pending[guild.id] = pending
+
+        pending.guild = guild
+        pending.last_requested_at = now
+        if pending.first_requested_at is None:
+            pending.first_requested_at = now
+        metrics.increment(f"{self.name}.refresh_requested")
+
+        if pending.task is None or pending.task.done():
+            pending.task = loop.create_task(self._run(pending), name=f"{self.name}-refresh-{guild.id}")
+
+    async def _run(self, pending: _PendingRefresh) -> None:
+        while pending.first_requested_at is not None:
+            deadline = min(pending.last_requested_at + self.delay, pending.first_requested_at + self.max_latency)
+            wait = deadline - pending.loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            # requests that land while rendering start a new window and are picked up by the loop
+            pending.first_requested_at = None
+            await self._render(pending)
+
+    async def _render(self, pending: _PendingRefresh) -> None:
+        try:
+            await self.render(pending.guild)
+        except Exception:
+            log.exception(f"[{self.name}] Refreshing board for guild {pending.guild.id} failed.")
+        else:
+            metrics.increment(f"{self.name}.refresh_rendered")
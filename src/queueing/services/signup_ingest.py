@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import disnake as discord
+
+from common.metrics import MetricsRegistry, metrics
+from queueing.contracts import SignupResult
+from queueing.models import Player, Queue
+from queueing.services.queue_actor import QueueActorPool
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PendingSignup:
+    member: discord.Member
+    player: Player
+    signup_text: str | None = None
+    should_delete_duplicate_source: bool = False
+
+
+@dataclass(slots=True)
+class _SignupBatch:
+    results: list[SignupResult | Exception]
+
+    @property
+    def queue_updated(self) -> bool:
+        return any(isinstance(result, SignupResult) and result.queue_updated for result in self.results)
+
+
+@dataclass(slots=True)
+class _SignupBuffer:
+    loop: asyncio.AbstractEventLoop
+    guild: discord.Guild
+    items: list[tuple[PendingSignup, asyncio.Future[SignupResult]]] = field(default_factory=list)
+    task: asyncio.Task[None] | None = None
+
+
+SignupApplier = Callable[[Queue, PendingSignup], SignupResult]
+SignupSettler = Callable[[Queue, PendingSignup, SignupResult], SignupResult]
+SignupsApplied = Callable[[list[tuple[PendingSignup, SignupResult]]], Awaitable[None]]
+
+
+class SignupIngestor:
+    """
+    Buffers signups for a short window and applies them to the queue in one actor command.
+
+    Signups are applied in arrival order, so group numbers are exactly what one-at-a-time processing would
+    have produced, but the whole batch costs one save, one board refresh request and one ``on_applied`` call.
+    """
+
+    def __init__(
+        self,
+        actors: QueueActorPool,
+        *,
+        apply: SignupApplier,
+        on_applied: SignupsApplied,
+        window: float,
+        settle: SignupSettler | None = None,
+        registry: MetricsRegistry = metrics,
+    ):
+        self.actors = actors
+        self.apply = apply
+        self.settle = settle
+        self.on_applied = on_applied
+        self.window = window
+        self.registry = registry
+        self._buffers: dict[int, _SignupBuffer] = {}
+
+    async def submit(self, guild: discord.Guild, signup: PendingSignup) -> SignupResult:
+        loop = asyncio.get_running_loop()
+        buffer = self._buffers.get(guild.id)
+        if buffer is None or buffer.loop is not loop:
+            buffer = _SignupBuffer(loop=loop, guild=guild)
+            self._buffers[guild.id] = buffer
+
+        future: asyncio.Future[SignupResult] = loop.create_future()
+        buffer.guild = guild
+        buffer.items.append((signup, future))
+        if buffer.task is None or buffer.task.done():
+            buffer.task = loop.create_task(self._drain(buffer), name=f"signup-ingest-{guild.id}")
+        return await future
+
+    async def _drain(self, buffer: _SignupBuffer) -> None:
+        while buffer.items:
+            await asyncio.sleep(self.window)
+            items, buffer.items = buffer.items, []
+            await self._apply_batch(buffer.guild, items)
+
+    async def _apply_batch(
+        self,
+        guild: discord.Guild,
+        items: list[tuple[PendingSignup, asyncio.Future[SignupResult]]],
+    ) -> None:
+        def apply_all(queue: Queue) -> _SignupBatch:
+            results: list[SignupResult | Exception] = []
+            for signup, _ in items:
+                try:
+                    results.append(self.apply(queue, signup))
+                except Exception as e:
+                    results.append(e)
+            return _SignupBatch(results)
+
+        def settle_all(queue: Queue, batch: _SignupBatch) -> _SignupBatch:
+            if self.settle is not None:
+                batch.results = [
+                    self.settle(queue, signup, result) if isinstance(result, SignupResult) else result
+                    for (signup, _), result in zip(items, batch.results, strict=True)
+                ]
+            return batch
+
+        started = time.perf_counter()
+        try:
+            batch = await self.actors.submit(guild, apply_all, settle=settle_all)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.registry.observe("signup.batch_size", len(items))
+        self.registry.observe("signup.commit_latency", time.perf_counter() - started)
+
+        for (_, future), result in zip(items, batch.results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        # callers are released before the analytics writes, which only need to land eventually
+        applied = [
+            (signup, result)
+            for (signup, _), result in zip(items, batch.results, strict=True)
+            if isinstance(result, SignupResult) and result.success
+        ]
+        if applied:
+            try:
+                await self.on_applied(applied)
+            except Exception:
+                log.exception("[SignupIngest] Recording signup analytics failed.")
@@ -10,6 +10,7 @@
 from queueing.contracts import AssignResult, LeaveResult, QueueRefreshResult, QueueViewState, SignupResult
 from queueing.repositories import AnalyticsRepository, GateRepository, ReadyQueueEntry, StrikeQueueRepository
 from queueing.services.presentation import QueuePresentationService
+from queueing.services.refresh import RefreshScheduler
 
 
 class StrikeQueueService:
@@ -31,6 +32,15 @@ def __init__(
         self.analytics_repository = analytics_repository
         self.presentation_service = presentation_service
         self.view_factory = view_factory
+        self.board_refresh = RefreshScheduler(
+            lambda guild: self.refresh_queue_message(guild=guild),
+            delay=config.board_refresh_delay,
+            max_latency=config.board_refresh_max_latency,
+            name="strike_queue",
+        )
+
+    def request_refresh(self, guild: discord.Guild) -> None:
+        self.board_refresh.request(guild)
 
     async def signup_from_message(
         self,
@@ -43,7 +53,7 @@ async def signup_from_message(
             text=text,
             message_id=message.id,
         )
-        await self.refresh_queue_message(guild=require_message_guild(message))
+        self.request_refresh(require_message_guild(message))
         return SignupResult(success=True, message="Signed up for strike queue.", queue_updated=True)
 
     async def update_member(
@@ -54,7 +64,7 @@ async def update_member(
         text: str,
     ) -> SignupResult:
         await self.strike_queue_repository.update_text(member_id=member_id, text=text)
-        await self.refresh_queue_message(guild=guild)
+        self.request_refresh(guild)
         return SignupResult(success=True, message="Strike queue entry updated.", queue_updated=True)
 
     async def leave_member(
@@ -67,7 +77,7 @@ async def leave_member(
         if not removed:
             return LeaveResult(success=False, message="You were not in the Strike queue, or an error occurred.")
 
-        await self.refresh_queue_message(guild=guild)
+        self.request_refresh(guild)
         return LeaveResult(success=True, message="You have left the Strike queue.", queue_updated=True)
 
     async def assign_strike_team(
@@ -137,7 +147,7 @@ async def assign_strike_team(
                 )
 
         await self.strike_queue_repository.remove_members([item.member_id for item in selected_entries])
-        await self.refresh_queue_message(guild=guild)
+        self.request_refresh(guild)
 
         return AssignResult(
             success=True,
@@ -154,6 +164,7 @@ async def refresh_queue_message(
         self,
         *,
         guild: discord.Guild,
+        bump: bool = False,
     ) -> QueueRefreshResult:
         entries = await self.strike_queue_repository.list_entries()
         channel = require_text_channel(guild, self.config.strike_queue_channel_id, name="Strike queue")
@@ -165,4 +176,5 @@ async def refresh_queue_message(
             embed_title_prefix="Strike Team Queue",
             embed=embed,
             view=self.view_factory(),
+            bump=bump,
         )
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import disnake as discord
+
+from common.metrics import MetricsRegistry, metrics
+from queueing.models import Queue
+from queueing.repositories import QueueStateStore
+
+
+@dataclass(slots=True)
+class UnitOfWorkCounters:
+    commits: int = 0
+    flushes: int = 0
+    skipped: int = 0
+
+
+def normalize_queue(queue: Queue) -> None:
+    queue.groups = [group for group in queue.groups if group.players]
+    queue.groups.sort(key=lambda group: group.tier)
+
+
+class QueueUnitOfWork:
+    """
+    Collects the changes made to one queue and writes them exactly once.
+
+    Mutations call ``mark_dirty``; ``commit`` then drops empty groups, orders groups by tier and saves, or
+    does nothing at all if no mutation changed the queue.
+    """
+
+    def __init__(
+        self,
+        store: QueueStateStore,
+        *,
+        counters: UnitOfWorkCounters | None = None,
+        registry: MetricsRegistry = metrics,
+    ):
+        self.store = store
+        self.counters = counters or UnitOfWorkCounters()
+        self.registry = registry
+        self.queue: Queue | None = None
+        self.dirty = False
+
+    async def begin(self, guild: discord.Guild, *, channel_id: int | None = None) -> Queue:
+        self.queue = await self.store.load_for_guild(guild, channel_id=channel_id)
+        self.dirty = False
+        return self.queue
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    async def commit(self) -> bool:
+        if self.queue is None:
+            raise RuntimeError("Unit of work was committed before it began.")
+
+        self.counters.commits += 1
+        if not self.dirty:
+            self.counters.skipped += 1
+            return False
+
+        normalize_queue(self.queue)
+        await self.store.save(self.queue)
+        self.dirty = False
+        self.counters.flushes += 1
+        self.registry.increment("queue.flushes")
+        return True
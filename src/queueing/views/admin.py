@@ -7,10 +7,11 @@
 
 import disnake as discord
 
-from common.discord_utils import require_interaction_guild, require_text_channel
+from common.discord_utils import observe_first_response, require_interaction_guild, require_text_channel
 from common.embeds import create_default_embed
+from queueing.members import resolve_members
 from queueing.repositories import ReadyQueueEntry
-from queueing.services import get_queue_services
+from queueing.services import get_queue_services, group_member_mentions
 
 log = logging.getLogger(__name__)
 
@@ -23,12 +24,12 @@ def __init__(self, bot, queue):
         self.services = get_queue_services(bot)
         self.player_service = self.services.player_queue_service
         self.dm_service = self.services.dm_queue_service
-        self.queue_repo = self.services.queue_repository
+        self.queue_store = self.services.queue_store
         self.presentation = self.services.presentation_service
         self.config = self.services.config
 
     async def queue_from_guild(self, guild: discord.Guild):
-        return await self.queue_repo.load_for_guild(
+        return await self.queue_store.load_for_guild(
             guild,
             queue_type=self.queue_type,
             channel_id=self.config.player_queue_channel_id,
@@ -43,6 +44,7 @@ async def refresh_menu(self, interaction, kill=False):
             await interaction.edit_original_message(content=None, view=self, embed=embed)
         else:
             await interaction.response.edit_message(content=None, view=self, embed=embed)
+            observe_first_response(interaction, name="queue_manager.menu")
 
     async def move_to_view(self, interaction, new_view):
         embed = await new_view.generate_menu(interaction)
@@ -51,6 +53,7 @@ async def move_to_view(self, interaction, new_view):
             await interaction.edit_original_message(view=new_view, embed=embed)
         else:
             await interaction.response.edit_message(view=new_view, embed=embed)
+            observe_first_response(interaction, name="queue_manager.navigate")
 
     async def custom_refresh(self, interaction):
         raise NotImplementedError()
@@ -105,6 +108,7 @@ async def queue_refresh(self, button, inter: discord.MessageInteraction):
         del button
         await self.player_service.refresh_queue_message(
             guild=require_interaction_guild(inter),
+            bump=True,
         )
         await self.refresh_menu(inter)
 
@@ -112,6 +116,7 @@ async def queue_refresh(self, button, inter: discord.MessageInteraction):
     async def toggle_queue_lock(self, button, inter: discord.MessageInteraction):
         del button
         await inter.response.defer()
+        observe_first_response(inter, name="queue_manager.toggle_lock")
 
         guild = cast(discord.Guild, inter.guild)
         actor = cast(discord.Member, inter.author)
@@ -156,6 +161,7 @@ async def toggle_queue_lock(self, button, inter: discord.MessageInteraction):
     async def shuffle_button(self, button, inter: discord.MessageInteraction):
         del button
         await inter.response.defer()
+        observe_first_response(inter, name="queue_manager.shuffle")
 
         tier_choice = await self.prompt_message(
             inter,
@@ -209,18 +215,12 @@ async def callback(self, inter: discord.MessageInteraction):
             return await self.parent_view.refresh_menu(inter)
 
         selection = int(self.values[0].split(".")[0]) - 1
-        entries = await self.parent_view.services.dm_queue_repository.list_entries()
-
-        dm_data = []
-        for entry in entries:
-            guild = require_interaction_guild(inter)
-            member = guild.get_member(entry.member_id)
-            if member is None:
-                with contextlib.suppress(discord.NotFound, discord.Forbidden):
-                    member = await guild.fetch_member(entry.member_id)
-            if member is None:
-                continue
-            dm_data.append((member, entry))
+        services = self.parent_view.services
+        entries = await services.dm_queue_repository.list_entries()
+        members = await services.member_resolver.resolve(
+            require_interaction_guild(inter), (entry.member_id for entry in entries)
+        )
+        dm_data = [(members[entry.member_id], entry) for entry in entries if entry.member_id in members]
 
         group_ui = GroupManagerUI(
             self.bot,
@@ -256,19 +256,12 @@ async def generate_menu(self, interaction) -> discord.Embed:
         embed.description = (
             f"**Rank:** {self.group.tier_str.replace('_', '')}\n**Status:** {locked_emoji}\n**Assigned:** {assigned}\n"
         )
-        embed.add_field("Members", await self._group_members_field(self.group))
-        embed.add_field("Characters", self.group.player_levels_str, inline=False)
+        marks = await self.services.analytics_repository.get_marks(p.member_id for p in self.group.players)
+        embed.add_field("Members", group_member_mentions(self.group, marks))
+        members = resolve_members(require_interaction_guild(interaction), (p.member_id for p in self.group.players))
+        embed.add_field("Characters", self.group.player_levels_str(members), inline=False)
         return embed
 
-    async def _group_members_field(self, group):
-        names: list[str] = []
-        mark_db = self.bot.mdb["player_marked"]
-        for player in group.players:
-            mark_info = await mark_db.find_one({"_id": player.member.id}) or {}
-            postfix = f"{'*' if mark_info.get('marked', False) else ''}{mark_info.get('custom', '')}"
-            names.append(f"{player.mention}{postfix}")
-        return discord.utils.escape_markdown(", ".join(names))
-
     @discord.ui.button(label="↩ Back", style=discord.ButtonStyle.red)
     async def back_button(self, button, inter):
         del button
@@ -278,6 +271,7 @@ async def back_button(self, button, inter):
     async def lock_group_button(self, button, inter):
         del button
         await inter.response.defer()
+        observe_first_response(inter, name="queue_manager.group_lock")
         result = await self.player_service.toggle_group_lock(
             guild=require_interaction_guild(inter),
             group_number=self.group_num + 1,
@@ -296,9 +290,11 @@ async def lock_group_button(self, button, inter):
     async def assign_button(self, button, inter: discord.MessageInteraction):
         del button
         if self.dm_selector.selected is None:
-            return await inter.send("No DM selected, cannot assign", ephemeral=True)
+            await inter.send("No DM selected, cannot assign", ephemeral=True)
+            return observe_first_response(inter, name="queue_manager.assign")
 
         await inter.response.defer()
+        observe_first_response(inter, name="queue_manager.assign")
         who = self.dm_selector.selected
 
         result = await self.dm_service.assign_dm_to_group(
@@ -340,7 +336,8 @@ def __init__(self, bot, queue, dm_queue_data):
     async def callback(self, inter: discord.MessageInteraction):
         selected_dm_name = self.values[0]
         if selected_dm_name == "No DMs in Queue.":
-            return await inter.send("I can't do anything!", ephemeral=True)
+            await inter.send("I can't do anything!", ephemeral=True)
+            return observe_first_response(inter, name="queue_manager.select_dm")
         selected_dm_name = selected_dm_name.split(":")[0]
 
         selected_dm = [
@@ -350,11 +347,12 @@ async def callback(self, inter: discord.MessageInteraction):
         ][0]
         self.selected = selected_dm
 
-        return await inter.send(
+        await inter.send(
             f"{selected_dm.mention} selected. Click Assign to confirm.",
             ephemeral=True,
             delete_after=15,
         )
+        return observe_first_response(inter, name="queue_manager.select_dm")
 
 
 __all__ = ["PlayerQueueManageUI"]
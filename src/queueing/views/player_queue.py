@@ -5,7 +5,7 @@
 
 import disnake as discord
 
-from common.discord_utils import require_interaction_guild
+from common.discord_utils import observe_first_response, require_interaction_guild
 from queueing.services import get_queue_services
 from queueing.views.admin import PlayerQueueManageUI
 
@@ -47,7 +47,8 @@ async def callback(self, inter: discord.ModalInteraction):
             text=text,
         )
 
-        return await inter.send(result.message, ephemeral=True)
+        await inter.send(result.message, ephemeral=True)
+        return observe_first_response(inter)
 
 
 class PlayerQueueUI(discord.ui.View):
@@ -56,7 +57,7 @@ def __init__(self, bot, *, queue_locked: bool = False):
         self.bot = bot
         self.services = get_queue_services(bot)
         self.player_service = self.services.player_queue_service
-        self.queue_repo = self.services.queue_repository
+        self.queue_store = self.services.queue_store
         self._set_join_button_disabled(queue_locked)
 
     def _set_join_button_disabled(self, disabled: bool) -> None:
@@ -66,7 +67,7 @@ def _set_join_button_disabled(self, disabled: bool) -> None:
                 return
 
     async def queue_from_guild(self, guild: discord.Guild):
-        return await self.queue_repo.load_for_guild(
+        return await self.queue_store.load_for_guild(
             guild,
             channel_id=self.services.config.player_queue_channel_id,
         )
@@ -77,13 +78,17 @@ async def queue_from_guild(self, guild: discord.Guild):
         custom_id=JOIN_BUTTON_CUSTOM_ID,
     )
     async def join_button(self, _: discord.ui.Button, inter: discord.MessageInteraction):
+        # the modal has to open within Discord's deadline, so both reads are served from memory once warmed
         member = cast(discord.Member, inter.author)
-        queue = await self.queue_from_guild(require_interaction_guild(inter))
+        guild = require_interaction_guild(inter)
+        queue = self.queue_store.peek(guild.id) or await self.queue_from_guild(guild)
         if queue.locked:
-            return await inter.send("The queue is currently locked.", ephemeral=True)
+            await inter.send("The queue is currently locked.", ephemeral=True)
+            return observe_first_response(inter)
 
         default_text = await self.services.analytics_repository.get_last_player_signup_text(member.id)
-        return await inter.response.send_modal(PlayerQueueJoinModal(self.bot, default_text=default_text))
+        await inter.response.send_modal(PlayerQueueJoinModal(self.bot, default_text=default_text))
+        return observe_first_response(inter)
 
     @discord.ui.button(
         label="Leave",
@@ -99,7 +104,8 @@ async def leave_button(self, _: discord.ui.Button, inter: discord.MessageInterac
             clear_marked=True,
         )
 
-        return await inter.send(result.message, ephemeral=True)
+        await inter.send(result.message, ephemeral=True)
+        return observe_first_response(inter)
 
     @discord.ui.button(
         emoji="⚙",
@@ -112,14 +118,16 @@ async def manage_button(self, _, inter: discord.MessageInteraction):
         queue = await self.queue_from_guild(require_interaction_guild(inter))
 
         if not (member.id == self.bot.owner_id or any(role.name == "Assistant" for role in member.roles)):
-            return await inter.send(
+            await inter.send(
                 "You are not allowed to use this function.",
                 ephemeral=True,
             )
+            return observe_first_response(inter)
 
         view = PlayerQueueManageUI(self.bot, queue)
         embed = await view.generate_menu(inter)
-        return await inter.send(embed=embed, view=view, ephemeral=True)
+        await inter.send(embed=embed, view=view, ephemeral=True)
+        return observe_first_response(inter)
 
     @discord.ui.button(
         label="Claim",
@@ -129,12 +137,14 @@ async def manage_button(self, _, inter: discord.MessageInteraction):
     async def claim_button(self, _, inter: discord.MessageInteraction):
         member = cast(discord.Member, inter.author)
         if not (member.id == self.bot.owner_id or any(role.name == "DM" for role in member.roles)):
-            return await inter.send(
+            await inter.send(
                 "You are not allowed to use this function.",
                 ephemeral=True,
             )
+            return observe_first_response(inter)
 
         await inter.response.defer()
+        observe_first_response(inter)
 
         result = await self.player_service.claim_group(
             guild=require_interaction_guild(inter),
@@ -2,7 +2,7 @@
 
 import disnake as discord
 
-from common.discord_utils import require_interaction_guild
+from common.discord_utils import observe_first_response, require_interaction_guild
 from queueing.services import get_queue_services
 
 
@@ -25,7 +25,8 @@ async def leave_button(self, button: discord.ui.Button, inter: discord.MessageIn
             member_id=inter.author.id,
         )
 
-        return await inter.send(result.message, ephemeral=True)
+        await inter.send(result.message, ephemeral=True)
+        return observe_first_response(inter)
 
 
 __all__ = ["StrikeQueueUI"]
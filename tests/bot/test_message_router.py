@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+
+from bot.message_router import MessageRouter
+from common.metrics import MetricsRegistry
+from tests.helpers.fakes import FakeChannel, FakeGuild, FakeMessage
+
+
+def make_message(channel_id: int, *, name: str = "general", guild_id: int = 1) -> FakeMessage:
+    guild = FakeGuild(guild_id)
+    channel = FakeChannel(channel_id, guild=guild)
+    channel.name = name  # pyright: ignore[reportAttributeAccessIssue]
+    return FakeMessage(channel_id * 10, guild=guild, channel=channel)
+
+
+def make_router() -> tuple[MessageRouter, MetricsRegistry, list[tuple[str, int]]]:
+    registry = MetricsRegistry()
+    router = MessageRouter(registry=registry)
+    seen: list[tuple[str, int]] = []
+
+    def handler(name: str):
+        async def handle(message) -> None:
+            seen.append((name, message.channel.id))
+
+        return handle
+
+    router.add_channel_route(5, "queue", handler("queue"))
+    router.add_suffix_route("-ic", "placeholders", handler("placeholders"), guild_id=1)
+    return router, registry, seen
+
+
+def test_messages_reach_only_the_handlers_for_their_channel() -> None:
+    router, registry, seen = make_router()
+
+    async def run_test() -> None:
+        router.dispatch(make_message(5))
+        router.dispatch(make_message(6, name="alpha-IC"))
+        router.dispatch(make_message(7, name="alpha-ic", guild_id=2))
+        router.dispatch(make_message(8, name="ic-chatter"))
+        await router.drain()
+
+    asyncio.run(run_test())
+
+    assert seen == [("queue", 5), ("placeholders", 6)]
+    assert registry.counters["router.dropped"] == 2
+    assert registry.observations["router.queue"].count == 1
+
+
+def test_resolved_routes_are_cached_until_the_channel_is_forgotten() -> None:
+    router, _, _ = make_router()
+    message = make_message(6, name="general")
+
+    assert router.routes_for(message) == ()
+    message.channel.name = "alpha-ic"  # pyright: ignore[reportAttributeAccessIssue]
+    assert router.routes_for(message) == ()
+
+    router.forget_channel(6)
+    assert [route.name for route in router.routes_for(message)] == ["placeholders"]
+
+
+def test_failing_handler_is_counted_and_removed_routes_stop_receiving() -> None:
+    router, registry, seen = make_router()
+
+    async def broken(message) -> None:
+        raise RuntimeError("boom")
+
+    router.add_channel_route(5, "broken", broken)
+
+    async def run_test() -> None:
+        router.dispatch(make_message(5))
+        await router.drain()
+        router.remove_route("queue")
+        router.dispatch(make_message(5))
+        await router.drain()
+
+    asyncio.run(run_test())
+
+    assert seen == [("queue", 5)]
+    assert registry.counters["router.broken.failed"] == 2
+
+
+def test_slow_handler_does_not_hold_up_the_next_message() -> None:
+    router, _, seen = make_router()
+    release = asyncio.Event()
+
+    async def slow(message) -> None:
+        await release.wait()
+        seen.append(("slow", message.channel.id))
+
+    router.add_channel_route(9, "slow", slow)
+
+    async def run_test() -> None:
+        router.dispatch(make_message(9))
+        router.dispatch(make_message(5))
+        await asyncio.sleep(0)
+        assert seen == [("queue", 5)]
+        release.set()
+        await router.drain()
+
+    asyncio.run(run_test())
+
+    assert seen == [("queue", 5), ("slow", 9)]
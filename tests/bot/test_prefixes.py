@@ -2,17 +2,19 @@
 
 import asyncio
 from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock
 
-from bot.prefixes import get_prefix
+from bot.prefixes import PrefixMatcher, get_prefix
+from common.metrics import MetricsRegistry
 from common.settings import settings
-from tests.helpers.fakes import FakeGuild
+from tests.helpers.fakes import FakeCollection, FakeGuild
 
 
 class FakeClient:
     def __init__(self):
         self.prefixes: dict[str, str] = {}
-        self.mdb = {"prefixes": AsyncMock()}
+        self.mdb: dict[str, Any] = {"prefixes": AsyncMock()}
         self.user = SimpleNamespace(id=999)
 
 
@@ -47,3 +49,33 @@ def test_prefix_uses_default_for_direct_messages() -> None:
 
     assert settings.prefix in result
     client.mdb["prefixes"].find_one.assert_not_awaited()
+
+
+def test_matcher_short_circuits_chat_and_counts_parsed_messages() -> None:
+    client = FakeClient()
+    client.prefixes["123"] = "?"
+    registry = MetricsRegistry()
+    matcher = PrefixMatcher(client, registry=registry)  # pyright: ignore[reportArgumentType]
+    guild = FakeGuild(123)
+
+    assert not matcher.could_be_command(SimpleNamespace(guild=guild, content="hello there"))
+    assert matcher.could_be_command(SimpleNamespace(guild=guild, content="?help"))
+    assert matcher.could_be_command(SimpleNamespace(guild=guild, content="<@999> help"))
+    # unknown guilds take the full get_prefix path
+    assert matcher.could_be_command(SimpleNamespace(guild=FakeGuild(456), content="hello"))
+
+    assert registry.counters["commands.short_circuited"] == 1
+    assert registry.counters["commands.parsed"] == 3
+
+
+def test_matcher_warms_all_guilds_in_one_query_and_follows_prefix_changes() -> None:
+    client = FakeClient()
+    client.mdb["prefixes"] = FakeCollection([{"guild_id": "1", "prefix": "!"}])
+    matcher = PrefixMatcher(client, registry=MetricsRegistry())  # pyright: ignore[reportArgumentType]
+
+    asyncio.run(matcher.warm(["1", "2"]))
+
+    assert client.prefixes == {"1": "!", "2": settings.prefix}
+    assert matcher.candidates("1") == ("<@999> ", "<@!999> ", "!")
+    matcher.set_prefix("1", "$")
+    assert matcher.candidates("1") == ("<@999> ", "<@!999> ", "$")
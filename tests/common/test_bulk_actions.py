@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+
+import disnake as discord
+
+from common.bulk_actions import BulkMemberExecutor, MemberOutcome
+from common.metrics import MetricsRegistry
+from tests.helpers.fakes import FakeCollection, FakeMember
+
+
+class FakeResponse:
+    status = 429
+    reason = "Too Many Requests"
+
+
+class RateLimited(discord.HTTPException):
+    def __init__(self):
+        super().__init__(FakeResponse(), "rate limited")  # pyright: ignore[reportArgumentType]
+        self.retry_after = 0
+
+
+def make_executor(progress: FakeCollection, **kwargs) -> tuple[BulkMemberExecutor, MetricsRegistry]:
+    registry = MetricsRegistry()
+    kwargs.setdefault("interval", 0)
+    return BulkMemberExecutor(progress, registry=registry, **kwargs), registry  # pyright: ignore[reportArgumentType]
+
+
+def test_runs_at_most_concurrency_actions_and_reports_in_batches() -> None:
+    progress = FakeCollection()
+    executor, registry = make_executor(progress, concurrency=2, batch_size=2)
+    members = [FakeMember(i) for i in range(5)]
+    running = peak = 0
+    batches: list[list[MemberOutcome]] = []
+
+    async def action(member) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+        if member.id == 3:
+            raise RuntimeError("boom")
+        return "done"
+
+    async def on_progress(batch: list[MemberOutcome]) -> None:
+        batches.append(batch)
+
+    report = asyncio.run(executor.run("sweep", members, action, on_progress=on_progress))  # pyright: ignore[reportArgumentType]
+
+    assert peak == 2
+    assert sorted(report.succeeded) == [0, 1, 2, 4]
+    assert report.failed == [3]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert registry.counters["bulk.succeeded"] == 4
+    assert sorted(progress.docs[0]["done"]) == [0, 1, 2, 4]
+    assert progress.docs[0]["failed"] == [3]
+    assert progress.docs[0]["finished"] is True
+    assert "updated_at" in progress.docs[0]
+
+
+def test_rerun_skips_members_already_handled() -> None:
+    progress = FakeCollection([{"_id": "sweep", "done": [0, 1]}])
+    executor, _ = make_executor(progress)
+    seen: list[int] = []
+
+    async def action(member) -> str:
+        seen.append(member.id)
+        return "done"
+
+    report = asyncio.run(executor.run("sweep", [FakeMember(i) for i in range(3)], action))  # pyright: ignore[reportArgumentType]
+
+    assert seen == [2]
+    assert report.skipped == 2
+
+
+def test_rerun_retries_members_that_failed() -> None:
+    progress = FakeCollection()
+    executor, _ = make_executor(progress)
+    members = [FakeMember(i) for i in range(3)]
+    seen: list[int] = []
+    broken = {1}
+
+    async def action(member) -> str:
+        seen.append(member.id)
+        if member.id in broken:
+            raise RuntimeError("boom")
+        return "done"
+
+    asyncio.run(executor.run("sweep", members, action))  # pyright: ignore[reportArgumentType]
+    broken.clear()
+    seen.clear()
+    report = asyncio.run(executor.run("sweep", members, action))  # pyright: ignore[reportArgumentType]
+
+    assert seen == [1]
+    assert report.succeeded == [1]
+    assert sorted(progress.docs[0]["done"]) == [0, 1, 2]
+
+
+def test_run_documents_expire() -> None:
+    [spec] = BulkMemberExecutor.INDEXES
+
+    assert spec.collection == "bulk_action_runs"
+    assert spec.to_model().document["expireAfterSeconds"] > 0
+
+
+def test_rate_limited_actions_are_retried() -> None:
+    executor, registry = make_executor(FakeCollection(), max_retries=2)
+    calls = 0
+
+    async def action(member) -> str:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise RateLimited()
+        return "done"
+
+    report = asyncio.run(executor.run("sweep", [FakeMember(1)], action))  # pyright: ignore[reportArgumentType]
+
+    assert report.succeeded == [1]
+    assert registry.counters["bulk.rate_limited"] == 2
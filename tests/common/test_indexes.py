@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+
+from pymongo.errors import OperationFailure
+
+from bot.bootstrap import build_index_registry
+from common.indexes import IndexRegistry, IndexSpec
+from tests.helpers.fakes import FakeCollection
+
+
+def test_spec_name_matches_mongo_default_naming() -> None:
+    spec = IndexSpec.on("dm_assign_analytics", "claimed", ("summonDate", -1))
+
+    assert spec.name == "claimed_1_summonDate_-1"
+    assert spec.to_model().document["key"] == {"claimed": 1, "summonDate": -1}
+    assert str(spec) == "dm_assign_analytics.claimed_1_summonDate_-1"
+
+
+def test_ensure_creates_missing_indexes_once() -> None:
+    db: defaultdict[str, FakeCollection] = defaultdict(FakeCollection)
+    registry = IndexRegistry([IndexSpec.on("gate_list", "name"), IndexSpec.on("gate_list", "owner", sparse=True)])
+
+    first = asyncio.run(registry.ensure(db))
+    second = asyncio.run(registry.ensure(db))
+
+    assert [spec.name for spec in first.created] == ["name_1", "owner_1"]
+    assert second.created == []
+    assert set(db["gate_list"].indexes) == {"_id_", "name_1", "owner_1"}
+
+
+def test_failed_creation_is_reported_without_stopping_other_collections() -> None:
+    class BrokenCollection(FakeCollection):
+        async def create_indexes(self, models):
+            raise OperationFailure("index build failed")
+
+    db: dict[str, FakeCollection] = {"gate_list": BrokenCollection(), "dm_queue": FakeCollection()}
+    registry = IndexRegistry([IndexSpec.on("gate_list", "name"), IndexSpec.on("dm_queue", "readyOn")])
+
+    report = asyncio.run(registry.ensure(db))
+
+    assert [str(spec) for spec in report.failed] == ["gate_list.name_1"]
+    assert [str(spec) for spec in report.created] == ["dm_queue.readyOn_1"]
+    assert not report.healthy
+
+
+def test_verify_reports_missing_and_unused_indexes() -> None:
+    db: defaultdict[str, FakeCollection] = defaultdict(FakeCollection)
+    db["gate_list"].indexes["name_1"] = {"key": [("name", 1)]}
+    db["gate_list"].indexes["legacy_1"] = {"key": [("legacy", 1)]}
+    db["gate_list"].index_ops["name_1"] = 12
+    registry = IndexRegistry([IndexSpec.on("gate_list", "name"), IndexSpec.on("gate_list", "owner")])
+
+    report = asyncio.run(registry.verify(db))
+
+    assert [str(spec) for spec in report.missing] == ["gate_list.owner_1"]
+    assert report.unused == ["gate_list.legacy_1"]
+
+
+def test_bootstrap_registry_covers_hot_lookups() -> None:
+    declared = {str(spec) for spec in build_index_registry().specs}
+
+    assert {
+        "gate_list.name_1",
+        "gate_list.owner_1",
+        "dm_queue.readyOn_1",
+        "strike_queue.readyOn_1",
+        "player_queue.guild_id_1_channel_id_1",
+        "player_queue.server_id_1_channel_id_1",
+        "prefixes.guild_id_1",
+        "placeholder_events.due_at_1",
+    } <= declared
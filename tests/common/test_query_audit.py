@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from bot.bootstrap import build_index_registry, build_query_catalogue
+from common.indexes import IndexSpec
+from common.query_audit import QueryShape, audit_queries, find_unindexed
+from queueing.repositories import QueueRepository
+
+
+class ExplainingDatabase:
+    def __init__(self, results: dict[str, dict[str, Any]]):
+        self.results = results
+        self.commands: list[dict[str, Any]] = []
+
+    async def command(self, command: dict[str, Any]) -> dict[str, Any]:
+        self.commands.append(command)
+        return self.results[command["explain"]["find"]]
+
+
+def test_audit_reports_plan_stages_and_execution_stats() -> None:
+    db = ExplainingDatabase(
+        {
+            "dm_queue": {
+                "queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}},
+                "executionStats": {"nReturned": 3, "totalDocsExamined": 40, "totalKeysExamined": 0},
+            },
+            "gate_list": {
+                "queryPlanner": {
+                    "winningPlan": {
+                        "queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+                    }
+                },
+                "executionStats": {"nReturned": 1, "totalDocsExamined": 1, "totalKeysExamined": 1},
+            },
+        }
+    )
+    shapes = [
+        QueryShape("ready", "dm_queue", sort=(("readyOn", 1),)),
+        QueryShape("gate", "gate_list", {"name": "alpha"}, limit=1),
+    ]
+
+    ready, gate = asyncio.run(audit_queries(db, shapes))
+
+    assert ready.collscan and ready.stages == ["SORT", "COLLSCAN"]
+    assert ready.docs_examined == 40 and ready.returned == 3
+    assert not gate.collscan and gate.stages == ["FETCH", "IXSCAN"]
+    assert db.commands[0] == {
+        "explain": {"find": "dm_queue", "filter": {}, "sort": {"readyOn": 1}},
+        "verbosity": "executionStats",
+    }
+    assert db.commands[1]["explain"]["limit"] == 1
+    assert "[COLLSCAN]" in str(ready)
+
+
+def test_every_or_branch_must_be_indexed() -> None:
+    shape = QueryShape("load", "player_queue", {"$or": [{"guild_id": 1}, {"server_id": 1}]})
+
+    assert find_unindexed([shape], [IndexSpec.on("player_queue", "guild_id")]) == [shape]
+    assert find_unindexed([shape], QueueRepository.INDEXES) == []
+
+
+def test_catalogued_queries_are_all_index_backed() -> None:
+    assert find_unindexed(build_query_catalogue(), build_index_registry().specs) == []
@@ -2,15 +2,18 @@
 
 from types import SimpleNamespace
 from typing import Any
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 from queueing.config import QueueRuntimeConfig
 from queueing.models import Group, Player, Queue
+from queueing.repositories.meta import QueueMetaRepository
 from queueing.repositories.ready_queue import ReadyQueueEntry
 from queueing.services.dm_queue import DMQueueService
 from queueing.services.player_queue import PlayerQueueService
+from queueing.services.queue_actor import QueueActorPool
 from queueing.services.strike_queue import StrikeQueueService
 from tests.helpers.fakes import (
+    FakeCollection,
     FakeMember,
     FakeRole,
     InMemoryGateRepository,
@@ -27,6 +30,9 @@ def make_member(member_id: int = 1, name: str = "Member", *, roles: list[FakeRol
     return FakeMember(member_id, name, roles=roles)
 
 
+_player_members: dict[int, FakeMember] = {}
+
+
 def make_player(
     member_id: int = 1,
     name: str = "Player",
@@ -34,13 +40,18 @@ def make_player(
     level: int = 5,
     roles: list[FakeRole] | None = None,
 ) -> Player:
-    return Player(
-        member=make_member(member_id, name, roles=roles),
-        _total_level=level,
-        _levels=[{"class": "Fighter", "subclass": "None", "level": level}],
+    _player_members[member_id] = make_member(member_id, name, roles=roles)
+    return Player.new(
+        member_id,
+        {"total_level": level, "classes": [{"class": "Fighter", "subclass": "None", "level": level}]},
     )
 
 
+def member_of(player: Player) -> FakeMember:
+    """The fake member that ``make_player`` created for ``player``."""
+    return _player_members[player.member_id]
+
+
 def make_group(*players: Player, tier: int | None = None, position: int | None = None, locked: bool = False) -> Group:
     resolved_tier = tier if tier is not None else (players[0].tier if players else 1)
     group = Group.new(resolved_tier, list(players), position=position)
@@ -57,21 +68,27 @@ def make_ready_entry(member_id: int = 1, text: str = "ready", message_id: int |
 
 
 def make_config(environment: str = "production") -> QueueRuntimeConfig:
-    return QueueRuntimeConfig.from_environment(environment)
+    config = QueueRuntimeConfig.from_environment(environment)
+    config.signup_batch_window = 0.0
+    return config
 
 
 def make_analytics(**overrides: Any) -> SimpleNamespace:
     defaults = {
         "record_player_signup": AsyncMock(),
+        "record_player_signups": AsyncMock(),
         "get_last_player_signup_text": AsyncMock(return_value=None),
         "decrement_player_signup": AsyncMock(),
         "set_marked": AsyncMock(),
+        "set_marked_many": AsyncMock(),
         "clear_marks_for_members": AsyncMock(),
         "mark_assignment_claimed": AsyncMock(),
         "record_dm_claim": AsyncMock(),
         "get_dm_info": AsyncMock(return_value={"dm_gates": [{"gate_name": "alpha"}]}),
         "record_gate_reinforcement": AsyncMock(),
         "record_player_gate_summon": AsyncMock(),
+        "record_player_gate_summons": AsyncMock(),
+        "record_latest_gate_reinforcement": AsyncMock(),
         "record_claimed_group": AsyncMock(),
         "set_unlock_timestamp": AsyncMock(),
         "record_dm_queue_signup": AsyncMock(),
@@ -114,14 +131,16 @@ def make_player_service(
     service = PlayerQueueService(
         bot=make_bot(),
         config=make_config("testing" if testing else "production"),
-        queue_repository=InMemoryQueueRepository(queue),
+        queue_store=InMemoryQueueRepository(queue),
         gate_repository=InMemoryGateRepository(gate),
         analytics_repository=analytics or make_analytics(),
+        meta_repository=QueueMetaRepository(FakeCollection()),  # pyright: ignore[reportArgumentType]
         presentation_service=presentation or make_presentation(),
         view_factory=object,
     )
     service.refresh_queue_message = AsyncMock()
-    return service, service.queue_repository, service.analytics_repository, service.presentation_service
+    service.request_refresh = Mock()
+    return service, service.queue_store, service.analytics_repository, service.presentation_service
 
 
 def make_dm_service(
@@ -131,20 +150,23 @@ def make_dm_service(
     analytics: SimpleNamespace | None = None,
     presentation: SimpleNamespace | None = None,
 ) -> tuple[DMQueueService, InMemoryReadyQueueRepository, InMemoryQueueRepository, SimpleNamespace, SimpleNamespace]:
+    queue_store = InMemoryQueueRepository(queue)
     service = DMQueueService(
         bot=make_bot(),
         config=make_config(),
         dm_queue_repository=InMemoryReadyQueueRepository(entries),
-        queue_repository=InMemoryQueueRepository(queue),
+        queue_store=queue_store,
+        queue_actors=QueueActorPool(queue_store),
         analytics_repository=analytics or make_analytics(),
         presentation_service=presentation or make_presentation(),
         view_factory=object,
     )
     service.refresh_queue_message = AsyncMock()
+    service.request_refresh = Mock()
     return (
         service,
         service.dm_queue_repository,
-        service.queue_repository,
+        service.queue_store,
         service.analytics_repository,
         service.presentation_service,
     )
@@ -167,6 +189,7 @@ def make_strike_service(
         view_factory=object,
     )
     service.refresh_queue_message = AsyncMock()
+    service.request_refresh = Mock()
     return (
         service,
         service.strike_queue_repository,
@@ -4,7 +4,10 @@
 from types import SimpleNamespace
 from typing import Any
 
+from pymongo import InsertOne, UpdateMany
+
 from queueing.models import Queue
+from queueing.repositories.queue import QueueVersionConflict
 from queueing.repositories.ready_queue import ReadyQueueEntry
 
 
@@ -73,10 +76,14 @@ def __init__(
         self.content = content
         self.embeds = embeds or []
         self.deleted = False
+        self.edits: list[dict[str, Any]] = []
 
     async def delete(self) -> None:
         self.deleted = True
 
+    async def edit(self, **kwargs: Any) -> None:
+        self.edits.append(kwargs)
+
 
 class FakeSentMessage(FakeMessage):
     pass
@@ -94,6 +101,7 @@ def __init__(
         self.id = channel_id
         self.guild = guild
         self.sent: list[dict[str, Any]] = []
+        self.sent_messages: list[FakeSentMessage] = []
         self.edits: list[dict[str, Any]] = []
         self.history_messages = history_messages or []
         self.fetched_messages = fetched_messages or {}
@@ -104,8 +112,13 @@ async def send(self, content: Any = None, **kwargs: Any) -> FakeSentMessage:
         self.sent.append(payload)
         message = FakeSentMessage(message_id=len(self.sent), author=FakeMember(999, "Bot"), guild=self.guild)
         message.embeds = [kwargs["embed"]] if "embed" in kwargs else []
+        self.sent_messages.append(message)
         return message
 
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        known = [*self.sent_messages, *self.history_messages, *self.fetched_messages.values()]
+        return next((message for message in known if message.id == message_id), FakeMessage(message_id))
+
     async def edit(self, **kwargs: Any) -> None:
         self.edits.append(kwargs)
 
@@ -163,6 +176,18 @@ async def to_list(self, length: int | None = None) -> list[dict[str, Any]]:
         return [dict(doc) for doc in self._docs[:length]]
 
 
+_COMPARISONS = {
+    "$gt": lambda left, right: left > right,
+    "$gte": lambda left, right: left >= right,
+    "$lt": lambda left, right: left < right,
+    "$lte": lambda left, right: left <= right,
+}
+
+
+def _compare(value: Any, op: str, bound: Any) -> bool:
+    return value is not None and _COMPARISONS[op](value, bound)
+
+
 def matches_query(doc: dict[str, Any], query: dict[str, Any] | None) -> bool:
     if not query:
         return True
@@ -180,6 +205,10 @@ def matches_query(doc: dict[str, Any], query: dict[str, Any] | None) -> bool:
                 if doc.get(key) not in value["$in"]:
                     return False
                 continue
+            if value.keys() & _COMPARISONS.keys():
+                if not all(_compare(doc.get(key), op, bound) for op, bound in value.items()):
+                    return False
+                continue
 
         if doc.get(key) != value:
             return False
@@ -203,6 +232,60 @@ def __init__(self, deleted_count: int):
         self.deleted_count = deleted_count
 
 
+class FakeUpdateResult:
+    def __init__(self, matched_count: int, upserted_id: Any = None):
+        self.matched_count = matched_count
+        self.upserted_id = upserted_id
+
+
+class FakeBulkWriteResult:
+    def __init__(self, matched_count: int):
+        self.matched_count = matched_count
+
+
+def _path_parent(doc: dict[str, Any], path: str) -> tuple[Any, str | int]:
+    parts = path.split(".")
+    target: Any = doc
+    for part in parts[:-1]:
+        target = target[int(part)] if isinstance(target, list) else target.setdefault(part, {})
+    last = parts[-1]
+    return target, int(last) if isinstance(target, list) else last
+
+
+def _matches_pull(item: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and isinstance(item, dict):
+        return matches_query(item, condition)
+    return item == condition
+
+
+def apply_update(doc: dict[str, Any], update: dict[str, Any]) -> None:
+    for path, value in update.get("$set", {}).items():
+        parent, key = _path_parent(doc, path)
+        parent[key] = value
+    for path in update.get("$unset", {}):
+        parent, key = _path_parent(doc, path)
+        if isinstance(parent, list):
+            parent[key] = None
+        else:
+            parent.pop(key, None)
+    for field in update.get("$currentDate", {}):
+        doc[field] = datetime.now(timezone.utc)
+    for path, amount in update.get("$inc", {}).items():
+        parent, key = _path_parent(doc, path)
+        parent[key] = parent.get(key, 0) + amount
+    for path, condition in update.get("$pull", {}).items():
+        parent, key = _path_parent(doc, path)
+        parent[key] = [item for item in parent.get(key, []) if not _matches_pull(item, condition)]
+    for path, value in update.get("$push", {}).items():
+        parent, key = _path_parent(doc, path)
+        items = parent.setdefault(key, [])
+        if isinstance(value, dict) and "$each" in value:
+            position = value.get("$position", len(items))
+            items[position:position] = value["$each"]
+        else:
+            items.append(value)
+
+
 class FakeCollection:
     def __init__(self, docs: list[dict[str, Any]] | None = None):
         self.docs = docs or []
@@ -211,6 +294,12 @@ def __init__(self, docs: list[dict[str, Any]] | None = None):
         self.delete_one_calls: list[dict[str, Any]] = []
         self.delete_many_calls: list[dict[str, Any]] = []
         self.insert_one_calls: list[dict[str, Any]] = []
+        self.find_one_and_update_calls: list[tuple[dict[str, Any], dict[str, Any], bool]] = []
+        self.bulk_write_calls: list[list[Any]] = []
+        self.bulk_write_ordered: list[bool] = []
+        self.indexes: dict[str, dict[str, Any]] = {"_id_": {"key": [("_id", 1)]}}
+        self.index_ops: dict[str, int] = {}
+        self._next_id = 1
 
     def find(self, query: dict[str, Any] | None = None, **kwargs: Any) -> FakeCursor:
         query = kwargs.get("filter", query)
@@ -226,20 +315,90 @@ async def find_one(self, query: dict[str, Any]) -> dict[str, Any] | None:
                 return dict(doc)
         return None
 
-    async def update_one(self, query: dict[str, Any], update: dict[str, Any], upsert: bool = False) -> None:
+    async def update_one(self, query: dict[str, Any], update: dict[str, Any], upsert: bool = False) -> FakeUpdateResult:
         self.update_one_calls.append((query, update, upsert))
         doc = next((item for item in self.docs if matches_query(item, query)), None)
+        upserted_id = None
         if doc is None:
             if not upsert:
-                return
+                return FakeUpdateResult(0)
             doc = _selector_fields(query)
             self.docs.append(doc)
+            upserted_id = doc.get("_id")
 
-        doc.update(update.get("$set", {}))
-        for field in update.get("$currentDate", {}):
-            doc[field] = datetime.now(timezone.utc)
-        for field, amount in update.get("$inc", {}).items():
-            doc[field] = doc.get(field, 0) + amount
+        apply_update(doc, update)
+        return FakeUpdateResult(0 if upserted_id is not None else 1, upserted_id)
+
+    async def find_one_and_update(
+        self,
+        query: dict[str, Any],
+        update: dict[str, Any],
+        *,
+        projection: dict[str, Any] | None = None,
+        upsert: bool = False,
+        return_document: bool = False,
+    ) -> dict[str, Any] | None:
+        self.find_one_and_update_calls.append((query, update, upsert))
+        doc = next((item for item in self.docs if matches_query(item, query)), None)
+        if doc is None:
+            if not upsert:
+                return None
+            doc = _selector_fields(query)
+            self.docs.append(doc)
+        if "_id" not in doc:
+            doc["_id"] = self._next_id
+            self._next_id += 1
+
+        before = dict(doc)
+        apply_update(doc, update)
+        result = doc if return_document else before
+        if projection is None:
+            return dict(result)
+        return {key: value for key, value in result.items() if key == "_id" or projection.get(key)}
+
+    async def bulk_write(self, requests: list[Any], ordered: bool = True) -> FakeBulkWriteResult:
+        self.bulk_write_calls.append(list(requests))
+        self.bulk_write_ordered.append(ordered)
+        matched = 0
+        for request in requests:
+            if isinstance(request, InsertOne):
+                doc = dict(request._doc)
+                if "_id" not in doc:
+                    doc["_id"] = self._next_id
+                    self._next_id += 1
+                self.docs.append(doc)
+                continue
+            if isinstance(request, UpdateMany):
+                for doc in self.docs:
+                    if matches_query(doc, request._filter):
+                        matched += 1
+                        apply_update(doc, request._doc)
+                continue
+            doc = next((item for item in self.docs if matches_query(item, request._filter)), None)
+            if doc is None:
+                if not request._upsert:
+                    continue
+                doc = _selector_fields(request._filter)
+                self.docs.append(doc)
+            else:
+                matched += 1
+            apply_update(doc, request._doc)
+        return FakeBulkWriteResult(matched)
+
+    async def index_information(self) -> dict[str, dict[str, Any]]:
+        return {name: dict(info) for name, info in self.indexes.items()}
+
+    async def create_indexes(self, models: list[Any]) -> list[str]:
+        names = []
+        for model in models:
+            document = model.document
+            self.indexes[document["name"]] = {"key": list(document["key"].items())}
+            names.append(document["name"])
+        return names
+
+    async def aggregate(self, pipeline: list[dict[str, Any]]) -> FakeCursor:
+        assert pipeline == [{"$indexStats": {}}]
+        return FakeCursor([{"name": name, "accesses": {"ops": self.index_ops.get(name, 0)}} for name in self.indexes])
 
     async def update_many(self, query: dict[str, Any], update: dict[str, Any]) -> None:
         self.update_many_calls.append((query, update))
@@ -279,6 +438,20 @@ async def save(self, queue: Queue) -> None:
         self.saved.append(queue)
 
 
+class ContendedQueueRepository(InMemoryQueueRepository):
+    """Fails the first save with a version conflict and serves ``fresh`` to the reload, as a concurrent writer would."""
+
+    def __init__(self, queue: Queue, fresh: Queue):
+        super().__init__(queue)
+        self.fresh: Queue | None = fresh
+
+    async def save(self, queue: Queue) -> None:
+        if self.fresh is not None:
+            self.queue, self.fresh = self.fresh, None
+            raise QueueVersionConflict("queue moved on")
+        await super().save(queue)
+
+
 class InMemoryReadyQueueRepository:
     def __init__(self, entries: list[ReadyQueueEntry] | None = None):
         self.entries = entries or []
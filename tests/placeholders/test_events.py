@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from placeholders import PlaceholderEvent, has_placeholder_marker
+
+
+def test_marker_check_is_case_insensitive() -> None:
+    assert has_placeholder_marker("Walks in. *PH*")
+    assert has_placeholder_marker("_placeholder_")
+    assert not has_placeholder_marker("Walks in and sits down.")
+
+
+def test_jump_url_is_built_from_ids() -> None:
+    event = PlaceholderEvent(
+        author_id=1, guild_id=2, channel_id=3, message_id=4, message_date=datetime(2026, 1, 1, tzinfo=UTC)
+    )
+
+    assert event.jump_url == "https://discord.com/channels/2/3/4"
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from placeholders import PlaceholderRepository
+from tests.helpers.fakes import FakeCollection
+
+MESSAGE_DATE = datetime(2026, 1, 1, 12, tzinfo=UTC)
+
+
+class CountingCollection(FakeCollection):
+    def __init__(self, docs=None):
+        super().__init__(docs)
+        self.find_calls = 0
+
+    def find(self, query=None, **kwargs):
+        self.find_calls += 1
+        return super().find(query, **kwargs)
+
+
+def make_repository(
+    settings: list[dict] | None = None,
+) -> tuple[PlaceholderRepository, FakeCollection, CountingCollection]:
+    events = FakeCollection()
+    settings_collection = CountingCollection(settings)
+    return PlaceholderRepository(events, settings_collection), events, settings_collection
+
+
+def test_add_event_stores_due_time_from_the_authors_setting() -> None:
+    repository, events, _ = make_repository([{"user_id": 1, "hours": 3}])
+
+    event = asyncio.run(
+        repository.add_event(author_id=1, guild_id=2, channel_id=3, message_id=4, message_date=MESSAGE_DATE)
+    )
+
+    assert event.due_at == MESSAGE_DATE + timedelta(hours=3)
+    assert events.docs[0]["due_at"] == event.due_at
+    assert events.docs[0]["hours"] == 3
+
+
+def test_hours_are_cached_and_kept_current_by_set_hours() -> None:
+    repository, _, settings = make_repository([{"user_id": 1, "hours": 3}])
+
+    async def run_test() -> None:
+        assert await repository.get_hours(1) == 3
+        assert await repository.get_hours(1) == 3
+        assert await repository.get_hours(2) == 1
+        await repository.set_hours(1, 5)
+        assert await repository.get_hours(1) == 5
+
+    asyncio.run(run_test())
+
+    assert settings.find_calls == 2
+    assert settings.docs[0]["hours"] == 5
+
+
+def test_backfill_gives_old_events_a_due_time_with_one_settings_query() -> None:
+    repository, events, settings = make_repository([{"user_id": 1, "hours": 2}])
+    naive_date = MESSAGE_DATE.replace(tzinfo=None)
+    events.docs.extend(
+        [
+            {"author_id": 1, "guild_id": 2, "channel_id": 3, "message_id": 10, "message_date": naive_date},
+            {"author_id": 5, "guild_id": 2, "channel_id": 3, "message_id": 11, "message_date": naive_date},
+        ]
+    )
+
+    async def run_test() -> None:
+        assert await repository.backfill_due_times() == 2
+        assert await repository.backfill_due_times() == 0
+        pending = await repository.list_pending()
+        assert [event.message_id for event in pending] == [11, 10]
+        assert pending[1].due_at == MESSAGE_DATE + timedelta(hours=2)
+
+    asyncio.run(run_test())
+
+    assert settings.find_calls == 1
+    assert len(events.bulk_write_calls) == 1
+
+
+def test_remove_reports_whether_the_event_was_still_pending() -> None:
+    repository, _, _ = make_repository()
+
+    async def run_test() -> None:
+        await repository.add_event(author_id=1, guild_id=2, channel_id=3, message_id=4, message_date=MESSAGE_DATE)
+        assert await repository.remove(4) is True
+        assert await repository.remove(4) is False
+
+    asyncio.run(run_test())
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from common.metrics import MetricsRegistry
+from placeholders import PlaceholderEvent, ReminderScheduler
+
+
+def make_event(message_id: int, *, due_in: float, author_id: int = 1) -> PlaceholderEvent:
+    message_date = datetime.now(UTC) - timedelta(hours=1) + timedelta(seconds=due_in)
+    return PlaceholderEvent(
+        author_id=author_id, guild_id=2, channel_id=3, message_id=message_id, message_date=message_date
+    )
+
+
+def test_reminders_fire_in_due_order_without_polling() -> None:
+    fired: list[int] = []
+    registry = MetricsRegistry()
+
+    async def fire(event: PlaceholderEvent) -> None:
+        fired.append(event.message_id)
+
+    async def run_test() -> None:
+        scheduler = ReminderScheduler(fire, registry=registry)
+        scheduler.load([make_event(1, due_in=0.04), make_event(2, due_in=-5)])
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        assert fired == [2]
+        # an earlier reminder wakes the sleeping task
+        scheduler.schedule(make_event(3, due_in=0.01))
+        await asyncio.sleep(0.06)
+        scheduler.stop()
+
+    asyncio.run(run_test())
+
+    assert fired == [2, 3, 1]
+    assert registry.observations["placeholders.fire_lateness"].count == 3
+
+
+def test_cancelled_and_rescheduled_reminders_fire_once_at_their_new_time() -> None:
+    fired: list[tuple[int, int]] = []
+
+    async def fire(event: PlaceholderEvent) -> None:
+        fired.append((event.message_id, event.hours))
+
+    async def run_test() -> None:
+        scheduler = ReminderScheduler(fire)
+        scheduler.start()
+        scheduler.schedule(make_event(1, due_in=0.01))
+        scheduler.schedule(make_event(2, due_in=0.01, author_id=7))
+        assert scheduler.cancel(1) is not None
+        assert 1 not in scheduler and 2 in scheduler
+
+        (pending,) = scheduler.pending_for(7)
+        pending.hours = 2
+        scheduler.schedule(pending)
+        await asyncio.sleep(0.03)
+        assert len(scheduler) == 1
+        scheduler.stop()
+
+    asyncio.run(run_test())
+
+    assert fired == []
+
+
+def test_failing_reminder_does_not_stop_the_scheduler() -> None:
+    fired: list[int] = []
+
+    async def fire(event: PlaceholderEvent) -> None:
+        fired.append(event.message_id)
+        if event.message_id == 1:
+            raise RuntimeError("dm closed")
+
+    async def run_test() -> None:
+        scheduler = ReminderScheduler(fire)
+        scheduler.load([make_event(1, due_in=-2), make_event(2, due_in=-1)])
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        scheduler.stop()
+
+    asyncio.run(run_test())
+
+    assert fired == [1, 2]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from queueing.repositories.activity import ActivityRecord, ActivityRepository
+from queueing.repositories.analytics import SIGNUP_ACTIVITY_UPDATE
+from tests.helpers.fakes import FakeCollection, apply_update
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+CUTOFF = NOW - timedelta(days=180)
+
+
+def days_before_cutoff(days: int) -> datetime:
+    return CUTOFF - timedelta(days=days)
+
+
+def make_repository(docs: list[dict]) -> tuple[ActivityRepository, FakeCollection, FakeCollection]:
+    active_users = FakeCollection(docs)
+    sweeps = FakeCollection()
+    return ActivityRepository(active_users, sweeps), active_users, sweeps  # pyright: ignore[reportArgumentType]
+
+
+def test_first_sweep_reads_everyone_past_the_cutoff_and_later_sweeps_only_the_new_ones() -> None:
+    repository, _, _ = make_repository(
+        [
+            {"_id": 1, "last_signup": days_before_cutoff(100)},
+            {"_id": 2, "last_signup": days_before_cutoff(-1)},
+            {"_id": 3, "last_signup": days_before_cutoff(10), "inactive_at": NOW},
+        ]
+    )
+
+    async def run_test() -> tuple[list[ActivityRecord], list[ActivityRecord]]:
+        first = await repository.newly_inactive(CUTOFF)
+        await repository.finish_sweep(CUTOFF, inactive=[1], retry=[], at=NOW)
+        second = await repository.newly_inactive(CUTOFF + timedelta(days=2))
+        return first, second
+
+    first, second = asyncio.run(run_test())
+
+    assert [record.member_id for record in first] == [1]
+    assert [record.member_id for record in second] == [2]
+
+
+def test_finished_sweep_marks_users_and_holds_the_watermark_for_retries() -> None:
+    repository, active_users, sweeps = make_repository(
+        [
+            {"_id": 1, "last_signup": days_before_cutoff(30)},
+            {"_id": 2, "last_signup": days_before_cutoff(20)},
+        ]
+    )
+
+    async def run_test() -> list[ActivityRecord]:
+        candidates = await repository.newly_inactive(CUTOFF)
+        await repository.finish_sweep(CUTOFF, inactive=[1], retry=[candidates[1]], at=NOW)
+        return await repository.newly_inactive(CUTOFF + timedelta(days=1))
+
+    retried = asyncio.run(run_test())
+
+    assert [record.member_id for record in retried] == [2]
+    assert active_users.docs[0]["inactive_at"] == NOW
+    assert sweeps.docs[0]["watermark"] < days_before_cutoff(20)
+    assert asyncio.run(repository.get_many([1, 2, 9])) == {
+        1: ActivityRecord(1, days_before_cutoff(30), NOW),
+        2: ActivityRecord(2, days_before_cutoff(20)),
+    }
+
+
+def test_departed_members_handled_by_a_sweep_do_not_hold_the_watermark() -> None:
+    repository, active_users, sweeps = make_repository(
+        [
+            {"_id": 1, "last_signup": days_before_cutoff(30)},
+            {"_id": 2, "last_signup": days_before_cutoff(20)},
+        ]
+    )
+
+    async def run_test() -> list[ActivityRecord]:
+        await repository.newly_inactive(CUTOFF)
+        # member 2 left the guild, so the sweep records it with the members it marked
+        await repository.finish_sweep(CUTOFF, inactive=[1, 2], retry=[], at=NOW)
+        return await repository.newly_inactive(CUTOFF + timedelta(days=1))
+
+    assert asyncio.run(run_test()) == []
+    assert sweeps.docs[0]["watermark"] == CUTOFF
+    assert all(doc["inactive_at"] == NOW for doc in active_users.docs)
+
+
+def test_sign_up_clears_the_inactive_mark() -> None:
+    doc = {"_id": 1, "last_signup": days_before_cutoff(30), "inactive_at": NOW}
+
+    apply_update(doc, SIGNUP_ACTIVITY_UPDATE)
+
+    assert "inactive_at" not in doc
+    assert doc["last_signup"] > CUTOFF
@@ -2,8 +2,9 @@
 
 import asyncio
 from datetime import datetime, timezone
+from typing import cast
 
-from queueing.repositories.analytics import AnalyticsRepository
+from queueing.repositories.analytics import AnalyticsRepository, PlayerSignupRecord
 from tests.helpers.builders import make_member
 from tests.helpers.fakes import FakeCollection
 
@@ -35,7 +36,30 @@ def test_record_player_signup_stores_raw_signup_text() -> None:
         )
     )
 
-    assert collection.docs[0]["last.signup_text"] == "Champion Fighter 5"
+    assert collection.docs[0]["last"]["signup_text"] == "Champion Fighter 5"
+
+
+def test_record_player_signups_writes_each_collection_once() -> None:
+    repository, collection = make_repository([{"user_id": 10, "gate_signup_count": 2}])
+    records = [
+        PlayerSignupRecord(
+            member=make_member(member_id, name),
+            total_level=5,
+            levels=[{"class": "Fighter", "subclass": None, "level": 5}],
+            signup_text="Fighter 5",
+        )
+        for member_id, name in ((10, "Alice"), (11, "Bob"))
+    ]
+
+    asyncio.run(repository.record_player_signups(records))
+
+    assert len(collection.bulk_write_calls) == 1
+    assert len(repository.active_users.bulk_write_calls) == 1
+    assert collection.update_one_calls == []
+    by_user = {doc["user_id"]: doc for doc in collection.docs}
+    assert by_user[10]["gate_signup_count"] == 3
+    assert by_user[11]["gate_signup_count"] == 1
+    assert by_user[11]["last"]["signup_text"] == "Fighter 5"
 
 
 def test_get_last_player_signup_text_prefers_stored_raw_text() -> None:
@@ -98,3 +122,59 @@ def test_get_player_signup_times_returns_current_member_timestamps() -> None:
     result = asyncio.run(repository.get_player_signup_times([10, 20]))
 
     assert result == {10: older, 20: newer}
+
+
+def test_get_dm_last_claims_skips_dms_without_claims() -> None:
+    repository, _ = make_repository()
+    claimed = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    dm_analytics = repository.dm_analytics
+    dm_analytics.docs.extend(  # pyright: ignore[reportAttributeAccessIssue]
+        [
+            {"_id": 1, "dm_claims": {"last_claim": claimed}},
+            {"_id": 2, "dm_queue": {}},
+            {"_id": 3, "dm_claims": {"last_claim": claimed}},
+        ]
+    )
+
+    assert asyncio.run(repository.get_dm_last_claims([1, 2])) == {1: claimed}
+
+
+def test_set_marked_many_upserts_every_member_in_one_bulk_write() -> None:
+    repository, _ = make_repository()
+    marks = cast(FakeCollection, repository.player_marked)
+    marks.docs.append({"_id": 1, "marked": False, "custom": "!"})
+
+    asyncio.run(repository.set_marked_many([1, 2, 3], marked=True))
+
+    assert len(marks.bulk_write_calls) == 1
+    assert {doc["_id"]: doc["marked"] for doc in marks.docs} == {1: True, 2: True, 3: True}
+    assert asyncio.run(repository.get_marks([1, 2]))[1].suffix == "*!"
+
+
+def test_last_signup_texts_are_warmed_and_follow_new_signups() -> None:
+    repository, collection = make_repository(
+        [
+            {"user_id": 1, "last": {"signup_text": "Wizard 3"}},
+            {"user_id": 2, "last": {"classes": [{"class": "Rogue", "subclass": None, "level": 4}]}},
+        ]
+    )
+    active_users = cast(FakeCollection, repository.active_users)
+    recent = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    active_users.docs.extend([{"_id": 1, "last_signup": recent}, {"_id": 2, "last_signup": recent}])
+
+    async def run_test() -> tuple[str | None, str | None, str | None]:
+        await repository.warm_signup_texts(active_since=datetime(2026, 6, 1, tzinfo=timezone.utc))
+        collection.docs.clear()
+        warmed = await repository.get_last_player_signup_text(1), await repository.get_last_player_signup_text(2)
+        await repository.record_player_signup(
+            member=make_member(1, "Alice"),
+            total_level=5,
+            levels=[{"class": "Fighter", "subclass": "Champion", "level": 5}],
+        )
+        return *warmed, await repository.get_last_player_signup_text(1)
+
+    wizard, rogue, fighter = asyncio.run(run_test())
+
+    assert wizard == "Wizard 3"
+    assert rogue == "Rogue 4"
+    assert fighter == "Champion Fighter 5"
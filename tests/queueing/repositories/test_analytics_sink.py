@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+
+from pymongo.errors import BulkWriteError
+
+from common.metrics import MetricsRegistry
+from queueing.repositories.analytics import AnalyticsRepository
+from queueing.repositories.analytics_sink import AnalyticsSink
+from tests.helpers.fakes import FakeCollection
+
+
+def make_repository(
+    *, max_batch: int = 100, flush_interval: float = 10.0
+) -> tuple[AnalyticsRepository, AnalyticsSink, dict[str, FakeCollection], MetricsRegistry]:
+    collections = {
+        name: FakeCollection()
+        for name in (
+            "queue_analytics",
+            "gate_groups_analytics",
+            "dm_analytics",
+            "dm_assign_analytics",
+            "reinforcement_analytics",
+            "player_marked",
+            "active_users",
+        )
+    }
+    registry = MetricsRegistry()
+    sink = AnalyticsSink(max_batch=max_batch, flush_interval=flush_interval, registry=registry)
+    return AnalyticsRepository(collections, sink=sink), sink, collections, registry
+
+
+def test_writes_are_queued_and_flushed_as_one_bulk_write_per_collection() -> None:
+    repository, sink, collections, registry = make_repository()
+
+    async def run_test() -> None:
+        for member_id in (1, 2, 3):
+            await repository.record_player_gate_summon(member_id=member_id, gate_name="alpha", total_level=5)
+            await repository.set_marked(member_id, marked=False)
+        await repository.record_claimed_group(gate_name="alpha", claimed_by=10, tier=2, player_levels=[5, 5, 5])
+
+        assert sink.depth == 7
+        assert collections["queue_analytics"].docs == []
+        await sink.flush()
+
+    asyncio.run(run_test())
+
+    assert sink.depth == 0
+    assert [len(call) for call in collections["queue_analytics"].bulk_write_calls] == [3]
+    assert [len(call) for call in collections["player_marked"].bulk_write_calls] == [3]
+    assert collections["player_marked"].bulk_write_ordered == [True]
+    assert collections["queue_analytics"].update_one_calls == []
+    assert collections["queue_analytics"].docs[0]["gate_summon_count"] == 1
+    assert collections["gate_groups_analytics"].docs[0]["levels"] == {"5": 3}
+    assert registry.observations["analytics.queue_depth"].max == 7
+    assert registry.observations["analytics.flush_latency"].count == 1
+
+
+def test_reaching_max_batch_flushes_without_waiting_for_the_timer() -> None:
+    repository, sink, collections, _ = make_repository(max_batch=2)
+
+    async def run_test() -> None:
+        await repository.set_marked(1, marked=True)
+        await repository.set_marked(2, marked=True)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(run_test())
+
+    assert len(collections["player_marked"].bulk_write_calls) == 1
+    assert sink.depth == 0
+
+
+def test_timer_flushes_writes_queued_during_a_flush() -> None:
+    repository, sink, collections, _ = make_repository(flush_interval=0.01)
+
+    async def run_test() -> None:
+        await repository.set_marked(1, marked=True)
+        await asyncio.sleep(0.015)
+        await repository.set_marked(2, marked=True)
+        await asyncio.sleep(0.03)
+
+    asyncio.run(run_test())
+
+    assert sink.depth == 0
+    assert sorted(doc["_id"] for doc in collections["player_marked"].docs) == [1, 2]
+
+
+def test_deferred_jobs_run_after_bulk_writes_and_close_flushes_everything() -> None:
+    repository, sink, collections, _ = make_repository()
+    collections["dm_analytics"].docs.append({"_id": 10, "dm_gates": [{"gate_name": "old"}]})
+
+    async def run_test() -> None:
+        await repository.record_dm_claim(dm_id=10, gate_data={"gate_name": "alpha"})  # pyright: ignore
+        await repository.record_latest_gate_reinforcement(10)
+        assert collections["reinforcement_analytics"].docs == []
+        await sink.close()
+
+    asyncio.run(run_test())
+
+    assert collections["reinforcement_analytics"].docs[0]["gate_info"] == {"gate_name": "alpha"}
+
+
+def test_writes_queued_around_a_deferred_job_land_on_its_side_of_it() -> None:
+    repository, sink, collections, _ = make_repository()
+
+    async def run_test() -> None:
+        # the claim was queued before this assignment existed, so it must not claim it
+        await repository.mark_assignment_claimed()
+        await repository.record_dm_assignment(summoner_id=20, dm_id=10, gate_data={"players": []})  # pyright: ignore
+        await repository.mark_assignment_claimed()
+        await repository.record_dm_assignment(summoner_id=20, dm_id=11, gate_data={"players": []})  # pyright: ignore
+        await sink.flush()
+
+    asyncio.run(run_test())
+
+    assert [(doc["dm"], doc["claimed"]) for doc in collections["dm_assign_analytics"].docs] == [(10, True), (11, False)]
+
+
+def test_closing_during_a_timed_flush_waits_for_its_batch() -> None:
+    class SlowCollection(FakeCollection):
+        async def bulk_write(self, requests, ordered=True):
+            await asyncio.sleep(0.05)
+            return await super().bulk_write(requests, ordered)
+
+    repository, sink, _, registry = make_repository(flush_interval=0.01)
+    repository.player_marked = slow = SlowCollection()
+
+    async def run_test() -> None:
+        await repository.set_marked(1, marked=True)
+        await asyncio.sleep(0.02)
+        # the timer's flush is now waiting on Mongo
+        await repository.set_marked(2, marked=True)
+        await sink.close()
+
+    asyncio.run(run_test())
+
+    assert [doc["_id"] for doc in slow.docs] == [1, 2]
+    assert registry.counters["analytics.written"] == 2
+    assert sink.depth == 0
+
+
+def test_failed_bulk_write_is_counted_and_other_collections_still_flush() -> None:
+    class BrokenCollection(FakeCollection):
+        async def bulk_write(self, requests, ordered=True):
+            raise RuntimeError("mongo unavailable")
+
+    repository, sink, collections, registry = make_repository()
+    repository.player_marked = BrokenCollection()
+
+    async def run_test() -> None:
+        await repository.set_marked(1, marked=True)
+        await repository.set_last_strike_gate(1, "alpha")
+        await sink.flush()
+
+    asyncio.run(run_test())
+
+    assert registry.counters["analytics.flush_failures"] == 1
+    assert collections["queue_analytics"].docs[0]["last_strike"] == "alpha"
+
+
+def test_partial_bulk_write_skips_only_the_failed_write_and_keeps_the_order() -> None:
+    class PartlyBrokenCollection(FakeCollection):
+        async def bulk_write(self, requests, ordered=True):
+            assert ordered is True
+            if len(requests) == 4:
+                # an ordered batch applies the writes before the error and stops there
+                await super().bulk_write(requests[:1], ordered)
+                raise BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]})
+            return await super().bulk_write(requests, ordered)
+
+    repository, sink, _, registry = make_repository()
+    repository.player_marked = broken = PartlyBrokenCollection()
+
+    async def run_test() -> None:
+        await repository.set_marked(1, marked=True)
+        await repository.set_marked(2, marked=True)
+        await repository.set_marked(3, marked=True)
+        await repository.clear_marks_for_members([3])
+        await sink.flush()
+
+    asyncio.run(run_test())
+
+    assert [len(call) for call in broken.bulk_write_calls] == [1, 2]
+    assert {doc["_id"]: doc["marked"] for doc in broken.docs} == {1: True, 3: False}
+    assert registry.counters["analytics.flush_failures"] == 1
+    assert registry.counters["analytics.written"] == 3
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+
+from common.metrics import MetricsRegistry
+from queueing.repositories.gates import GateRepository
+from tests.helpers.fakes import FakeCollection
+
+
+class CountingCollection(FakeCollection):
+    def __init__(self, docs=None):
+        super().__init__(docs)
+        self.find_calls = 0
+
+    def find(self, query=None, **kwargs):
+        self.find_calls += 1
+        return super().find(query, **kwargs)
+
+
+def make_repository() -> tuple[GateRepository, CountingCollection, MetricsRegistry]:
+    collection = CountingCollection(
+        [
+            {"_id": 1, "name": "alpha", "emoji": "A", "owner": 10},
+            {"_id": 2, "name": "beta", "emoji": "B"},
+        ]
+    )
+    registry = MetricsRegistry()
+    return GateRepository(collection, registry=registry), collection, registry
+
+
+def test_lookups_are_served_from_one_load() -> None:
+    repository, collection, registry = make_repository()
+
+    async def run_test() -> None:
+        assert (await repository.get_by_name("ALPHA"))["emoji"] == "A"  # pyright: ignore
+        assert (await repository.get_by_owner(10))["name"] == "alpha"  # pyright: ignore
+        assert await repository.get_by_name("gamma") is None
+        assert [gate["name"] for gate in await repository.list_gates()] == ["alpha", "beta"]
+
+    asyncio.run(run_test())
+
+    assert collection.find_calls == 1
+    assert registry.counters["gates.cache_miss"] == 1
+    assert repository.hit_ratio == 0.75
+
+
+def test_returned_gates_are_copies() -> None:
+    repository, _, _ = make_repository()
+
+    async def run_test() -> None:
+        gate = await repository.get_by_name("alpha")
+        gate["owner"] = 99  # pyright: ignore
+        assert (await repository.get_by_owner(10)) is not None
+
+    asyncio.run(run_test())
+
+
+def test_set_owner_skips_no_op_writes_and_patches_the_cache() -> None:
+    repository, collection, registry = make_repository()
+
+    async def run_test() -> None:
+        await repository.set_owner("alpha", 10)
+        await repository.set_owner("beta", 10)
+        assert (await repository.get_by_name("beta"))["owner"] == 10  # pyright: ignore
+        assert (await repository.get_by_owner(10))["name"] == "alpha"  # pyright: ignore
+
+    asyncio.run(run_test())
+
+    assert registry.counters["gates.owner_write_skipped"] == 1
+    assert [call[0] for call in collection.update_one_calls] == [{"name": "beta"}]
+    assert collection.docs[1]["owner"] == 10
+    assert collection.find_calls == 1
+
+
+def test_upsert_and_remove_invalidate_the_cache() -> None:
+    repository, collection, _ = make_repository()
+
+    async def run_test() -> None:
+        await repository.list_gates()
+        await repository.upsert_gate("Gamma", "G")
+        assert (await repository.get_by_name("gamma"))["emoji"] == "G"  # pyright: ignore
+        await repository.remove_gate("alpha")
+        assert await repository.get_by_owner(10) is None
+
+    asyncio.run(run_test())
+
+    assert collection.find_calls == 3
@@ -2,9 +2,16 @@
 
 import asyncio
 
+import pytest
+
 from queueing.models import Queue
-from queueing.repositories.queue import QueueRepository, build_empty_queue_document, load_queue_for_guild
-from tests.helpers.builders import make_player
+from queueing.repositories.queue import (
+    QueueRepository,
+    QueueVersionConflict,
+    build_empty_queue_document,
+    load_queue_for_guild,
+)
+from tests.helpers.builders import make_group, make_player, member_of
 from tests.helpers.fakes import FakeCollection, FakeGuild
 
 
@@ -50,7 +57,7 @@ def test_load_for_guild_prefers_legacy_none_channel_when_no_exact_match() -> Non
 
 def test_load_for_guild_falls_back_to_largest_queue_without_channel() -> None:
     player = make_player(1, "Alice")
-    guild = FakeGuild(123, members=[player.member])
+    guild = FakeGuild(123, members=[member_of(player)])
     collection = FakeCollection(
         [
             {"server_id": 123, "channel_id": 1, "groups": [], "locked": False},
@@ -98,7 +105,7 @@ def test_save_updates_legacy_none_channel_document() -> None:
     assert collection.docs[0]["channel_id"] == 999
     assert collection.docs[0]["locked"] is True
     assert collection.docs[0]["guild_id"] == 123
-    selector, _, upsert = collection.update_one_calls[0]
+    selector, _, upsert = collection.find_one_and_update_calls[0]
     assert {"server_id": 123, "channel_id": None} in selector["$or"]
     assert upsert is True
 
@@ -108,3 +115,152 @@ def test_load_queue_for_guild_uses_repository_default_behavior() -> None:
 
     assert queue.server_id == 123
     assert queue.channel_id is None
+
+
+def _stored_queue(*groups, version: int = 3) -> tuple[FakeCollection, FakeGuild]:
+    queue = Queue(groups=list(groups), server_id=123, channel_id=999, locked=False)
+    members = [member_of(player) for group in groups for player in group.players]
+    document = {"_id": "queue", **queue.to_dict(), "guild_id": 123, "version": version}
+    return FakeCollection([document]), FakeGuild(123, members=members)
+
+
+def _load(collection: FakeCollection, guild: FakeGuild) -> tuple[QueueRepository, Queue]:
+    repository = QueueRepository(collection, default_channel_id=999)
+    return repository, asyncio.run(repository.load_for_guild(guild))
+
+
+def test_save_pushes_only_the_new_player() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    collection, guild = _stored_queue(make_group(alice))
+    repository, queue = _load(collection, guild)
+
+    queue.groups[0].players.append(bob)
+    asyncio.run(repository.save(queue))
+
+    [(selector, update, upsert)] = collection.update_one_calls
+    assert selector == {"_id": "queue", "version": 3}
+    assert update == {
+        "$push": {"groups.0.players": {"$each": [bob.to_dict()]}},
+        "$inc": {"version": 1},
+    }
+    assert upsert is False
+    assert collection.docs[0]["groups"][0]["players"] == [alice.to_dict(), bob.to_dict()]
+    assert collection.docs[0]["version"] == 4
+    assert collection.find_one_and_update_calls == []
+
+
+def test_save_sends_every_change_as_one_update() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    cara = make_player(3, "Cara")
+    collection, guild = _stored_queue(make_group(alice, bob), make_group(cara))
+    repository, queue = _load(collection, guild)
+
+    queue.groups[0].players.pop(0)
+    queue.groups[0].locked = True
+    queue.groups[1].players.append(make_player(4, "Dan"))
+    queue.locked = True
+    asyncio.run(repository.save(queue))
+
+    [(_, update, _)] = collection.update_one_calls
+    assert update == {
+        "$set": {"groups.0.locked": True, "locked": True},
+        "$pull": {"groups.0.players": {"member_id": {"$in": [1]}}},
+        "$push": {"groups.1.players": {"$each": [make_player(4, "Dan").to_dict()]}},
+        "$inc": {"version": 1},
+    }
+    assert collection.docs[0]["groups"] == [group.to_dict() for group in queue.groups]
+    assert collection.docs[0]["locked"] is True
+
+
+def test_save_sets_the_roster_when_a_group_both_loses_and_gains_players() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    collection, guild = _stored_queue(make_group(alice, bob))
+    repository, queue = _load(collection, guild)
+
+    queue.groups[0].players.pop(0)
+    queue.groups[0].players.append(make_player(3, "Cara"))
+    asyncio.run(repository.save(queue))
+
+    [(_, update, _)] = collection.update_one_calls
+    assert update == {"$set": {"groups.0.players": queue.groups[0].to_dict()["players"]}, "$inc": {"version": 1}}
+    assert collection.docs[0]["groups"] == [group.to_dict() for group in queue.groups]
+
+
+def test_save_rewrites_the_group_array_when_groups_are_added_or_removed() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    cara = make_player(3, "Cara", level=11)
+    collection, guild = _stored_queue(make_group(alice), make_group(bob), make_group(cara))
+    repository, queue = _load(collection, guild)
+
+    queue.groups.pop(1)
+    queue.groups.insert(1, make_group(make_player(4, "Dan")))
+    queue.groups.append(make_group(make_player(5, "Eve", level=17)))
+    asyncio.run(repository.save(queue))
+
+    [(_, update, _)] = collection.update_one_calls
+    assert update["$set"] == {"groups": [group.to_dict() for group in queue.groups]}
+    assert collection.docs[0]["groups"] == [group.to_dict() for group in queue.groups]
+    assert collection.find_one_and_update_calls == []
+
+    # the snapshot follows each write, so a second change is again a single small update
+    queue.groups[0].players.append(make_player(6, "Finn"))
+    asyncio.run(repository.save(queue))
+
+    assert list(collection.update_one_calls[1][1]["$push"]) == ["groups.0.players"]
+    assert collection.docs[0]["groups"] == [group.to_dict() for group in queue.groups]
+
+
+def test_save_rewrites_reordered_groups_at_the_read_version() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    collection, guild = _stored_queue(make_group(alice), make_group(bob))
+    repository, queue = _load(collection, guild)
+
+    queue.groups.reverse()
+    asyncio.run(repository.save(queue))
+
+    [(selector, update, _)] = collection.update_one_calls
+    assert selector == {"_id": "queue", "version": 3}
+    assert update["$inc"] == {"version": 1}
+    assert collection.docs[0]["groups"] == [group.to_dict() for group in queue.groups]
+    assert collection.find_one_and_update_calls == []
+
+
+def test_save_raises_on_version_conflict_without_overwriting() -> None:
+    alice = make_player(1, "Alice")
+    collection, guild = _stored_queue(make_group(alice))
+    repository, queue = _load(collection, guild)
+    collection.docs[0]["version"] = 10
+    stored_groups = list(collection.docs[0]["groups"])
+
+    queue.groups[0].players.append(make_player(2, "Bob"))
+    with pytest.raises(QueueVersionConflict):
+        asyncio.run(repository.save(queue))
+
+    assert collection.find_one_and_update_calls == []
+    assert collection.docs[0]["groups"] == stored_groups
+    assert collection.docs[0]["version"] == 10
+
+
+def test_unversioned_document_is_rewritten_once_before_delta_saves() -> None:
+    alice = make_player(1, "Alice")
+    collection, guild = _stored_queue(make_group(alice))
+    del collection.docs[0]["version"]
+    repository, queue = _load(collection, guild)
+
+    queue.groups[0].players.append(make_player(2, "Bob"))
+    asyncio.run(repository.save(queue))
+    queue.groups[0].players.append(make_player(3, "Cara"))
+    asyncio.run(repository.save(queue))
+
+    first, second = collection.update_one_calls
+    assert first[0] == {"_id": "queue", "version": {"$exists": False}}
+    assert "groups" in first[1]["$set"]
+    assert second[0] == {"_id": "queue", "version": 1}
+    assert list(second[1]) == ["$push", "$inc"]
+    assert collection.docs[0]["version"] == 2
+    assert collection.docs[0]["groups"] == [group.to_dict() for group in queue.groups]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from queueing.repositories.queue_state import QueueStateStore
+from tests.helpers.builders import make_group, make_player, make_queue
+from tests.helpers.fakes import FakeGuild, InMemoryQueueRepository
+
+
+def test_load_for_guild_reads_repository_once_and_reuses_instance() -> None:
+    repository = InMemoryQueueRepository(make_queue())
+    store = QueueStateStore(repository, default_channel_id=456)
+    guild = FakeGuild(1)
+
+    first = asyncio.run(store.load_for_guild(guild))
+    second = asyncio.run(store.load_for_guild(guild))
+
+    assert first is second
+    assert len(repository.load_calls) == 1
+    assert repository.load_calls[0]["channel_id"] == 456
+    assert store.peek(1) is first
+
+
+def test_save_writes_through_and_keeps_cached_queue() -> None:
+    queue = make_queue()
+    repository = InMemoryQueueRepository(queue)
+    store = QueueStateStore(repository)
+    guild = FakeGuild(1)
+
+    loaded = asyncio.run(store.load_for_guild(guild))
+    loaded.groups.append(make_group(make_player(1, "Alice")))
+    asyncio.run(store.save(loaded))
+
+    assert repository.saved == [loaded]
+    assert asyncio.run(store.load_for_guild(guild)) is loaded
+    assert len(repository.load_calls) == 1
+
+
+def test_failed_save_invalidates_cached_queue() -> None:
+    class FailingRepository(InMemoryQueueRepository):
+        async def save(self, queue) -> None:
+            raise RuntimeError("mongo unavailable")
+
+    store = QueueStateStore(FailingRepository(make_queue()))
+    queue = asyncio.run(store.load_for_guild(FakeGuild(1)))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.save(queue))
+
+    assert store.peek(1) is None
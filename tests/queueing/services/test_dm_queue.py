@@ -6,6 +6,7 @@
 import pytest
 
 from queueing.services.dm_queue import DMQueueService
+from queueing.services.queue_actor import QueueActorPool
 from tests.helpers.builders import (
     make_analytics,
     make_bot,
@@ -16,8 +17,15 @@
     make_presentation,
     make_queue,
     make_ready_entry,
+    member_of,
+)
+from tests.helpers.fakes import (
+    ContendedQueueRepository,
+    FakeChannel,
+    FakeGuild,
+    InMemoryQueueRepository,
+    InMemoryReadyQueueRepository,
 )
-from tests.helpers.fakes import FakeChannel, FakeGuild, InMemoryQueueRepository, InMemoryReadyQueueRepository
 
 
 def test_signup_upserts_entry_records_analytics_and_refreshes() -> None:
@@ -31,7 +39,7 @@ def test_signup_upserts_entry_records_analytics_and_refreshes() -> None:
     assert result.success is True
     assert dm_repo.upserts == [{"member_id": 10, "text": "tier 3", "message_id": 99}]
     analytics.record_dm_queue_signup.assert_awaited_once_with(10, delta=1)
-    service.refresh_queue_message.assert_awaited_once()
+    service.request_refresh.assert_called_once()
 
 
 def test_update_member_changes_text_and_refreshes() -> None:
@@ -42,7 +50,7 @@ def test_update_member_changes_text_and_refreshes() -> None:
 
     assert result.success is True
     assert dm_repo.entries[0].text == "new"
-    service.refresh_queue_message.assert_awaited_once()
+    service.request_refresh.assert_called_once()
 
 
 def test_leave_member_removes_entry_and_optionally_adjusts_analytics() -> None:
@@ -63,7 +71,7 @@ def test_leave_member_reports_missing_entry_without_refresh() -> None:
 
     assert result.success is False
     analytics.record_dm_queue_signup.assert_not_awaited()
-    service.refresh_queue_message.assert_not_awaited()
+    service.request_refresh.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -85,7 +93,7 @@ def test_assign_dm_to_group_validates_selection(
 
     result = asyncio.run(
         service.assign_dm_to_group(
-            guild=FakeGuild(1, members=[player.member]),
+            guild=FakeGuild(1, members=[member_of(player)]),
             summoner=make_member(20, "Assistant"),
             group_number=1,
             queue_number=queue_number,
@@ -102,8 +110,8 @@ def test_assign_dm_to_group_rejects_missing_member_and_invalid_group() -> None:
     player = make_player(1, "Alice")
     queue = make_queue(make_group(player))
     service, _, _, _, _ = make_dm_service(queue, entries=[make_ready_entry(10)])
-    guild_without_dm = FakeGuild(1, members=[player.member])
-    guild_with_dm = FakeGuild(1, members=[player.member, make_member(10, "DM")])
+    guild_without_dm = FakeGuild(1, members=[member_of(player)])
+    guild_with_dm = FakeGuild(1, members=[member_of(player), make_member(10, "DM")])
 
     missing_member = asyncio.run(
         service.assign_dm_to_group(
@@ -137,7 +145,7 @@ def test_assign_dm_to_group_rejects_reassignment_when_disabled() -> None:
 
     result = asyncio.run(
         service.assign_dm_to_group(
-            guild=FakeGuild(1, members=[dm_member, player.member]),
+            guild=FakeGuild(1, members=[dm_member, member_of(player)]),
             summoner=make_member(20, "Assistant"),
             group_number=1,
             queue_number=1,
@@ -161,7 +169,7 @@ def test_assign_dm_to_group_rejects_missing_assignment_channel_after_saving_assi
 
     result = asyncio.run(
         service.assign_dm_to_group(
-            guild=FakeGuild(1, members=[dm_member, player.member]),
+            guild=FakeGuild(1, members=[dm_member, member_of(player)]),
             summoner=make_member(20, "Assistant"),
             group_number=1,
             queue_number=1,
@@ -187,7 +195,7 @@ def test_assign_dm_to_group_successfully_assigns_and_removes_dm() -> None:
         entries=[make_ready_entry(dm_member.id)],
     )
     assignment_channel = FakeChannel(service.config.dm_queue_assignment_channel_id)
-    guild = FakeGuild(1, members=[dm_member, summoner, player.member], channels=[assignment_channel])
+    guild = FakeGuild(1, members=[dm_member, summoner, member_of(player)], channels=[assignment_channel])
 
     result = asyncio.run(
         service.assign_dm_to_group(
@@ -208,6 +216,30 @@ def test_assign_dm_to_group_successfully_assigns_and_removes_dm() -> None:
     analytics.increment_dm_assignments.assert_awaited_once_with(dm_member.id)
 
 
+def test_assignment_replayed_after_a_conflict_announces_the_fresh_group() -> None:
+    dm_member = make_member(10, "DM")
+    summoner = make_member(20, "Assistant")
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    service, _, queue_repo, analytics, presentation = make_dm_service(
+        make_queue(make_group(alice)),
+        entries=[make_ready_entry(dm_member.id)],
+    )
+    fresh = make_queue(make_group(bob))
+    service.queue_store = service.queue_actors.store = ContendedQueueRepository(queue_repo.queue, fresh)
+    assignment_channel = FakeChannel(service.config.dm_queue_assignment_channel_id)
+    guild = FakeGuild(1, members=[dm_member, summoner, member_of(alice), member_of(bob)], channels=[assignment_channel])
+
+    result = asyncio.run(
+        service.assign_dm_to_group(guild=guild, summoner=summoner, group_number=1, dm_member_id=dm_member.id)
+    )
+
+    assert result.success is True
+    assert fresh.groups[0].assigned == dm_member.id
+    assert presentation.send_gate_assignment.await_args.kwargs["group"] is fresh.groups[0]
+    assert analytics.record_dm_assignment.await_args.kwargs["gate_data"]["players"] == [bob.to_dict()]
+
+
 def test_queue_view_state_delegates_to_presentation() -> None:
     entries = [make_ready_entry(10)]
     service, _, _, _, presentation = make_dm_service(make_queue(), entries=entries)
@@ -224,7 +256,8 @@ def test_refresh_queue_message_raises_when_channel_missing() -> None:
         bot=make_bot(),
         config=make_dm_service(make_queue())[0].config,
         dm_queue_repository=InMemoryReadyQueueRepository(),
-        queue_repository=InMemoryQueueRepository(make_queue()),
+        queue_store=InMemoryQueueRepository(make_queue()),
+        queue_actors=QueueActorPool(InMemoryQueueRepository(make_queue())),
         analytics_repository=make_analytics(),
         presentation_service=make_presentation(),
         view_factory=object,
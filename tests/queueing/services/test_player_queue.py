@@ -4,6 +4,7 @@
 from types import SimpleNamespace
 
 from queueing.config import QueueRuntimeConfig
+from queueing.repositories import PlayerSignupRecord, QueueMetaRepository
 from queueing.services.player_queue import PlayerQueueService
 from tests.helpers.builders import (
     make_analytics,
@@ -15,9 +16,12 @@
     make_presentation,
     make_queue,
     make_role,
+    member_of,
 )
 from tests.helpers.fakes import (
+    ContendedQueueRepository,
     FakeChannel,
+    FakeCollection,
     FakeEmbed,
     FakeGuild,
     FakeMessage,
@@ -30,15 +34,15 @@ def test_signup_prefers_existing_group_and_records_analytics() -> None:
     player = make_player(1, "Alice")
     queue = make_queue(make_group(tier=player.tier))
     service, _, analytics, _ = make_player_service(queue, testing=False)
-    message = SimpleNamespace(guild=FakeGuild(1, members=[player.member]), author=player.member, id=10)
+    message = SimpleNamespace(guild=FakeGuild(1, members=[member_of(player)]), author=member_of(player), id=10)
 
     result = asyncio.run(service.signup_from_message(message=message, player=player))
 
     assert result.success is True
     assert result.group_number == 1
     assert queue.groups[0].players == [player]
-    analytics.record_player_signup.assert_awaited_once()
-    service.refresh_queue_message.assert_awaited_once()
+    analytics.record_player_signups.assert_awaited_once()
+    service.request_refresh.assert_called_once()
 
 
 def test_signup_from_text_parses_player_records_raw_text_and_refreshes() -> None:
@@ -57,15 +61,19 @@ def test_signup_from_text_parses_player_records_raw_text_and_refreshes() -> None
 
     assert result.success is True
     assert result.group_number == 1
-    assert queue.groups[0].players[0].member is member
+    assert queue.groups[0].players[0].member_id == member.id
     assert queue.groups[0].players[0].total_level == 5
-    analytics.record_player_signup.assert_awaited_once_with(
-        member=member,
-        total_level=5,
-        levels=[{"class": "Fighter", "subclass": "Champion", "level": 5}],
-        signup_text="Champion Fighter 5",
+    analytics.record_player_signups.assert_awaited_once_with(
+        [
+            PlayerSignupRecord(
+                member=member,
+                total_level=5,
+                levels=[{"class": "Fighter", "subclass": "Champion", "level": 5}],
+                signup_text="Champion Fighter 5",
+            )
+        ]
     )
-    service.refresh_queue_message.assert_awaited_once()
+    service.request_refresh.assert_called_once()
 
 
 def test_signup_from_text_blocks_duplicates_with_optional_source_delete_flag() -> None:
@@ -75,8 +83,8 @@ def test_signup_from_text_blocks_duplicates_with_optional_source_delete_flag() -
 
     result = asyncio.run(
         service.signup_from_text(
-            guild=FakeGuild(1, members=[player.member]),
-            member=player.member,
+            guild=FakeGuild(1, members=[member_of(player)]),
+            member=member_of(player),
             text="Fighter 5",
             should_delete_duplicate_source=True,
         )
@@ -85,8 +93,8 @@ def test_signup_from_text_blocks_duplicates_with_optional_source_delete_flag() -
     assert result.success is False
     assert result.message == "You are already in a queue!"
     assert result.should_delete_source_message is True
-    analytics.record_player_signup.assert_not_awaited()
-    service.refresh_queue_message.assert_not_awaited()
+    analytics.record_player_signups.assert_not_awaited()
+    service.request_refresh.assert_not_called()
 
 
 def test_signup_blocks_duplicates_outside_testing_but_allows_in_testing() -> None:
@@ -95,17 +103,17 @@ def test_signup_blocks_duplicates_outside_testing_but_allows_in_testing() -> Non
     testing_queue = make_queue(make_group(player))
     production_service, _, production_analytics, _ = make_player_service(production_queue, testing=False)
     testing_service, _, testing_analytics, _ = make_player_service(testing_queue, testing=True)
-    message = SimpleNamespace(guild=FakeGuild(1, members=[player.member]), author=player.member, id=10)
+    message = SimpleNamespace(guild=FakeGuild(1, members=[member_of(player)]), author=member_of(player), id=10)
 
     blocked = asyncio.run(production_service.signup_from_message(message=message, player=player))
     allowed = asyncio.run(testing_service.signup_from_message(message=message, player=player))
 
     assert blocked.success is False
     assert blocked.should_delete_source_message is True
-    production_analytics.record_player_signup.assert_not_awaited()
+    production_analytics.record_player_signups.assert_not_awaited()
     assert allowed.success is True
     assert len(testing_queue.groups[0].players) == 2
-    testing_analytics.record_player_signup.assert_awaited_once()
+    testing_analytics.record_player_signups.assert_awaited_once()
 
 
 def test_leave_member_removes_player_and_optionally_updates_analytics() -> None:
@@ -115,18 +123,18 @@ def test_leave_member_removes_player_and_optionally_updates_analytics() -> None:
 
     result = asyncio.run(
         service.leave_member(
-            guild=FakeGuild(1, members=[player.member]),
-            member_id=player.member.id,
+            guild=FakeGuild(1, members=[member_of(player)]),
+            member_id=player.member_id,
             decrement_signup_count=True,
             clear_marked=True,
         )
     )
 
     assert result.success is True
-    assert queue.groups[0].players == []
-    assert queue_repo.saved[-1] is queue
-    analytics.decrement_player_signup.assert_awaited_once_with(player.member.id)
-    analytics.set_marked.assert_awaited_once_with(player.member.id, marked=False)
+    assert queue.groups == []
+    assert queue_repo.saved == [queue]
+    analytics.decrement_player_signup.assert_awaited_once_with(player.member_id)
+    analytics.set_marked.assert_awaited_once_with(player.member_id, marked=False)
 
 
 def test_leave_member_reports_missing_player_without_saving() -> None:
@@ -152,17 +160,19 @@ def test_move_member_validates_groups_and_moves_player() -> None:
 
     result = asyncio.run(
         service.move_member(
-            guild=FakeGuild(1, members=[player.member]),
+            guild=FakeGuild(1, members=[member_of(player)]),
             original_group=1,
-            member_id=player.member.id,
+            member_id=player.member_id,
             new_group=2,
         )
     )
 
     assert result.success is True
-    assert queue.groups[0].players == []
-    assert queue.groups[1].players == [player]
-    assert queue_repo.saved[-1] is queue
+    assert [group.players for group in queue.groups] == [[player]]
+    assert queue_repo.saved == [queue]
+    # the emptied first group is dropped on commit, so the player ends up in what is now group 1
+    assert result.group_number == 1
+    assert result.message == f"{player.mention} has been moved from Group #1 to Group #1"
 
 
 def test_merge_groups_combines_second_group_into_first() -> None:
@@ -186,13 +196,35 @@ def test_create_group_from_member_moves_player_after_current_group() -> None:
 
     result = asyncio.run(
         service.create_group_from_member(
-            guild=FakeGuild(1, members=[alice.member, bob.member]),
-            member_id=bob.member.id,
+            guild=FakeGuild(1, members=[member_of(alice), member_of(bob)]),
+            member_id=bob.member_id,
         )
     )
 
     assert result.success is True
     assert [group.players for group in queue.groups] == [[alice], [bob]]
+    assert result.group_number == 2
+
+
+def test_group_numbers_are_reported_after_normalization() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob", level=11)
+    queue = make_queue(make_group(alice), make_group(bob))
+    service, _, _, _ = make_player_service(queue)
+    guild = FakeGuild(1, members=[member_of(alice), member_of(bob)])
+
+    async def run_test():
+        return await asyncio.gather(
+            service.create_group_from_member(guild=guild, member_id=alice.member_id),
+            service.merge_groups(guild=guild, group_1=3, group_2=1),
+        )
+
+    created, merged = asyncio.run(run_test())
+
+    # alice's old group is emptied and dropped on commit, so every number shifts down by one
+    assert [group.players for group in queue.groups] == [[alice], [bob]]
+    assert created.group_number == 1
+    assert merged.group_number == 2
 
 
 def test_shuffle_groups_preserves_locked_groups_and_repacks_selected_tier(monkeypatch) -> None:
@@ -208,7 +240,7 @@ def test_shuffle_groups_preserves_locked_groups_and_repacks_selected_tier(monkey
 
     assert result.success is True
     assert queue.groups[0] is locked
-    assert [player.member.display_name for player in queue.groups[1].players] == ["Bob", "Alice"]
+    assert [member_of(player).display_name for player in queue.groups[1].players] == ["Bob", "Alice"]
 
 
 def test_claim_group_handles_invalid_gate_and_successful_command_path() -> None:
@@ -217,7 +249,7 @@ def test_claim_group_handles_invalid_gate_and_successful_command_path() -> None:
     queue = make_queue(make_group(player))
     summons = FakeChannel(QueueRuntimeConfig.from_environment("production").summons_channel_id)
     assignments = FakeChannel(QueueRuntimeConfig.from_environment("production").gate_assignments_channel_id)
-    guild = FakeGuild(1, members=[dm, player.member], channels=[summons, assignments])
+    guild = FakeGuild(1, members=[dm, member_of(player)], channels=[summons, assignments])
     service, _, analytics, _ = make_player_service(queue, gate={"name": "alpha", "emoji": ":a:", "owner": dm.id})
 
     invalid = asyncio.run(service.claim_group(guild=guild, claimant=dm, gate_name="missing", group_number=1))
@@ -229,10 +261,38 @@ def test_claim_group_handles_invalid_gate_and_successful_command_path() -> None:
     assert queue.groups == []
     assert summons.sent[0]["content"].startswith(player.mention)
     analytics.record_dm_claim.assert_awaited_once()
-    analytics.record_player_gate_summon.assert_awaited_once_with(
-        member_id=player.member.id,
+    analytics.record_player_gate_summons.assert_awaited_once_with(
+        gate_name="alpha",
+        summons=[(player.member_id, player.total_level)],
+    )
+
+
+def test_claim_replayed_after_a_conflict_summons_the_fresh_group() -> None:
+    dm = make_member(10, "DM")
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    config = QueueRuntimeConfig.from_environment("production")
+    summons = FakeChannel(config.summons_channel_id)
+    guild = FakeGuild(
+        1,
+        members=[dm, member_of(alice), member_of(bob)],
+        channels=[summons, FakeChannel(config.gate_assignments_channel_id)],
+    )
+    service, _, analytics, _ = make_player_service(
+        make_queue(make_group(alice)), gate={"name": "alpha", "emoji": ":a:", "owner": dm.id}
+    )
+    # another process replaced group 1 before our save landed
+    fresh = make_queue(make_group(bob))
+    service.queue_store = service.queue_actors.store = ContendedQueueRepository(service.queue_store.queue, fresh)
+
+    result = asyncio.run(service.claim_group(guild=guild, claimant=dm, gate_name="alpha", group_number=1))
+
+    assert result.success is True
+    assert fresh.groups == []
+    assert summons.sent[0]["content"].startswith(bob.mention)
+    analytics.record_player_gate_summons.assert_awaited_once_with(
         gate_name="alpha",
-        total_level=player.total_level,
+        summons=[(bob.member_id, bob.total_level)],
     )
 
 
@@ -245,7 +305,7 @@ def test_claim_group_can_use_existing_assignment() -> None:
     config = QueueRuntimeConfig.from_environment("production")
     guild = FakeGuild(
         1,
-        members=[dm, player.member],
+        members=[dm, member_of(player)],
         channels=[
             FakeChannel(config.summons_channel_id),
             FakeChannel(config.gate_assignments_channel_id),
@@ -259,20 +319,21 @@ def test_claim_group_can_use_existing_assignment() -> None:
     assert result.claimed_group_number == 1
 
 
-def test_refresh_queue_message_removes_empty_groups_and_refreshes_persistent_message() -> None:
+def test_refresh_queue_message_renders_without_saving() -> None:
     player = make_player(1, "Alice")
     queue = make_queue(make_group(), make_group(player))
     config = QueueRuntimeConfig.from_environment("production")
     channel = FakeChannel(config.player_queue_channel_id)
-    guild = FakeGuild(1, members=[player.member], channels=[channel])
+    guild = FakeGuild(1, members=[member_of(player)], channels=[channel])
     queue_repo = InMemoryQueueRepository(queue)
     presentation = make_presentation()
     service = PlayerQueueService(
         bot=make_bot(),
         config=config,
-        queue_repository=queue_repo,
+        queue_store=queue_repo,
         gate_repository=InMemoryGateRepository(),
         analytics_repository=make_analytics(),
+        meta_repository=QueueMetaRepository(FakeCollection()),  # pyright: ignore[reportArgumentType]
         presentation_service=presentation,
         view_factory=object,
     )
@@ -280,8 +341,7 @@ def test_refresh_queue_message_removes_empty_groups_and_refreshes_persistent_mes
     result = asyncio.run(service.refresh_queue_message(guild=guild, queue=queue))
 
     assert result.message_id == 1
-    assert queue.groups == [queue.groups[0]]
-    assert queue.groups[0].players == [player]
+    assert queue_repo.saved == []
     presentation.build_player_queue_embed.assert_awaited_once_with(queue)
     presentation.refresh_queue_message.assert_awaited_once()
 
@@ -291,16 +351,17 @@ def test_refresh_queue_message_disables_join_button_when_queue_is_locked() -> No
     queue = make_queue(make_group(player), locked=True)
     config = QueueRuntimeConfig.from_environment("production")
     channel = FakeChannel(config.player_queue_channel_id)
-    guild = FakeGuild(1, members=[player.member], channels=[channel])
+    guild = FakeGuild(1, members=[member_of(player)], channels=[channel])
     presentation = make_presentation()
     join_button = SimpleNamespace(custom_id="gatesbot_playerqueue_join", disabled=False)
     view = SimpleNamespace(children=[join_button])
     service = PlayerQueueService(
         bot=make_bot(),
         config=config,
-        queue_repository=InMemoryQueueRepository(queue),
+        queue_store=InMemoryQueueRepository(queue),
         gate_repository=InMemoryGateRepository(),
         analytics_repository=make_analytics(),
+        meta_repository=QueueMetaRepository(FakeCollection()),  # pyright: ignore[reportArgumentType]
         presentation_service=presentation,
         view_factory=lambda: view,
     )
@@ -328,7 +389,7 @@ def test_toggle_queue_lock_updates_channel_permissions_and_queue_state() -> None
     service, queue_repo, _, _ = make_player_service(queue)
     player_role = make_role(1, "Player")
     channel = FakeChannel(service.config.player_queue_channel_id)
-    guild = FakeGuild(1, members=[player.member], channels=[channel], roles=[player_role])
+    guild = FakeGuild(1, members=[member_of(player)], channels=[channel], roles=[player_role])
 
     result = asyncio.run(
         service.toggle_queue_lock(
@@ -355,8 +416,9 @@ def test_toggle_queue_unlock_marks_players_and_removes_lock_notice() -> None:
     player = make_player(1, "Alice")
     queue = make_queue(make_group(player), locked=True)
     service, _, analytics, _ = make_player_service(queue)
-    channel = FakeChannel(service.config.player_queue_channel_id, history_messages=[bot_message])
-    guild = FakeGuild(1, members=[player.member], channels=[channel])
+    channel = FakeChannel(service.config.player_queue_channel_id, fetched_messages={bot_message.id: bot_message})
+    guild = FakeGuild(1, members=[member_of(player)], channels=[channel])
+    asyncio.run(service.meta_repository.set_message_id(f"lock_notice:{channel.id}", bot_message.id))
 
     result = asyncio.run(
         service.toggle_queue_lock(
@@ -374,4 +436,77 @@ def test_toggle_queue_unlock_marks_players_and_removes_lock_notice() -> None:
     assert queue.locked is False
     assert bot_message.deleted is True
     analytics.set_unlock_timestamp.assert_awaited_once()
-    analytics.set_marked.assert_awaited_once_with(player.member.id, marked=True)
+    analytics.set_marked_many.assert_awaited_once_with([player.member_id], marked=True)
+    analytics.set_marked.assert_not_awaited()
+
+
+def test_lock_notice_is_deleted_by_its_stored_id_on_unlock() -> None:
+    player = make_player(1, "Alice")
+    queue = make_queue(make_group(player))
+    service, _, _, _ = make_player_service(queue)
+    channel = FakeChannel(service.config.player_queue_channel_id)
+    guild = FakeGuild(1, members=[member_of(player)], channels=[channel])
+
+    async def toggle(should_lock: bool) -> None:
+        await service.toggle_queue_lock(
+            guild=guild,
+            actor=make_member(2, "Assistant"),
+            queue_channel=channel,
+            player_role=make_role(1, "Player"),
+            should_lock=should_lock,
+            reason=None,
+            send_announcement=False,
+        )
+
+    async def run_test() -> None:
+        await toggle(True)
+        # anything posted after the notice would have pushed it out of a history scan
+        channel.history_messages = [FakeMessage(100 + index) for index in range(30)]
+        await toggle(False)
+
+    asyncio.run(run_test())
+
+    notice = channel.sent_messages[0]
+    assert notice.deleted is True
+    assert service.meta_repository.collection.docs == [{"_id": f"lock_notice:{channel.id}"}]
+
+
+def test_unlock_without_a_stored_notice_id_does_not_scan_history() -> None:
+    old_notice = FakeMessage(1, author=make_member(999, "Bot"), embeds=[FakeEmbed("Queue Channel Locked")])
+    queue = make_queue(locked=True)
+    service, _, _, _ = make_player_service(queue)
+    channel = FakeChannel(service.config.player_queue_channel_id, history_messages=[old_notice])
+    guild = FakeGuild(1, channels=[channel])
+
+    result = asyncio.run(
+        service.toggle_queue_lock(
+            guild=guild,
+            actor=make_member(2, "Assistant"),
+            queue_channel=channel,
+            player_role=make_role(1, "Player"),
+            should_lock=False,
+            reason=None,
+            send_announcement=False,
+        )
+    )
+
+    assert result.is_locked is False
+    assert old_notice.deleted is False
+
+
+def test_each_operation_normalizes_and_writes_once() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob", level=11)
+    queue = make_queue(make_group(alice), make_group(bob))
+    service, queue_repo, _, _ = make_player_service(queue)
+    guild = FakeGuild(1, members=[member_of(alice), member_of(bob)])
+
+    asyncio.run(service.leave_member(guild=guild, member_id=1, decrement_signup_count=False, clear_marked=False))
+    asyncio.run(service.signup_player(guild=guild, member=member_of(alice), player=alice))
+    asyncio.run(service.leave_member(guild=guild, member_id=999, decrement_signup_count=False, clear_marked=False))
+
+    assert len(queue_repo.saved) == 2
+    assert service.queue_actors.counters.commits == 3
+    assert service.queue_actors.counters.flushes == 2
+    assert service.queue_actors.counters.skipped == 1
+    assert [group.tier for group in queue.groups] == [alice.tier, bob.tier]
@@ -1,26 +1,56 @@
 from __future__ import annotations
 
 import asyncio
+from collections import defaultdict
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
+import disnake as discord
+
+from queueing.members import MemberResolver
+from queueing.repositories.analytics import AnalyticsRepository
 from queueing.repositories.meta import QueueMetaRepository
 from queueing.services.presentation import QueuePresentationService, replace_persistent_message
-from tests.helpers.builders import make_bot, make_group, make_member, make_player, make_queue, make_ready_entry
+from tests.helpers.builders import (
+    make_bot,
+    make_group,
+    make_member,
+    make_player,
+    make_queue,
+    make_ready_entry,
+    member_of,
+)
 from tests.helpers.fakes import FakeChannel, FakeCollection, FakeGuild, FakeMessage
 
 
+class CountingCollection(FakeCollection):
+    def __init__(self, docs=None):
+        super().__init__(docs)
+        self.find_calls = 0
+
+    def find(self, query=None, **kwargs):
+        self.find_calls += 1
+        return super().find(query, **kwargs)
+
+
 def make_service(*, marks: list[dict] | None = None, meta: FakeCollection | None = None) -> QueuePresentationService:
     bot = make_bot()
-    bot.mdb["player_marked"] = FakeCollection(marks or [])
+    bot.mdb = defaultdict(FakeCollection)
+    bot.mdb["player_marked"] = CountingCollection(marks or [])
     bot.mdb["queue_meta"] = meta or FakeCollection()
-    return QueuePresentationService(bot=bot, meta_repository=QueueMetaRepository(bot.mdb["queue_meta"]))
+    return QueuePresentationService(
+        bot=bot,
+        meta_repository=QueueMetaRepository(bot.mdb["queue_meta"]),
+        analytics_repository=AnalyticsRepository(bot.mdb),  # pyright: ignore[reportArgumentType]
+        member_resolver=MemberResolver(),
+    )
 
 
 def test_build_player_queue_embed_sorts_groups_and_marks_players() -> None:
     alice = make_player(1, "Alice", level=5)
     bob = make_player(2, "Bob", level=1)
     queue = make_queue(make_group(alice), make_group(bob))
-    service = make_service(marks=[{"_id": alice.member.id, "marked": True, "custom": "!"}])
+    service = make_service(marks=[{"_id": alice.member_id, "marked": True, "custom": "!"}])
 
     embed = asyncio.run(service.build_player_queue_embed(queue))
 
@@ -50,7 +80,11 @@ def test_build_player_waitlist_embed_orders_by_wait_time_descending() -> None:
     service = make_service()
 
     embed = asyncio.run(
-        service.build_player_waitlist_embed(queue, signup_times={alice.member.id: older, bob.member.id: newer})
+        service.build_player_waitlist_embed(
+            queue,
+            signup_times={alice.member_id: older, bob.member_id: newer},
+            members={player.member_id: member_of(player) for player in (alice, bob)},
+        )
     )
 
     assert embed.title == "Queue Waitlist"
@@ -113,7 +147,7 @@ def test_replace_persistent_message_deletes_existing_message_and_updates_meta()
     new_message = asyncio.run(
         replace_persistent_message(
             channel=channel,
-            meta_db=meta,
+            meta_repository=QueueMetaRepository(meta),  # pyright: ignore[reportArgumentType]
             meta_key="player_queue:1",
             embed_title_prefix="Gate Sign-Up List",
             bot_user_id=999,
@@ -150,7 +184,7 @@ def test_send_gate_assignment_sends_group_info_then_dm_assignment() -> None:
     dm_member = make_member(10, "DM")
     bob = make_player(2, "Bob")
     alice = make_player(1, "Alice")
-    guild = FakeGuild(1, members=[dm_member, alice.member, bob.member])
+    guild = FakeGuild(1, members=[dm_member, member_of(alice), member_of(bob)])
     channel = FakeChannel(1, guild=guild)
     service = make_service()
 
@@ -167,3 +201,89 @@ def test_send_gate_assignment_sends_group_info_then_dm_assignment() -> None:
     assert channel.sent[0]["embed"].title == "Information for Group #4"
     assert channel.sent[1]["content"] == dm_member.mention
     assert channel.sent[1]["embed"].title == "Gate Assignment"
+
+
+def _board_embed(description: str) -> discord.Embed:
+    embed = discord.Embed(title="Gate Sign-Up List", description=description)
+    embed.timestamp = datetime.now(timezone.utc)
+    return embed
+
+
+def _refresh(service: QueuePresentationService, channel: FakeChannel, description: str, *, bump: bool = False):
+    async def run():
+        return await service.refresh_queue_message(
+            channel=channel,
+            meta_key="player_queue:1",
+            embed_title_prefix="Gate Sign-Up List",
+            embed=_board_embed(description),
+            view=discord.ui.View(timeout=None),
+            bump=bump,
+        )
+
+    return asyncio.run(run())
+
+
+def test_refresh_queue_message_edits_board_in_place_and_skips_identical_renders() -> None:
+    board = FakeMessage(42)
+    channel = FakeChannel(1, fetched_messages={42: board})
+    service = make_service(meta=FakeCollection([{"_id": "player_queue:1", "message_id": 42}]))
+
+    first = _refresh(service, channel, "one player")
+    second = _refresh(service, channel, "one player")
+    third = _refresh(service, channel, "two players")
+
+    assert first.message_id == second.message_id == third.message_id == 42
+    assert [edit["embed"].description for edit in board.edits] == ["one player", "two players"]
+    assert channel.sent == []
+    assert board.deleted is False
+
+
+def test_refresh_queue_message_resends_when_board_is_gone() -> None:
+    class MissingMessage(FakeMessage):
+        async def edit(self, **kwargs) -> None:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+    channel = FakeChannel(1, fetched_messages={42: MissingMessage(42)})
+    meta = FakeCollection([{"_id": "player_queue:1", "message_id": 42}])
+    service = make_service(meta=meta)
+
+    result = _refresh(service, channel, "one player")
+    _refresh(service, channel, "one player")
+
+    assert result.message_id == 1
+    assert len(channel.sent) == 1
+    assert meta.docs[0]["message_id"] == 1
+
+
+def test_refresh_queue_message_bump_reposts_board() -> None:
+    board = FakeMessage(42)
+    channel = FakeChannel(1, fetched_messages={42: board})
+    service = make_service(meta=FakeCollection([{"_id": "player_queue:1", "message_id": 42}]))
+
+    _refresh(service, channel, "one player")
+    result = _refresh(service, channel, "one player", bump=True)
+
+    assert board.deleted is True
+    assert result.message_id == 1
+    assert len(channel.sent) == 1
+
+
+def test_board_marks_are_loaded_once_and_follow_mark_writes() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    queue = make_queue(make_group(alice, bob))
+    service = make_service(marks=[{"_id": alice.member_id, "marked": True}])
+    marks = service.analytics_repository.player_marked
+
+    async def run_test() -> tuple[str, str]:
+        first = (await service.build_player_queue_embed(queue)).fields[0].value
+        await service.analytics_repository.set_marked(bob.member_id, marked=True)
+        await service.analytics_repository.clear_marks_for_members([alice.member_id])
+        second = (await service.build_player_queue_embed(queue)).fields[0].value
+        return first, second
+
+    first, second = asyncio.run(run_test())
+
+    assert first == f"{alice.mention}\\*, {bob.mention}"
+    assert second == f"{alice.mention}, {bob.mention}\\*"
+    assert marks.find_calls == 1  # pyright: ignore[reportAttributeAccessIssue]
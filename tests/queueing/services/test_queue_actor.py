@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from queueing.contracts import LeaveResult, SignupResult
+from queueing.repositories import QueueVersionConflict
+from queueing.services.queue_actor import QueueActorPool
+from tests.helpers.builders import make_group, make_player, make_player_service, make_queue, member_of
+from tests.helpers.fakes import FakeGuild, InMemoryQueueRepository
+
+
+def test_concurrent_signups_are_batched_into_one_save_and_refresh() -> None:
+    players = [make_player(index, f"Player {index}") for index in range(1, 6)]
+    queue = make_queue()
+    service, queue_repo, _, _ = make_player_service(queue)
+    guild = FakeGuild(1, members=[member_of(player) for player in players])
+
+    async def run_test() -> list[SignupResult]:
+        return await asyncio.gather(
+            *(service.signup_player(guild=guild, member=member_of(player), player=player) for player in players)
+        )
+
+    results = asyncio.run(run_test())
+
+    assert all(result.success for result in results)
+    assert sorted(player.member_id for group in queue.groups for player in group.players) == [1, 2, 3, 4, 5]
+    assert len(queue_repo.saved) == 1
+    service.request_refresh.assert_called_once()
+
+
+def test_commands_run_in_submission_order() -> None:
+    queue = make_queue(make_group())
+    pool = QueueActorPool(InMemoryQueueRepository(queue))
+    guild = FakeGuild(1)
+    seen: list[int] = []
+
+    def record(value: int):
+        def apply(queue) -> LeaveResult:
+            seen.append(value)
+            return LeaveResult(success=True, message="", queue_updated=True)
+
+        return apply
+
+    async def run_test() -> None:
+        await asyncio.gather(*(pool.submit(guild, record(value)) for value in range(10)))
+
+    asyncio.run(run_test())
+
+    assert seen == list(range(10))
+
+
+def test_failing_command_does_not_poison_the_batch() -> None:
+    queue = make_queue()
+    repository = InMemoryQueueRepository(queue)
+    on_commit = AsyncMock()
+    pool = QueueActorPool(repository, on_commit=on_commit)
+    guild = FakeGuild(1)
+
+    def explode(queue) -> LeaveResult:
+        raise RuntimeError("bad command")
+
+    def add_group(queue) -> LeaveResult:
+        queue.groups.append(make_group(make_player(1, "Alice")))
+        return LeaveResult(success=True, message="", queue_updated=True)
+
+    async def run_test():
+        return await asyncio.gather(pool.submit(guild, explode), pool.submit(guild, add_group), return_exceptions=True)
+
+    failed, succeeded = asyncio.run(run_test())
+
+    assert isinstance(failed, RuntimeError)
+    assert succeeded.success is True
+    assert repository.saved == [queue]
+    on_commit.assert_awaited_once_with(guild, queue)
+
+
+def test_failed_save_is_reported_to_writers_only() -> None:
+    class FailingRepository(InMemoryQueueRepository):
+        async def save(self, queue) -> None:
+            raise RuntimeError("mongo unavailable")
+
+    on_commit = AsyncMock()
+    pool = QueueActorPool(FailingRepository(make_queue()), on_commit=on_commit)
+    guild = FakeGuild(1)
+
+    def write(queue) -> LeaveResult:
+        return LeaveResult(success=True, message="", queue_updated=True)
+
+    def read(queue) -> LeaveResult:
+        return LeaveResult(success=False, message="nothing to do")
+
+    async def run_test():
+        return await asyncio.gather(pool.submit(guild, write), pool.submit(guild, read), return_exceptions=True)
+
+    written, read_only = asyncio.run(run_test())
+
+    assert isinstance(written, RuntimeError)
+    assert read_only.message == "nothing to do"
+    on_commit.assert_not_awaited()
+
+
+def test_refresh_can_be_skipped_per_command() -> None:
+    on_commit = AsyncMock()
+    repository = InMemoryQueueRepository(make_queue())
+    pool = QueueActorPool(repository, on_commit=on_commit)
+
+    def write(queue) -> LeaveResult:
+        return LeaveResult(success=True, message="", queue_updated=True)
+
+    asyncio.run(pool.submit(FakeGuild(1), write, refresh=False))
+
+    assert len(repository.saved) == 1
+    on_commit.assert_not_awaited()
+
+
+def test_pool_survives_event_loop_changes() -> None:
+    pool = QueueActorPool(InMemoryQueueRepository(make_queue()))
+
+    def read(queue) -> int:
+        return len(queue.groups)
+
+    assert asyncio.run(pool.submit(FakeGuild(1), read)) == 0
+    assert asyncio.run(pool.submit(FakeGuild(1), read)) == 0
+
+
+def test_load_failure_is_raised_to_callers() -> None:
+    class BrokenRepository(InMemoryQueueRepository):
+        async def load_for_guild(self, guild, **kwargs):
+            raise RuntimeError("load failed")
+
+    pool = QueueActorPool(BrokenRepository(make_queue()))
+
+    with pytest.raises(RuntimeError, match="load failed"):
+        asyncio.run(pool.submit(FakeGuild(1), lambda queue: None))
+
+
+def test_version_conflict_replays_the_batch_on_a_fresh_read() -> None:
+    class ContendedRepository(InMemoryQueueRepository):
+        conflicts = 1
+
+        async def save(self, queue) -> None:
+            if self.conflicts:
+                self.conflicts -= 1
+                raise QueueVersionConflict("queue moved on")
+            await super().save(queue)
+
+    repository = ContendedRepository(make_queue())
+    pool = QueueActorPool(repository)
+    applied: list[int] = []
+
+    def write(queue) -> LeaveResult:
+        applied.append(len(repository.load_calls))
+        return LeaveResult(success=True, message="", queue_updated=True)
+
+    result = asyncio.run(pool.submit(FakeGuild(1), write))
+
+    assert result.success is True
+    assert applied == [1, 2]
+    assert len(repository.saved) == 1
+
+
+def test_persistent_version_conflict_is_raised_to_writers() -> None:
+    class ContendedRepository(InMemoryQueueRepository):
+        async def save(self, queue) -> None:
+            raise QueueVersionConflict("queue moved on")
+
+    repository = ContendedRepository(make_queue())
+    pool = QueueActorPool(repository, max_conflict_retries=2)
+
+    with pytest.raises(QueueVersionConflict):
+        asyncio.run(pool.submit(FakeGuild(1), lambda queue: LeaveResult(success=True, message="", queue_updated=True)))
+
+    assert len(repository.load_calls) == 3
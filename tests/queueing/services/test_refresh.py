@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+
+from queueing.services.refresh import RefreshScheduler
+from tests.helpers.fakes import FakeGuild
+
+
+def make_scheduler(*, delay: float = 0.02, max_latency: float = 0.2) -> tuple[RefreshScheduler, list[int]]:
+    rendered: list[int] = []
+
+    async def render(guild) -> None:
+        rendered.append(guild.id)
+
+    return RefreshScheduler(render, delay=delay, max_latency=max_latency, name="test"), rendered
+
+
+def test_burst_of_requests_renders_once_after_it_settles() -> None:
+    scheduler, rendered = make_scheduler()
+    guild = FakeGuild(1)
+
+    async def run_test() -> None:
+        for _ in range(50):
+            scheduler.request(guild)
+        assert rendered == []
+        await asyncio.sleep(0.06)
+
+    asyncio.run(run_test())
+
+    assert rendered == [1]
+
+
+def test_steady_stream_is_rendered_at_least_every_max_latency() -> None:
+    scheduler, rendered = make_scheduler(delay=0.03, max_latency=0.05)
+    guild = FakeGuild(1)
+
+    async def run_test() -> None:
+        for _ in range(20):
+            scheduler.request(guild)
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.08)
+
+    asyncio.run(run_test())
+
+    assert 2 <= len(rendered) <= 8
+
+
+def test_guilds_are_scheduled_independently() -> None:
+    scheduler, rendered = make_scheduler()
+
+    async def run_test() -> None:
+        scheduler.request(FakeGuild(1))
+        scheduler.request(FakeGuild(2))
+        scheduler.request(FakeGuild(1))
+        await asyncio.sleep(0.06)
+
+    asyncio.run(run_test())
+
+    assert sorted(rendered) == [1, 2]
+
+
+def test_failed_render_does_not_stop_later_refreshes() -> None:
+    calls: list[int] = []
+
+    async def render(guild) -> None:
+        calls.append(guild.id)
+        if len(calls) == 1:
+            raise RuntimeError("discord is down")
+
+    scheduler = RefreshScheduler(render, delay=0.01, max_latency=0.05)
+    guild = FakeGuild(1)
+
+    async def run_test() -> None:
+        scheduler.request(guild)
+        await asyncio.sleep(0.03)
+        scheduler.request(guild)
+        await asyncio.sleep(0.03)
+
+    asyncio.run(run_test())
+
+    assert calls == [1, 1]
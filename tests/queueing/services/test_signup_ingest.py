@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from common.metrics import MetricsRegistry
+from queueing.contracts import SignupResult
+from queueing.services.queue_actor import QueueActorPool
+from queueing.services.signup_ingest import PendingSignup, SignupIngestor
+from tests.helpers.builders import make_group, make_player, make_player_service, make_queue, member_of
+from tests.helpers.fakes import FakeGuild, InMemoryQueueRepository
+
+
+def test_signup_burst_is_applied_with_one_save_and_one_analytics_write() -> None:
+    players = [make_player(index, f"Player {index}") for index in range(1, 21)]
+    queue = make_queue()
+    service, queue_repo, analytics, _ = make_player_service(queue, testing=False)
+    service.signup_ingestor.window = 0.01
+    guild = FakeGuild(1, members=[member_of(player) for player in players])
+
+    async def run_test() -> list[SignupResult]:
+        return await asyncio.gather(
+            *(service.signup_player(guild=guild, member=member_of(player), player=player) for player in players)
+        )
+
+    results = asyncio.run(run_test())
+
+    assert all(result.success for result in results)
+    assert len(queue_repo.saved) == 1
+    analytics.record_player_signups.assert_awaited_once()
+    (records,), _ = analytics.record_player_signups.await_args
+    assert [record.member.id for record in records] == list(range(1, 21))
+    service.request_refresh.assert_called_once()
+
+
+def test_batched_group_numbers_match_sequential_signups() -> None:
+    players = [make_player(index, f"Player {index}") for index in range(1, 8)]
+    sequential_queue = make_queue()
+    batched_queue = make_queue()
+    sequential, _, _, _ = make_player_service(sequential_queue, testing=False)
+    batched, _, _, _ = make_player_service(batched_queue, testing=False)
+    batched.signup_ingestor.window = 0.01
+    guild = FakeGuild(1, members=[member_of(player) for player in players])
+
+    async def one_at_a_time() -> list[SignupResult]:
+        return [
+            await sequential.signup_player(guild=guild, member=member_of(player), player=player) for player in players
+        ]
+
+    async def all_at_once() -> list[SignupResult]:
+        return await asyncio.gather(
+            *(batched.signup_player(guild=guild, member=member_of(player), player=player) for player in players)
+        )
+
+    expected = asyncio.run(one_at_a_time())
+    actual = asyncio.run(all_at_once())
+
+    assert [result.group_number for result in actual] == [result.group_number for result in expected]
+    assert [[p.member_id for p in group.players] for group in batched_queue.groups] == [
+        [p.member_id for p in group.players] for group in sequential_queue.groups
+    ]
+
+
+def test_duplicate_in_the_same_batch_is_rejected_without_failing_the_others() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    queue = make_queue()
+    service, _, analytics, _ = make_player_service(queue, testing=False)
+    service.signup_ingestor.window = 0.01
+    guild = FakeGuild(1, members=[member_of(alice), member_of(bob)])
+
+    async def run_test() -> list[SignupResult]:
+        return await asyncio.gather(
+            service.signup_player(guild=guild, member=member_of(alice), player=alice),
+            service.signup_player(guild=guild, member=member_of(alice), player=alice),
+            service.signup_player(guild=guild, member=member_of(bob), player=bob),
+        )
+
+    first, duplicate, other = asyncio.run(run_test())
+
+    assert first.success is True
+    assert duplicate.success is False
+    assert other.success is True
+    (records,), _ = analytics.record_player_signups.await_args
+    assert [record.member.id for record in records] == [1, 2]
+
+
+def test_batch_metrics_and_failing_applier() -> None:
+    registry = MetricsRegistry()
+    queue = make_queue(make_group())
+    on_applied = AsyncMock()
+    guild = FakeGuild(1)
+
+    def apply(queue, signup: PendingSignup) -> SignupResult:
+        if signup.signup_text == "boom":
+            raise RuntimeError("bad signup")
+        return SignupResult(success=True, message="", queue_updated=True, group_number=1)
+
+    ingestor = SignupIngestor(
+        QueueActorPool(InMemoryQueueRepository(queue)),
+        apply=apply,
+        on_applied=on_applied,
+        window=0.01,
+        registry=registry,
+    )
+    player = make_player(1, "Alice")
+
+    async def run_test():
+        return await asyncio.gather(
+            ingestor.submit(guild, PendingSignup(member=member_of(player), player=player, signup_text="boom")),
+            ingestor.submit(guild, PendingSignup(member=member_of(player), player=player)),
+            return_exceptions=True,
+        )
+
+    failed, succeeded = asyncio.run(run_test())
+
+    assert isinstance(failed, RuntimeError)
+    assert succeeded.success is True
+    assert len(on_applied.await_args.args[0]) == 1
+    assert registry.observations["signup.batch_size"].count == 1
+    assert registry.observations["signup.batch_size"].max == 2
+    assert registry.observations["signup.commit_latency"].count == 1
+
+
+def test_callers_are_released_before_analytics_writes() -> None:
+    queue = make_queue(make_group())
+    guild = FakeGuild(1)
+    resolved_before_write: list[bool] = []
+    pending: list[asyncio.Future[SignupResult]] = []
+
+    async def on_applied(applied) -> None:
+        resolved_before_write.append(all(future.done() for future in pending))
+
+    ingestor = SignupIngestor(
+        QueueActorPool(InMemoryQueueRepository(queue)),
+        apply=lambda queue, signup: SignupResult(success=True, message="", queue_updated=True, group_number=1),
+        on_applied=on_applied,
+        window=0.01,
+        registry=MetricsRegistry(),
+    )
+    player = make_player(1, "Alice")
+
+    async def run_test() -> SignupResult:
+        task = asyncio.ensure_future(ingestor.submit(guild, PendingSignup(member=member_of(player), player=player)))
+        await asyncio.sleep(0)
+        pending.extend(future for _, future in ingestor._buffers[guild.id].items)
+        return await task
+
+    assert asyncio.run(run_test()).success is True
+    assert resolved_before_write == [True]
@@ -31,7 +31,7 @@ def test_signup_update_and_leave_mutate_repository_and_refresh() -> None:
     assert update.success is True
     assert leave.success is True
     assert repo.entries == []
-    assert service.refresh_queue_message.await_count == 3
+    assert service.request_refresh.call_count == 3
 
 
 def test_leave_member_reports_missing_entry_without_refresh() -> None:
@@ -40,7 +40,7 @@ def test_leave_member_reports_missing_entry_without_refresh() -> None:
     result = asyncio.run(service.leave_member(guild=FakeGuild(1), member_id=10))
 
     assert result.success is False
-    service.refresh_queue_message.assert_not_awaited()
+    service.request_refresh.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -111,7 +111,7 @@ def test_assign_strike_team_sends_message_removes_entries_and_records_analytics(
     assert member.mention in assignment_channel.sent[0]["content"]
     analytics.set_last_strike_gate.assert_awaited_once_with(member.id, "alpha")
     analytics.record_strike_team_reinforcement.assert_awaited_once()
-    service.refresh_queue_message.assert_awaited_once()
+    service.request_refresh.assert_called_once()
 
 
 def test_queue_view_state_delegates_to_presentation() -> None:
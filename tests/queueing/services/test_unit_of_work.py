@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from common.metrics import MetricsRegistry
+from queueing.services.unit_of_work import QueueUnitOfWork
+from tests.helpers.builders import make_group, make_player, make_queue
+from tests.helpers.fakes import FakeGuild, InMemoryQueueRepository
+
+
+def test_commit_without_changes_skips_the_write() -> None:
+    repository = InMemoryQueueRepository(make_queue(make_group()))
+    unit_of_work = QueueUnitOfWork(repository, registry=MetricsRegistry())
+
+    async def run_test() -> bool:
+        await unit_of_work.begin(FakeGuild(1))
+        return await unit_of_work.commit()
+
+    assert asyncio.run(run_test()) is False
+    assert repository.saved == []
+    assert unit_of_work.counters.skipped == 1
+
+
+def test_commit_normalizes_and_flushes_once() -> None:
+    high = make_group(make_player(1, "Alice", level=17))
+    low = make_group(make_player(2, "Bob"))
+    repository = InMemoryQueueRepository(make_queue(high, make_group(), low))
+    registry = MetricsRegistry()
+    unit_of_work = QueueUnitOfWork(repository, registry=registry)
+
+    async def run_test() -> None:
+        await unit_of_work.begin(FakeGuild(1))
+        unit_of_work.mark_dirty()
+        unit_of_work.mark_dirty()
+        await unit_of_work.commit()
+
+    asyncio.run(run_test())
+
+    assert repository.saved == [repository.queue]
+    assert repository.queue.groups == [low, high]
+    assert unit_of_work.counters.flushes == 1
+    assert registry.counters["queue.flushes"] == 1
+
+
+def test_commit_before_begin_is_an_error() -> None:
+    unit_of_work = QueueUnitOfWork(InMemoryQueueRepository(make_queue()))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(unit_of_work.commit())
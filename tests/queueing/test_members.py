@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+
+import disnake as discord
+
+from common.metrics import MetricsRegistry
+from queueing.members import MemberResolver
+from tests.helpers.builders import make_member
+from tests.helpers.fakes import FakeGuild
+
+
+class NotFoundResponse:
+    status = 404
+    reason = "Not Found"
+
+
+class RestGuild(FakeGuild):
+    """A guild whose cache holds only some members, with the rest reachable over REST."""
+
+    def __init__(self, cached, remote):
+        super().__init__(1, members=cached)
+        self.remote = {member.id: member for member in remote}
+        self.fetches: list[int] = []
+        self.running = 0
+        self.peak = 0
+
+    async def fetch_member(self, member_id: int):
+        self.fetches.append(member_id)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if member_id not in self.remote:
+            raise discord.NotFound(NotFoundResponse(), "Unknown Member")  # pyright: ignore[reportArgumentType]
+        return self.remote[member_id]
+
+
+def test_uncached_members_are_fetched_concurrently_within_the_bound() -> None:
+    cached = make_member(1, "Cached")
+    remote = [make_member(member_id, f"Remote {member_id}") for member_id in range(2, 8)]
+    guild = RestGuild([cached], remote)
+    resolver = MemberResolver(concurrency=3, registry=MetricsRegistry())
+
+    members = asyncio.run(resolver.resolve(guild, [5, 1, *range(2, 8)]))  # pyright: ignore[reportArgumentType]
+
+    assert list(members) == [5, 1, 2, 3, 4, 6, 7]
+    assert members[1] is cached
+    assert sorted(guild.fetches) == list(range(2, 8))
+    assert guild.peak == 3
+
+
+def test_fetches_are_shared_while_running_and_cached_until_they_expire() -> None:
+    guild = RestGuild([], [make_member(2, "Remote")])
+    now = [0.0]
+    registry = MetricsRegistry()
+    resolver = MemberResolver(ttl=30, clock=lambda: now[0], registry=registry)
+
+    async def run_test() -> None:
+        await asyncio.gather(resolver.resolve(guild, [2]), resolver.resolve(guild, [2]))  # pyright: ignore[reportArgumentType]
+        await resolver.resolve(guild, [2])  # pyright: ignore[reportArgumentType]
+        now[0] = 31
+        await resolver.resolve(guild, [2])  # pyright: ignore[reportArgumentType]
+
+    asyncio.run(run_test())
+
+    assert guild.fetches == [2, 2]
+    assert registry.counters["members.fetch_shared"] == 1
+    assert registry.counters["members.cache_hit"] == 1
+
+
+def test_members_that_cannot_be_fetched_are_left_out() -> None:
+    guild = RestGuild([], [make_member(2, "Remote")])
+    registry = MetricsRegistry()
+    resolver = MemberResolver(registry=registry)
+
+    members = asyncio.run(resolver.resolve(guild, [9, 2]))  # pyright: ignore[reportArgumentType]
+
+    assert list(members) == [2]
+    assert registry.counters["members.fetch_departed"] == 1
+
+
+def test_lookup_tells_departed_members_from_failed_fetches() -> None:
+    class FlakyGuild(RestGuild):
+        async def fetch_member(self, member_id: int):
+            if member_id == 3:
+                raise discord.HTTPException(NotFoundResponse(), "Service Unavailable")  # pyright: ignore[reportArgumentType]
+            return await super().fetch_member(member_id)
+
+    guild = FlakyGuild([], [make_member(2, "Remote")])
+    registry = MetricsRegistry()
+    resolver = MemberResolver(registry=registry)
+
+    members, departed = asyncio.run(resolver.lookup(guild, [9, 2, 3]))  # pyright: ignore[reportArgumentType]
+
+    assert list(members) == [2]
+    assert departed == {9}
+    assert registry.counters["members.fetch_departed"] == 1
+    assert registry.counters["members.fetch_failed"] == 1
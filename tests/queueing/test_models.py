@@ -4,8 +4,7 @@
 
 from common.constants import GROUP_SIZE, ROLE_MARKERS
 from queueing.models import Group, Player, Queue, QueueException, parse_tier_from_total
-from tests.helpers.builders import make_group, make_member, make_player, make_queue, make_role
-from tests.helpers.fakes import FakeGuild
+from tests.helpers.builders import make_group, make_member, make_player, make_queue, make_role, member_of
 
 
 @pytest.mark.parametrize(
@@ -18,35 +17,47 @@ def test_parse_tier_from_total_uses_expected_breakpoints(total_level: int, tier:
 
 def test_player_new_requires_total_level() -> None:
     with pytest.raises(QueueException, match="No total level"):
-        Player.new(make_member(), {"classes": []})
+        Player.new(1, {"classes": []})
 
 
-def test_queue_serialization_round_trip_preserves_groups_and_skips_missing_members() -> None:
+def test_queue_serialization_round_trip_keeps_players_whose_member_is_not_cached() -> None:
     alice = make_member(1, "Alice")
-    missing = make_member(2, "Missing")
-    guild = FakeGuild(123, members=[alice])
     group = make_group(
-        Player(alice, 5, [{"class": "Fighter", "subclass": "None", "level": 5}]),
-        Player(missing, 8, [{"class": "Wizard", "subclass": "None", "level": 8}]),
+        Player.new(1, {"total_level": 5, "classes": [{"class": "Fighter", "subclass": "None", "level": 5}]}),
+        Player.new(2, {"total_level": 8, "classes": [{"class": "Wizard", "subclass": "None", "level": 8}]}),
         position=3,
     )
     queue = make_queue(group, server_id=123, channel_id=456, locked=True)
 
-    rebuilt = Queue.from_dict(guild, queue.to_dict())
+    rebuilt = Queue.from_dict(queue.to_dict())
 
     assert rebuilt.server_id == 123
     assert rebuilt.channel_id == 456
     assert rebuilt.locked is True
-    assert len(rebuilt.groups) == 1
-    assert [player.member.display_name for player in rebuilt.groups[0].players] == ["Alice"]
-    assert "Alice" in rebuilt.groups[0].player_levels_str
+    assert rebuilt.to_dict() == queue.to_dict()
+    assert [player.member_id for player in rebuilt.groups[0].players] == [1, 2]
+    levels = rebuilt.groups[0].player_levels_str({alice.id: alice})
+    assert "- Alice: None Fighter 5" in levels
+    assert "- Unknown member (2): None Wizard 8" in levels
+
+
+def test_players_with_the_same_build_share_one_class_level_tuple() -> None:
+    classes = {"total_level": 5, "classes": [{"class": "Fighter", "subclass": "Champion", "level": 5}]}
+
+    first = Player.new(1, classes)
+    second = Player.from_dict({"member_id": 2, **classes})
+
+    assert first.class_levels is second.class_levels
+    assert first.levels == classes["classes"]
 
 
 def test_group_player_levels_include_role_markers() -> None:
     marker_role_id = next(iter(ROLE_MARKERS))
     player = make_player(1, "Alice", roles=[make_role(marker_role_id, "Assistant")])
 
-    assert f"[{ROLE_MARKERS[marker_role_id]}]" in make_group(player).player_levels_str
+    members = {player.member_id: member_of(player)}
+
+    assert f"[{ROLE_MARKERS[marker_role_id]}]" in make_group(player).player_levels_str(members)
 
 
 def test_queue_group_fit_respects_tier_size_and_lock() -> None:
@@ -55,7 +66,7 @@ def test_queue_group_fit_respects_tier_size_and_lock() -> None:
     locked_group = make_group(tier=bob.tier, locked=True)
     queue = make_queue(make_group(alice), locked_group)
 
-    assert queue.in_queue(alice.member.id) == (0, 0)
+    assert queue.in_queue(alice.member_id) == (0, 0)
     assert queue.can_fit_in_group(bob) == 0
 
     queue.groups[0].players = [alice] * GROUP_SIZE
@@ -64,12 +75,81 @@ def test_queue_group_fit_respects_tier_size_and_lock() -> None:
 
 def test_group_from_dict_infers_tier_from_players_when_legacy_document_omits_tier() -> None:
     player = make_player(1, "Alice", level=8)
-    guild = FakeGuild(1, members=[player.member])
     raw_group = {"players": [player.to_dict()], "position": 2, "locked": True, "assigned": 99}
 
-    group = Group.from_dict(guild, raw_group)
+    group = Group.from_dict(raw_group)
 
     assert group.tier == player.tier
     assert group.position == 2
     assert group.locked is True
     assert group.assigned == 99
+
+
+def test_queue_index_tracks_append_pop_and_group_changes() -> None:
+    alice = make_player(1, "Alice")
+    bob = make_player(2, "Bob")
+    cara = make_player(3, "Cara")
+    queue = make_queue(make_group(alice, bob), make_group(cara))
+
+    assert queue.in_queue(2) == (0, 1)
+
+    queue.pop_player(0, 0)
+    assert queue.in_queue(1) is None
+    assert queue.in_queue(2) == (0, 0)
+
+    queue.insert_group(0, make_group(make_player(4, "Dan")))
+    assert queue.in_queue(3) == (2, 0)
+
+    queue.merge_groups(1, 2)
+    assert queue.in_queue(3) == (1, 1)
+
+    queue.pop_group(0)
+    assert queue.in_queue(4) is None
+    assert sorted(queue.member_ids) == [2, 3]
+
+
+def test_queue_index_heals_after_direct_list_edits() -> None:
+    queue = make_queue(make_group(make_player(1, "Alice")))
+    assert queue.in_queue(1) == (0, 0)
+
+    queue.groups[0].players.insert(0, make_player(2, "Bob"))
+    assert queue.in_queue(1) == (0, 1)
+
+    queue.groups.append(make_group(make_player(3, "Cara")))
+    assert queue.in_queue(3) == (1, 0)
+
+    queue.groups = []
+    assert queue.in_queue(1) is None
+
+
+def test_add_player_fills_open_groups_then_inserts_in_tier_order() -> None:
+    low = [make_player(index, f"Low {index}", level=1) for index in range(1, GROUP_SIZE + 2)]
+    high = make_player(100, "High", level=20)
+    queue = make_queue(make_group(high))
+
+    indexes = [queue.add_player(player) for player in low]
+
+    assert indexes == [0] * GROUP_SIZE + [1]
+    assert [group.tier for group in queue.groups] == [1, 1, high.tier]
+    assert queue.in_queue(high.member_id) == (2, 0)
+
+
+def test_duplicate_members_resolve_to_first_entry_until_removed() -> None:
+    alice = make_player(1, "Alice")
+    queue = make_queue(make_group(alice), make_group(tier=alice.tier))
+
+    queue.append_player(1, alice)
+    assert queue.in_queue(1) == (0, 0)
+
+    queue.pop_player(0, 0)
+    assert queue.in_queue(1) == (1, 0)
+
+
+def test_can_fit_reopens_a_full_group_after_a_player_leaves() -> None:
+    players = [make_player(index, f"Player {index}") for index in range(1, GROUP_SIZE + 1)]
+    queue = make_queue(make_group(*players), make_group(tier=players[0].tier))
+    newcomer = make_player(100, "Newcomer")
+
+    assert queue.can_fit_in_group(newcomer) == 1
+    queue.pop_player(0, 2)
+    assert queue.can_fit_in_group(newcomer) == 0
@@ -5,7 +5,7 @@
 import pytest
 
 from queueing.parsing import check_level_role, length_check, parse_player_class
-from tests.helpers.builders import make_player, make_role
+from tests.helpers.builders import make_player, make_role, member_of
 
 
 def test_parse_player_class_handles_multiclass_strings() -> None:
@@ -43,22 +43,22 @@ def test_length_check_reports_actionable_bounds(
 def test_check_level_role_allows_matching_level_role() -> None:
     player = make_player(1, roles=[make_role(1, "Level 5")], level=5)
 
-    assert asyncio.run(check_level_role(player)) is None
-    assert player.member.sent_dms == []
+    assert asyncio.run(check_level_role(member_of(player), player)) is None
+    assert member_of(player).sent_dms == []
 
 
 def test_check_level_role_messages_member_with_missing_level_role() -> None:
     player = make_player(1, roles=[make_role(1, "Player")], level=5)
 
-    asyncio.run(check_level_role(player))
+    asyncio.run(check_level_role(member_of(player), player))
 
-    assert "do not have a level role" in player.member.sent_dms[0]
+    assert "do not have a level role" in member_of(player).sent_dms[0]
 
 
 def test_check_level_role_messages_member_with_wrong_level_role() -> None:
     player = make_player(1, roles=[make_role(1, "Level 4")], level=5)
 
-    asyncio.run(check_level_role(player))
+    asyncio.run(check_level_role(member_of(player), player))
 
-    assert "Level 4" in player.member.sent_dms[0]
-    assert "Level 5" in player.member.sent_dms[0]
+    assert "Level 4" in member_of(player).sent_dms[0]
+    assert "Level 5" in member_of(player).sent_dms[0]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import queueing.views.player_queue as player_queue
+from common.metrics import metrics
 
 
 class FakeModalResponse:
@@ -19,6 +21,8 @@ class FakeInteraction:
     def __init__(self):
         self.author = SimpleNamespace(id=10)
         self.guild = SimpleNamespace(id=1)
+        self.data = SimpleNamespace(custom_id=player_queue.JOIN_BUTTON_CUSTOM_ID)
+        self.created_at = datetime.now(timezone.utc)
         self.response = FakeModalResponse()
         self.sent: list[dict] = []
 
@@ -28,10 +32,14 @@ async def send(self, content: str, **kwargs):
 
 def test_join_button_sends_prefilled_modal(monkeypatch) -> None:
     async def run_test() -> None:
-        queue_repository = SimpleNamespace(load_for_guild=AsyncMock(return_value=SimpleNamespace(locked=False)))
+        # not warmed yet, so the queue is loaded once
+        queue_store = SimpleNamespace(
+            peek=lambda guild_id: None,
+            load_for_guild=AsyncMock(return_value=SimpleNamespace(locked=False)),
+        )
         services = SimpleNamespace(
             player_queue_service=SimpleNamespace(),
-            queue_repository=queue_repository,
+            queue_store=queue_store,
             config=SimpleNamespace(player_queue_channel_id=2),
             analytics_repository=SimpleNamespace(get_last_player_signup_text=AsyncMock(return_value="Fighter 5")),
         )
@@ -42,7 +50,9 @@ async def run_test() -> None:
 
         await join_button.callback(interaction)
 
+        queue_store.load_for_guild.assert_awaited_once()
         services.analytics_repository.get_last_player_signup_text.assert_awaited_once_with(10)
+        assert metrics.observations["interaction.first_response.gatesbot_playerqueue_join"].count >= 1
         assert isinstance(interaction.response.modal, player_queue.PlayerQueueJoinModal)
         components = interaction.response.modal.to_components()["components"]
         assert components[0]["components"][0]["value"] == "Fighter 5"
@@ -54,7 +64,7 @@ def test_join_button_is_disabled_when_view_is_built_for_locked_queue(monkeypatch
     async def run_test() -> None:
         services = SimpleNamespace(
             player_queue_service=SimpleNamespace(),
-            queue_repository=SimpleNamespace(),
+            queue_store=SimpleNamespace(),
             config=SimpleNamespace(player_queue_channel_id=2),
             analytics_repository=SimpleNamespace(get_last_player_signup_text=AsyncMock(return_value=None)),
         )
@@ -72,7 +82,7 @@ def test_player_queue_view_is_persistent(monkeypatch) -> None:
     async def run_test() -> None:
         services = SimpleNamespace(
             player_queue_service=SimpleNamespace(),
-            queue_repository=SimpleNamespace(),
+            queue_store=SimpleNamespace(),
             config=SimpleNamespace(player_queue_channel_id=2),
             analytics_repository=SimpleNamespace(get_last_player_signup_text=AsyncMock(return_value=None)),
         )
@@ -88,10 +98,10 @@ async def run_test() -> None:
 
 def test_join_button_rejects_stale_interaction_when_queue_is_locked(monkeypatch) -> None:
     async def run_test() -> None:
-        queue_repository = SimpleNamespace(load_for_guild=AsyncMock(return_value=SimpleNamespace(locked=True)))
+        queue_store = SimpleNamespace(peek=lambda guild_id: SimpleNamespace(locked=True), load_for_guild=AsyncMock())
         services = SimpleNamespace(
             player_queue_service=SimpleNamespace(),
-            queue_repository=queue_repository,
+            queue_store=queue_store,
             config=SimpleNamespace(player_queue_channel_id=2),
             analytics_repository=SimpleNamespace(get_last_player_signup_text=AsyncMock(return_value="Fighter 5")),
         )
@@ -102,6 +112,7 @@ async def run_test() -> None:
 
         await join_button.callback(interaction)
 
+        queue_store.load_for_guild.assert_not_awaited()
         services.analytics_repository.get_last_player_signup_text.assert_not_awaited()
         assert interaction.response.modal is None
         assert interaction.sent == [{"content": "The queue is currently locked.", "ephemeral": True}]
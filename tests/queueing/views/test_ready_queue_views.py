@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import queueing.views.dm_queue as dm_queue
+import queueing.views.strike_queue as strike_queue
+from common.metrics import metrics
+
+
+class FakeInteraction:
+    def __init__(self, custom_id: str):
+        self.author = SimpleNamespace(id=10)
+        self.guild = SimpleNamespace(id=1)
+        self.data = SimpleNamespace(custom_id=custom_id)
+        self.created_at = datetime.now(timezone.utc)
+        self.sent: list[dict] = []
+
+    async def send(self, content: str, **kwargs):
+        self.sent.append({"content": content, **kwargs})
+
+
+@pytest.mark.parametrize(
+    ("module", "view_name", "service_name", "custom_id"),
+    [
+        (dm_queue, "DMQueueUI", "dm_queue_service", "gatesbot_dmqueue_leave"),
+        (strike_queue, "StrikeQueueUI", "strike_queue_service", "gatesbot_strikequeue_leave"),
+    ],
+)
+def test_leave_button_times_its_first_response(monkeypatch, module, view_name, service_name, custom_id) -> None:
+    async def run_test() -> None:
+        leave = AsyncMock(return_value=SimpleNamespace(message="You have left the queue."))
+        services = SimpleNamespace(**{service_name: SimpleNamespace(leave_member=leave)})
+        monkeypatch.setattr(module, "get_queue_services", lambda bot: services)
+        view = getattr(module, view_name)(SimpleNamespace())
+        leave_button = next(child for child in view.children if child.custom_id == custom_id)
+        interaction = FakeInteraction(custom_id)
+        before = metrics.observations[f"interaction.first_response.{custom_id}"].count
+
+        await leave_button.callback(interaction)
+
+        assert interaction.sent == [{"content": "You have left the queue.", "ephemeral": True}]
+        assert metrics.observations[f"interaction.first_response.{custom_id}"].count == before + 1
+
+    asyncio.run(run_test())